@@ -0,0 +1,148 @@
+import os
+import time
+
+import pygame
+
+from atlas import Atlas
+from conf import Conf
+
+
+class AssetManager:
+    """
+    One shared registry for every image the game loads.
+
+    Surfaces are keyed by (absolute path, target size): each file is decoded
+    once, scaled once per size and converted to the display pixel format, so
+    blits don't have to convert on every frame. If an atlas has been built
+    (python atlas.py), keys it contains are served as subsurfaces of one
+    shared sheet instead of being read from their own files.
+    """
+
+    _surfaces = {}
+    _atlas = None
+    _atlas_checked = False
+
+    hits = 0
+    misses = 0
+    bytes_loaded = 0
+    load_seconds = 0.0
+
+    @staticmethod
+    def resolve(path):
+        """Absolute, normalized path; relative paths are taken from Conf.BASE_DIR"""
+        if not os.path.isabs(path):
+            path = os.path.join(Conf.BASE_DIR, path)
+        return os.path.normcase(os.path.abspath(path))
+
+    @classmethod
+    def atlas(cls):
+        """The texture atlas, opened on first use, or None if it hasn't been built"""
+        if not cls._atlas_checked:
+            cls._atlas_checked = True
+            cls._atlas = Atlas.open(Conf.ATLAS_INDEX, cls.resolve, cls.convert)
+        return cls._atlas
+
+    @classmethod
+    def in_atlas(cls, path, size=None):
+        atlas = cls.atlas()
+        return atlas is not None and (cls.resolve(path), tuple(size) if size else None) in atlas
+
+    @classmethod
+    def load(cls, path, size=None, source=None):
+        """
+        Return the surface for path, scaled to size if given.
+
+        The atlas is tried first. Otherwise source, an optional file-like
+        object or path with the encoded image, is read instead of path (e.g.
+        a sprite just downloaded, or a pre-scaled variant).
+        """
+        key = (cls.resolve(path), tuple(size) if size else None)
+        surface = cls._surfaces.get(key)
+        if surface is not None:
+            cls.hits += 1
+            return surface
+
+        cls.misses += 1
+        start = time.perf_counter()
+        surface = None
+        atlas = cls.atlas()
+        if atlas is not None:
+            sheet_bytes = atlas.sheet_bytes()
+            surface = atlas.get(key)
+            # Sheet yang baru di-decode dihitung sekali; subsurface-nya 0 byte
+            cls.bytes_loaded += atlas.sheet_bytes() - sheet_bytes
+        if surface is None:
+            # The unscaled original is only kept if someone asked for it directly
+            original = cls._surfaces.get((key[0], None)) if size else None
+            if original is None:
+                original = pygame.image.load(source if source is not None else key[0])
+            surface = original
+            if size and original.get_size() != key[1]:
+                surface = pygame.transform.scale(original, key[1])
+            surface = cls.convert(surface)
+        cls.load_seconds += time.perf_counter() - start
+
+        cls._surfaces[key] = surface
+        cls.bytes_loaded += cls.surface_bytes(surface)
+        return surface
+
+    @classmethod
+    def adopt(cls, path, surface, size=None):
+        """
+        Register a surface decoded elsewhere (e.g. on a loader thread) under
+        path/size. Conversion needs the display, so call this on the main thread.
+        """
+        key = (cls.resolve(path), tuple(size) if size else None)
+        cached = cls._surfaces.get(key)
+        if cached is not None:
+            cls.hits += 1
+            return cached
+
+        cls.misses += 1
+        start = time.perf_counter()
+        if size and surface.get_size() != key[1]:
+            surface = pygame.transform.scale(surface, key[1])
+        surface = cls.convert(surface)
+        cls.load_seconds += time.perf_counter() - start
+
+        cls._surfaces[key] = surface
+        cls.bytes_loaded += cls.surface_bytes(surface)
+        return surface
+
+    @staticmethod
+    def convert(surface):
+        """Convert to the display format, keeping per-pixel alpha where the image has it"""
+        if pygame.display.get_surface() is None:
+            # Belum ada window (mis. headless), convert butuh display mode
+            return surface
+        if surface.get_flags() & pygame.SRCALPHA:
+            return surface.convert_alpha()
+        return surface.convert()
+
+    @staticmethod
+    def surface_bytes(surface):
+        if surface.get_parent() is not None:
+            # Subsurface atlas: pikselnya milik sheet
+            return 0
+        return surface.get_pitch() * surface.get_height()
+
+    @classmethod
+    def forget(cls, path):
+        """Drop every cached size of path (e.g. after the file changed on disk)"""
+        resolved = cls.resolve(path)
+        for key in [key for key in cls._surfaces if key[0] == resolved]:
+            cls.bytes_loaded -= cls.surface_bytes(cls._surfaces.pop(key))
+
+    @classmethod
+    def stats(cls):
+        lookups = cls.hits + cls.misses
+        return {
+            'surfaces': len(cls._surfaces),
+            'hits': cls.hits,
+            'misses': cls.misses,
+            'hit_rate': cls.hits / lookups if lookups else 0.0,
+            'bytes': cls.bytes_loaded,
+            'load_seconds': cls.load_seconds,
+            'atlas_sheets': len(cls._atlas.loaded_sheets()) if cls._atlas else 0,
+            'atlas_regions': cls._atlas.served if cls._atlas else 0,
+        }
@@ -0,0 +1,204 @@
+"""
+Texture atlas: many small images packed into a few sheets.
+
+The builder packs the UI images (bird, life, land, play button) and every
+game-size Pokemon skin into sheets of at most Conf.ATLAS_MAX_SIZE pixels
+with a shelf packer and writes assets/atlas/atlas_<n>.png plus atlas.json,
+an index of sub-rects keyed by (path, size) - the same key AssetManager
+uses. At runtime Atlas decodes a sheet once and hands out subsurface views,
+so AssetManager.load doesn't open a file per asset.
+
+    python atlas.py
+"""
+import glob
+import json
+import os
+import tempfile
+import time
+
+import pygame
+
+from conf import Conf
+from sprite_variants import SpriteVariants
+
+
+def region_key(path, size):
+    """Index key of path at size (None = native size), path relative to Conf.BASE_DIR"""
+    path = path.replace(os.sep, '/')
+    return f"{path}@{size[0]}x{size[1]}" if size else path
+
+
+def parse_key(key):
+    path, _, size = key.partition('@')
+    if not size:
+        return path, None
+    width, height = size.split('x')
+    return path, (int(width), int(height))
+
+
+class Atlas:
+    """
+    Runtime side: index lookups and lazily decoded sheets.
+
+    resolve turns an index path into the caller's key path and convert
+    converts a freshly decoded sheet (both come from AssetManager).
+    """
+
+    def __init__(self, index_path, resolve, convert):
+        with open(index_path, 'r') as f:
+            index = json.load(f)
+        directory = os.path.dirname(index_path)
+        self.sheet_paths = [os.path.join(directory, name) for name in index['sheets']]
+        self.sheets = [None] * len(self.sheet_paths)
+        self.convert = convert
+        self.regions = {}
+        for key, region in index['regions'].items():
+            path, size = parse_key(key)
+            self.regions[(resolve(path), size)] = (region['sheet'], pygame.Rect(region['rect']), region['mtime'])
+        self.served = 0
+
+    @classmethod
+    def open(cls, index_path, resolve, convert):
+        """The atlas at index_path, or None if it hasn't been built"""
+        if not os.path.exists(index_path):
+            return None
+        try:
+            return cls(index_path, resolve, convert)
+        except Exception as e:
+            print(f"Error membaca atlas: {e}")
+            return None
+
+    def __contains__(self, key):
+        region = self.regions.get(key)
+        return region is not None and self.is_current(key[0], region)
+
+    @staticmethod
+    def is_current(path, region):
+        # File asli berubah setelah atlas dibuat: jangan pakai region lama
+        try:
+            return os.path.getmtime(path) == region[2]
+        except OSError:
+            return True
+
+    def get(self, key):
+        """Subsurface for an AssetManager key, or None if the atlas doesn't have it (or it is stale)"""
+        region = self.regions.get(key)
+        if region is None or not self.is_current(key[0], region):
+            return None
+        sheet_index, rect, _ = region
+        sheet = self.sheets[sheet_index]
+        if sheet is None:
+            sheet = self.sheets[sheet_index] = self.convert(pygame.image.load(self.sheet_paths[sheet_index]))
+        self.served += 1
+        return sheet.subsurface(rect)
+
+    def loaded_sheets(self):
+        return [sheet for sheet in self.sheets if sheet is not None]
+
+    def sheet_bytes(self):
+        return sum(sheet.get_pitch() * sheet.get_height() for sheet in self.loaded_sheets())
+
+
+# -- Builder -------------------------------------------------------------
+
+def to_rgba(image):
+    """image with per-pixel alpha; colorkey pixels (palette PNGs) become transparent"""
+    if image.get_flags() & pygame.SRCALPHA:
+        return image
+    rgba = pygame.Surface(image.get_size(), pygame.SRCALPHA)
+    rgba.blit(image, (0, 0))
+    return rgba
+
+
+def shelf_pack(sizes, max_size, padding=1):
+    """
+    Place rectangles on shelves, tallest first. Returns one (sheet, x, y) per
+    size, in input order, and the (width, height) actually used by each sheet.
+    """
+    placements = [None] * len(sizes)
+    sheets = []
+    x = y = shelf_height = 0
+    for i in sorted(range(len(sizes)), key=lambda i: (-sizes[i][1], -sizes[i][0])):
+        width, height = sizes[i]
+        if width > max_size or height > max_size:
+            raise ValueError(f"{width}x{height} image doesn't fit in a {max_size} px sheet")
+        if sheets and x + width > max_size:
+            # Shelf penuh: mulai shelf baru di bawahnya
+            y += shelf_height + padding
+            x = shelf_height = 0
+        if not sheets or y + height > max_size:
+            sheets.append([0, 0])
+            x = y = shelf_height = 0
+        placements[i] = (len(sheets) - 1, x, y)
+        sheets[-1][0] = max(sheets[-1][0], x + width)
+        sheets[-1][1] = max(sheets[-1][1], y + height)
+        x += width + padding
+        shelf_height = max(shelf_height, height)
+    return placements, [tuple(sheet) for sheet in sheets]
+
+
+def default_entries():
+    """(path, size, surface, source mtime) for the UI images and every game-size Pokemon skin"""
+    width, height = Conf.SCREEN_SIZE
+    button = pygame.image.load(os.path.join(Conf.BASE_DIR, "assets", "play_button.png"))
+    # Ukuran sama persis dengan yang diminta Bird, Life, Platform dan PlayButton
+    requests = [
+        ("assets/bird.png", None),
+        ("assets/life.png", None),
+        ("assets/land.png", (2 * width, height // 5)),
+        ("assets/play_button.png", (button.get_width() // 10, button.get_height() // 10)),
+    ]
+    pokemon_dir = os.path.dirname(SpriteVariants.source_path('1'))
+    for path in sorted(glob.glob(os.path.join(pokemon_dir, "*.png"))):
+        sprite_id = os.path.splitext(os.path.basename(path))[0]
+        if sprite_id.isdigit():
+            requests.append((f"assets/pokemon/{sprite_id}.png", Conf.BIRD_SIZE))
+
+    entries = []
+    for path, size in requests:
+        full_path = os.path.join(Conf.BASE_DIR, path)
+        variant_path = None
+        if path.startswith("assets/pokemon/") and size == Conf.BIRD_SIZE:
+            variant_path = SpriteVariants.path(os.path.splitext(os.path.basename(path))[0], 'game')
+        image = pygame.image.load(variant_path or full_path)
+        if size and image.get_size() != tuple(size):
+            image = pygame.transform.scale(image, size)
+        entries.append((path, size, to_rgba(image), os.path.getmtime(full_path)))
+    return entries
+
+
+def build(entries, out_dir=None, max_size=None, padding=1):
+    """Pack entries into sheets under out_dir and write the atlas.json index"""
+    out_dir = out_dir or os.path.dirname(Conf.ATLAS_INDEX)
+    max_size = max_size or Conf.ATLAS_MAX_SIZE
+    os.makedirs(out_dir, exist_ok=True)
+
+    placements, sheet_sizes = shelf_pack([image.get_size() for _, _, image, _ in entries], max_size, padding)
+    sheets = [pygame.Surface(size, pygame.SRCALPHA) for size in sheet_sizes]
+    regions = {}
+    for (path, size, image, mtime), (sheet, x, y) in zip(entries, placements):
+        # RGBA_MAX ke sheet kosong = salin piksel apa adanya (tanpa blending alpha)
+        sheets[sheet].blit(to_rgba(image), (x, y), special_flags=pygame.BLEND_RGBA_MAX)
+        regions[region_key(path, size)] = {'sheet': sheet, 'rect': [x, y, *image.get_size()], 'mtime': mtime}
+
+    for path in glob.glob(os.path.join(out_dir, "atlas_*.png")):
+        os.remove(path)
+    names = []
+    for i, sheet in enumerate(sheets):
+        names.append(f"atlas_{i}.png")
+        pygame.image.save(sheet, os.path.join(out_dir, names[-1]))
+
+    index_path = os.path.join(out_dir, "atlas.json")
+    temp = tempfile.NamedTemporaryFile('w', dir=out_dir, prefix='.atlas.', suffix='.tmp', delete=False)
+    with temp:
+        json.dump({'version': 1, 'sheets': names, 'regions': regions}, temp, indent=1, sort_keys=True)
+    os.replace(temp.name, index_path)
+    return index_path, sheet_sizes
+
+
+if __name__ == "__main__":
+    start = time.perf_counter()
+    entries = default_entries()
+    index_path, sheet_sizes = build(entries)
+    print(f"{len(entries)} images packed into {len(sheet_sizes)} sheet(s) "
+          f"{', '.join(f'{w}x{h}' for w, h in sheet_sizes)} in {time.perf_counter() - start:.2f} s -> {index_path}")
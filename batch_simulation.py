@@ -0,0 +1,87 @@
+import numpy as np
+
+from conf import Conf
+from simulation import Simulation, pipe_step, platform_step, pipe_offset, pipe_rects
+
+
+class BatchSimulation:
+    """
+    Advance many independent birds against one shared pipe course.
+
+    Follows the rules of simulation.Simulation with a single life: the course
+    (pipes, platform) never depends on a bird, so it is stepped once per tick
+    and only bird y, angle, alive and score live in arrays. Bird i ends with
+    the same y, angle, score and death tick as Simulation(seed, lives=1) fed
+    the i-th column of the inputs.
+    """
+
+    def __init__(self, n, seed=0):
+        self.n = n
+        self.seed = seed
+        self._geometry = Simulation(seed=seed, lives=1)
+        self.reset()
+
+    def reset(self):
+        geometry = self._geometry
+        self.tick = 0
+        self.pipe_x = geometry.pipe_start_x
+        self.pipe_index = 0
+        self.pipe_offset = 0
+        self.platform_x = geometry.platform_start_x
+        self.pass_pipe = False
+
+        self.y = np.full(self.n, geometry.bird_start_y, dtype=np.int32)
+        self.angle = np.zeros(self.n, dtype=np.int32)
+        self.alive = np.ones(self.n, dtype=bool)
+        self.score = np.zeros(self.n, dtype=np.int32)
+        self.death_tick = np.full(self.n, -1, dtype=np.int32)
+
+    def step(self, fly):
+        """Advance every living bird one tick; fly is a bool per bird (or one bool for all)"""
+        geometry = self._geometry
+        fly = np.broadcast_to(np.asarray(fly, dtype=bool), (self.n,))
+        alive = self.alive
+        self.tick += 1
+
+        # Same rules as simulation.bird_step, dead birds stay where they fell
+        self.y += np.where(fly, -Conf.BIRD_FLY_SPEED, Conf.GRAVITY).astype(np.int32) * alive
+        new_angle = np.clip(self.angle + np.where(fly, -5, 5), -30, 90)
+        np.copyto(self.angle, new_angle, where=alive, casting='unsafe')
+
+        # The course is shared, so it is a plain scalar step
+        self.platform_x = platform_step(self.platform_x, geometry.platform_width)
+        self.pipe_x = pipe_step(self.pipe_x)
+        if not self.pass_pipe and self.pipe_x + geometry.pipe_width < geometry.bird_x:
+            self.pass_pipe = True
+            self.score += alive
+        if self.pipe_x + geometry.pipe_width <= 0:
+            self.pipe_index += 1
+            self.pipe_x = Conf.SCREEN_SIZE[0]
+            self.pipe_offset = pipe_offset(self.seed, self.pipe_index)
+            self.pass_pipe = False
+
+        hit = alive & self._collides()
+        self.alive &= ~hit
+        self.death_tick[hit] = self.tick
+        return self.alive
+
+    def _collides(self):
+        geometry = self._geometry
+        bird_w, bird_h = geometry.bird_size
+        bird_x = geometry.bird_x
+        top = self.y
+        bottom = self.y + bird_h
+
+        hit = (top < 0) | (bottom >= geometry.ground_y)
+        for x, y, w, h in pipe_rects(self.pipe_x, self.pipe_offset):
+            # x overlap is the same for every bird, only y needs the arrays
+            if bird_x < x + w and x < bird_x + bird_w:
+                hit |= (top < y + h) & (y < bottom)
+        return hit
+
+    def run(self, inputs):
+        """Feed a (ticks, n) bool array, stops early once every bird is dead"""
+        for fly in inputs:
+            if not self.step(fly).any():
+                break
+        return self.alive
@@ -0,0 +1,63 @@
+"""
+Cold-start skin loading: one PNG per skin vs a texture atlas.
+
+Writes a synthetic roster of 96x96 PNGs (the size of the PokeAPI sprites),
+packs it with atlas.build and times loading every skin at bird size both
+ways, counting the image files each approach opens.
+
+    python -m benchmarks.bench_atlas [roster size]
+"""
+import os
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+import atlas
+from conf import Conf
+
+
+def write_roster(directory, count):
+    paths = []
+    for i in range(count):
+        image = pygame.Surface((96, 96), pygame.SRCALPHA)
+        pygame.draw.circle(image, ((i * 37) % 256, (i * 91) % 256, 200, 255), (48, 48), 20 + i % 25)
+        paths.append(os.path.join(directory, f"{i + 1}.png"))
+        pygame.image.save(image, paths[-1])
+    return paths
+
+
+def per_file(paths):
+    start = time.perf_counter()
+    surfaces = [pygame.transform.scale(pygame.image.load(path), Conf.BIRD_SIZE).convert_alpha() for path in paths]
+    return time.perf_counter() - start, len(paths), surfaces
+
+
+def from_atlas(index_path, paths):
+    start = time.perf_counter()
+    sheet = atlas.Atlas(index_path, os.path.abspath, lambda surface: surface.convert_alpha())
+    surfaces = [sheet.get((os.path.abspath(path), Conf.BIRD_SIZE)) for path in paths]
+    return time.perf_counter() - start, len(sheet.loaded_sheets()), surfaces
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1025
+    pygame.display.init()
+    pygame.display.set_mode((1, 1))
+
+    with tempfile.TemporaryDirectory() as directory:
+        paths = write_roster(directory, count)
+        entries = [(path, Conf.BIRD_SIZE, pygame.transform.scale(pygame.image.load(path), Conf.BIRD_SIZE),
+                    os.path.getmtime(path)) for path in paths]
+        index_path, sheet_sizes = atlas.build(entries, out_dir=os.path.join(directory, "atlas"))
+
+        file_seconds, file_opens, file_surfaces = per_file(paths)
+        atlas_seconds, atlas_opens, atlas_surfaces = from_atlas(index_path, paths)
+        assert all(a.get_size() == b.get_size() for a, b in zip(file_surfaces, atlas_surfaces))
+
+    print(f"{count} skins, atlas sheets: {', '.join(f'{w}x{h}' for w, h in sheet_sizes)}")
+    print(f"per file: {file_seconds * 1e3:8.1f} ms  {file_opens:5d} images opened")
+    print(f"atlas:    {atlas_seconds * 1e3:8.1f} ms  {atlas_opens:5d} images opened")
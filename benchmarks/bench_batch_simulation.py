@@ -0,0 +1,49 @@
+"""
+Per-tick cost of BatchSimulation and a check against the scalar Simulation.
+
+    python -m benchmarks.bench_batch_simulation [birds] [ticks]
+"""
+import sys
+import time
+
+import numpy as np
+
+from batch_simulation import BatchSimulation
+from simulation import Simulation
+
+
+def check_against_scalar(birds=64, ticks=600, seed=7):
+    rng = np.random.default_rng(seed)
+    inputs = rng.random((ticks, birds)) < rng.uniform(0.3, 0.6, birds)
+
+    batch = BatchSimulation(birds, seed=seed)
+    for fly in inputs:
+        batch.step(fly)
+
+    for i in range(birds):
+        sim = Simulation(seed=seed, lives=1)
+        state = sim.run(bool(fly) for fly in inputs[:, i])
+        died = state.tick if state.game_over else -1
+        expected = (state.bird_y, state.bird_angle, state.score, died)
+        got = (int(batch.y[i]), int(batch.angle[i]), int(batch.score[i]), int(batch.death_tick[i]))
+        assert expected == got, f"bird {i}: scalar {expected} != batch {got}"
+
+
+def run(birds, ticks):
+    rng = np.random.default_rng(1)
+    inputs = rng.random((ticks, birds)) < 0.45
+    batch = BatchSimulation(birds, seed=1)
+
+    start = time.perf_counter()
+    for fly in inputs:
+        batch.step(fly)
+    elapsed = time.perf_counter() - start
+    return elapsed / ticks * 1000
+
+
+if __name__ == "__main__":
+    birds = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    ticks = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    check_against_scalar()
+    print("batch matches scalar simulation")
+    print(f"batch simulation: {run(birds, ticks):.3f} ms/tick for {birds} birds")
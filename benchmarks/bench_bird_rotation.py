@@ -0,0 +1,57 @@
+"""
+Per-frame cost of drawing the rotated bird: transform.rotate every frame vs RotationCache.
+
+    python -m benchmarks.bench_bird_rotation [frames]
+"""
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+from conf import Conf
+from sprites.rotation_cache import RotationCache
+
+
+def angles(frames):
+    angle = 0
+    for i in range(frames):
+        # Same 5 degree stepping as Bird.move
+        angle = max(angle - 5, -30) if (i // 10) % 2 else min(angle + 5, 90)
+        yield angle
+
+
+def rotate_every_frame(screen, image, frames):
+    center = screen.get_rect().center
+    start = time.perf_counter()
+    for angle in angles(frames):
+        rotated_image = pygame.transform.rotate(image, -angle)
+        screen.blit(rotated_image, rotated_image.get_rect(center=center))
+    return (time.perf_counter() - start) / frames * 1e6
+
+
+def cached(screen, image, frames):
+    cx, cy = screen.get_rect().center
+    build_start = time.perf_counter()
+    rotations = RotationCache(image)
+    build = (time.perf_counter() - build_start) * 1e3
+
+    start = time.perf_counter()
+    for angle in angles(frames):
+        rotated_image, (dx, dy) = rotations.get(angle)
+        screen.blit(rotated_image, (cx + dx, cy + dy))
+    return (time.perf_counter() - start) / frames * 1e6, build
+
+
+if __name__ == "__main__":
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    pygame.init()
+    screen = pygame.display.set_mode(Conf.SCREEN_SIZE)
+    image = pygame.image.load(os.path.join(Conf.BASE_DIR, "assets", "bird.png")).convert_alpha()
+
+    before = rotate_every_frame(screen, image, frames)
+    after, build = cached(screen, image, frames)
+    print(f"transform.rotate per frame: {before:.1f} us/frame")
+    print(f"RotationCache:              {after:.1f} us/frame (built once in {build:.2f} ms)")
@@ -0,0 +1,73 @@
+"""
+save_score / get_high_score throughput: connect-per-call (the old Database)
+vs the shared WAL connection with cached statements and batched writes.
+
+    python -m benchmarks.bench_database [operations]
+"""
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+from database import Database
+
+
+class ConnectPerCall:
+    """The previous Database: open, run one statement, commit, close"""
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        conn = sqlite3.connect(db_path)
+        conn.execute('CREATE TABLE IF NOT EXISTS scores (id INTEGER PRIMARY KEY AUTOINCREMENT, '
+                     'username TEXT NOT NULL, score INTEGER NOT NULL, date TIMESTAMP DEFAULT CURRENT_TIMESTAMP)')
+        conn.commit()
+        conn.close()
+
+    def save_score(self, username, score):
+        conn = sqlite3.connect(self.db_path)
+        conn.execute('INSERT INTO scores (username, score) VALUES (?, ?)', (username, score))
+        conn.commit()
+        conn.close()
+
+    def get_high_score(self, username):
+        conn = sqlite3.connect(self.db_path)
+        high_score = conn.execute('SELECT MAX(score) FROM scores WHERE username = ?', (username,)).fetchone()[0]
+        conn.close()
+        return high_score or 0
+
+
+def rate(func, operations):
+    start = time.perf_counter()
+    for i in range(operations):
+        func(i)
+    return operations / (time.perf_counter() - start)
+
+
+def measure(db, operations, batched=False):
+    users = [f"player{i % 10}" for i in range(operations)]
+    if batched:
+        start = time.perf_counter()
+        db.save_scores((users[i], i) for i in range(operations))
+        writes = operations / (time.perf_counter() - start)
+    else:
+        writes = rate(lambda i: db.save_score(users[i], i), operations)
+    reads = rate(lambda i: db.get_high_score(users[i]), operations)
+    return writes, reads
+
+
+if __name__ == "__main__":
+    operations = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    with tempfile.TemporaryDirectory() as directory:
+        results = {
+            'connect per call': measure(ConnectPerCall(os.path.join(directory, "old.db")), operations),
+            'shared WAL connection': measure(Database(os.path.join(directory, "new.db")), operations),
+            'shared WAL, batched writes': measure(Database(os.path.join(directory, "batch.db")), operations,
+                                                  batched=True),
+        }
+        Database.close_all()
+
+    print(f"{operations} operations each")
+    print(f"{'':28} {'save_score/s':>13} {'get_high_score/s':>17}")
+    for name, (writes, reads) in results.items():
+        print(f"{name:28} {writes:13.0f} {reads:17.0f}")
@@ -0,0 +1,71 @@
+"""
+Leaderboard queries on a large score history: full scans of scores (what
+get_high_score did before) vs the indexed best_scores / score_counts tables.
+
+Also checks every indexed answer against the scan, and a player without
+scores.
+
+    python -m benchmarks.bench_leaderboard [rows] [users]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+from database import Database
+
+SCAN_HIGH_SCORE = 'SELECT MAX(score) FROM scores NOT INDEXED WHERE username = ?'
+SCAN_RANK = '''SELECT 1 + COUNT(*) FROM (SELECT MAX(score) AS best FROM scores NOT INDEXED GROUP BY username)
+               WHERE best > (SELECT MAX(score) FROM scores NOT INDEXED WHERE username = ?)'''
+SCAN_TOP = '''SELECT username, MAX(score) AS best FROM scores NOT INDEXED GROUP BY username
+              ORDER BY best DESC, username LIMIT ?'''
+
+
+def fill(db, rows, users):
+    rng = random.Random(0)
+    start = time.perf_counter()
+    for chunk in range(0, rows, 50000):
+        # Skor Flappy Bird: kebanyakan kecil, sedikit yang tinggi
+        db.save_scores((f"player{rng.randrange(users)}", int(rng.expovariate(1 / 15)))
+                       for _ in range(min(50000, rows - chunk)))
+    return time.perf_counter() - start
+
+
+def timed(func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    return (time.perf_counter() - start) / repeat * 1e6, result
+
+
+if __name__ == "__main__":
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    users = int(sys.argv[2]) if len(sys.argv) > 2 else rows // 10
+    with tempfile.TemporaryDirectory() as directory:
+        db = Database(os.path.join(directory, "leaderboard.db"))
+        fill_seconds = fill(db, rows, users)
+        conn = db.conn
+        player = "player42"
+
+        results = [
+            ('high score', lambda: conn.execute(SCAN_HIGH_SCORE, (player,)).fetchone()[0],
+             lambda: db.get_high_score(player)),
+            ('rank', lambda: conn.execute(SCAN_RANK, (player,)).fetchone()[0],
+             lambda: db.get_rank(player)),
+            ('top 10', lambda: [tuple(row) for row in conn.execute(SCAN_TOP, (10,))],
+             lambda: [(username, score) for _, username, score in db.top_scores(10)]),
+        ]
+        print(f"{rows} scores, {users} users, filled in {fill_seconds:.1f} s (triggers included)")
+        print(f"{'query':12} {'scan us':>12} {'indexed us':>12}")
+        for name, scan, indexed in results:
+            scan_us, expected = timed(scan, 3)
+            indexed_us, actual = timed(indexed, 1000)
+            assert expected == actual, (name, expected, actual)
+            print(f"{name:12} {scan_us:12.0f} {indexed_us:12.1f}")
+        # Pemain tanpa skor sama sekali (database baru / username baru)
+        assert db.get_high_score("nobody") == 0
+        assert db.get_rank("nobody") is None and db.get_neighbors("nobody") == []
+        neighbors_us, _ = timed(lambda: db.get_neighbors(player, 5), 1000)
+        print(f"{'neighbors':12} {'':>12} {neighbors_us:12.1f}")
+        Database.close_all()
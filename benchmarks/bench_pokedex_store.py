@@ -0,0 +1,60 @@
+"""
+Startup time and memory: JSON metadata cache vs indexed PokedexStore.
+
+"Startup" is what the selector needs before its first frame: open the
+cache, read the first window of the roster and look one Pokemon up by id.
+
+    python -m benchmarks.bench_pokedex_store
+"""
+import os
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.stub_pokeapi import pokemon
+from pokedex_store import PokedexStore
+from pokemon_api import PokemonAPI
+from pokemon_cache import MetadataCache
+
+SIZES = (20, 1000, 10000)
+WINDOW = 20
+
+
+def fill(cache, count):
+    ids = [str(i) for i in range(1, count + 1)]
+    for pokemon_id in ids:
+        cache.put(pokemon_id, PokemonAPI.make_entry(pokemon(int(pokemon_id))), {'etag': '"x"'}, time.time())
+    cache.set_list('stub', count, ids, {}, time.time())
+    cache.save()
+
+
+def measure(open_cache, count):
+    tracemalloc.start()
+    start = time.perf_counter()
+    cache = open_cache()
+    window = cache.pokemon_list(WINDOW)
+    if isinstance(cache, PokedexStore):
+        found = cache.get(count // 2)
+    else:
+        found = cache.entries.get(str(count // 2))
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert window and found
+    return elapsed * 1000, peak / 1024
+
+
+if __name__ == "__main__":
+    print(f"{'entries':>8} {'json ms':>9} {'json KiB':>9} {'sqlite ms':>10} {'sqlite KiB':>11}")
+    for count in SIZES:
+        with tempfile.TemporaryDirectory() as directory:
+            json_path = os.path.join(directory, "pokemon_list.json")
+            db_path = os.path.join(directory, "pokedex.db")
+            fill(MetadataCache(json_path), count)
+            store = PokedexStore(db_path)
+            fill(store, count)
+            store.close()
+
+            json_ms, json_kib = measure(lambda: MetadataCache(json_path), count)
+            db_ms, db_kib = measure(lambda: PokedexStore(db_path), count)
+            print(f"{count:>8} {json_ms:>9.2f} {json_kib:>9.0f} {db_ms:>10.2f} {db_kib:>11.0f}")
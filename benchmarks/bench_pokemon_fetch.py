@@ -0,0 +1,48 @@
+"""
+Full Pokedex fetch against the local stub PokeAPI: sequential vs PokemonFetcher.
+
+    python -m benchmarks.bench_pokemon_fetch [count] [latency_seconds]
+"""
+import sys
+import time
+
+import requests
+
+from benchmarks.stub_pokeapi import StubPokeAPI
+from pokemon_fetcher import PokemonFetcher
+
+
+def sequential(base_url, count):
+    # What PokemonAPI used to do: a fresh connection per request
+    results = requests.get(f"{base_url}pokemon?limit={count}").json()['results']
+    return [PokemonFetcher.parse_details(requests.get(pokemon['url']).json()) for pokemon in results]
+
+
+def concurrent(base_url, count):
+    fetcher = PokemonFetcher(base_url)
+    try:
+        results = fetcher.fetch_list(count)
+        return fetcher.fetch_many([pokemon['url'] for pokemon in results])
+    finally:
+        fetcher.close()
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    latency = float(sys.argv[2]) if len(sys.argv) > 2 else 0.02
+    stub = StubPokeAPI(latency=latency, count=count).start()
+    try:
+        fast, fast_time = timed(concurrent, stub.base_url, count)
+        slow, slow_time = timed(sequential, stub.base_url, count)
+        assert fast == slow and len(fast) == count
+        print(f"{count} Pokemon, {latency * 1000:.0f} ms latency per request")
+        print(f"sequential:     {slow_time:.2f} s")
+        print(f"PokemonFetcher: {fast_time:.2f} s")
+    finally:
+        stub.stop()
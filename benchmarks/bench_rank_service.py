@@ -0,0 +1,64 @@
+"""
+Leaderboard (Fenwick tree) vs SQL over the players table, at a million players.
+
+    python -m benchmarks.bench_rank_service [players]
+"""
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+from leaderboard import Leaderboard
+
+SQL_RANK = 'SELECT 1 + COUNT(*) FROM players WHERE highscore > (SELECT highscore FROM players WHERE username = ?)'
+SQL_PAGE = 'SELECT username, highscore FROM players ORDER BY highscore DESC, username LIMIT ? OFFSET ?'
+
+
+def percentiles(samples):
+    samples.sort()
+    return samples[len(samples) // 2], samples[int(len(samples) * 0.99)]
+
+
+def time_calls(func, args_list):
+    samples = []
+    for args in args_list:
+        start = time.perf_counter()
+        func(*args)
+        samples.append((time.perf_counter() - start) * 1e6)
+    return percentiles(samples)
+
+
+if __name__ == "__main__":
+    players = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    rng = random.Random(0)
+    rows = [(f"player{i}", int(rng.expovariate(1 / 40))) for i in range(players)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        conn = sqlite3.connect(os.path.join(directory, "players.db"))
+        conn.execute('CREATE TABLE players (id INTEGER PRIMARY KEY, username TEXT UNIQUE NOT NULL, highscore INTEGER)')
+        conn.executemany('INSERT INTO players (username, highscore) VALUES (?, ?)', rows)
+        conn.commit()
+
+        start = time.perf_counter()
+        board = Leaderboard.load(conn.execute('SELECT username, highscore FROM players'))
+        load_seconds = time.perf_counter() - start
+
+        names = [(rows[rng.randrange(players)][0],) for _ in range(2000)]
+        pages = [(rng.randrange(players), 20) for _ in range(2000)]
+        updates = [(rows[rng.randrange(players)][0], rng.randrange(400)) for _ in range(2000)]
+
+        rank_p50, rank_p99 = time_calls(board.rank, names)
+        page_p50, page_p99 = time_calls(board.page, pages)
+        set_p50, set_p99 = time_calls(board.set, updates)
+        sql_rank_p50, _ = time_calls(lambda name: conn.execute(SQL_RANK, (name,)).fetchone(), names[:5])
+        sql_page_p50, _ = time_calls(lambda offset, limit: conn.execute(SQL_PAGE, (limit, offset)).fetchall(),
+                                     pages[:5])
+        conn.close()
+
+    print(f"{players} players, Leaderboard.load {load_seconds:.2f} s")
+    print(f"{'us':14} {'p50':>10} {'p99':>10} {'SQL p50':>12}")
+    print(f"{'rank':14} {rank_p50:10.1f} {rank_p99:10.1f} {sql_rank_p50:12.0f}")
+    print(f"{'page (20)':14} {page_p50:10.1f} {page_p99:10.1f} {sql_page_p50:12.0f}")
+    print(f"{'set':14} {set_p50:10.1f} {set_p99:10.1f}")
@@ -0,0 +1,76 @@
+"""
+ReplayPlayer: random seeks vs re-simulating from tick 0, and fast-forward rate.
+
+A scripted bot plays a long run (it never dies, so the replay lasts as long
+as asked). Every seek is checked against the naive re-simulation.
+
+    python -m benchmarks.bench_replay [minutes]
+"""
+import random
+import sys
+import time
+
+from conf import Conf
+from replay import Replay, ReplayPlayer, ReplayWriter
+from simulation import Simulation
+
+
+def record(minutes, seed=1):
+    simulation = Simulation(seed=seed)
+    writer = ReplayWriter(seed, simulation.lives)
+    fly = False
+    while not simulation.state.game_over and simulation.state.tick < minutes * 60 * Conf.FPS:
+        target = simulation.bird_start_y + simulation.state.pipe_offset
+        if simulation.state.bird_y > target + 12:
+            fly = True
+        elif simulation.state.bird_y < target - 12:
+            fly = False
+        writer.record(fly)
+        simulation.step(fly)
+    return writer.finish()
+
+
+def naive_seek(replay, tick):
+    simulation = Simulation(seed=replay.seed, lives=replay.lives)
+    for fly in replay.inputs():
+        if simulation.state.tick >= tick:
+            break
+        simulation.step(fly)
+    return simulation.state
+
+
+if __name__ == "__main__":
+    minutes = float(sys.argv[1]) if len(sys.argv) > 1 else 30
+    replay = Replay.decode(record(minutes).encode())
+    rng = random.Random(0)
+
+    start = time.perf_counter()
+    player = ReplayPlayer(replay)
+    build_seconds = time.perf_counter() - start
+
+    targets = [rng.randrange(player.ticks + 1) for _ in range(200)]
+    samples = []
+    for tick in targets:
+        start = time.perf_counter()
+        state = player.seek(tick)
+        samples.append(time.perf_counter() - start)
+        assert state.as_dict() == naive_seek(replay, tick).as_dict(), tick
+    samples.sort()
+
+    naive = []
+    for tick in targets[:10]:
+        start = time.perf_counter()
+        naive_seek(replay, tick)
+        naive.append(time.perf_counter() - start)
+    naive.sort()
+
+    player.seek(0)
+    start = time.perf_counter()
+    player.advance(player.ticks)
+    fast_forward = player.ticks / (time.perf_counter() - start)
+
+    print(f"{player.ticks} ticks ({player.ticks / Conf.FPS / 60:.0f} min), {len(replay.encode())} bytes, "
+          f"{len(player.keyframes)} keyframes built in {build_seconds * 1e3:.0f} ms")
+    print(f"seek ms: p50 {samples[len(samples) // 2] * 1e3:.2f}  max {samples[-1] * 1e3:.2f}   "
+          f"(from tick 0: p50 {naive[len(naive) // 2] * 1e3:.1f})")
+    print(f"fast-forward: {fast_forward:.0f} ticks/s = {fast_forward / Conf.FPS:.0f}x real time")
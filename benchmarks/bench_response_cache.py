@@ -0,0 +1,95 @@
+"""
+Hot read paths of server.py with and without the response cache.
+
+Reader threads repeat /login of existing players (an upsert, so it needs
+the SQLite write lock), /leaderboard pages and /rank lookups while writer
+threads post /update_scores batches. Reports read throughput and latency
+with the cache off and on, and how much a client saves with If-None-Match.
+
+    python -m benchmarks.bench_response_cache [--readers 16] [--writers 4] [--seconds 5]
+"""
+import argparse
+import os
+import random
+import tempfile
+import threading
+import time
+
+import requests
+
+from benchmarks.load_server import percentile, serve_in_process
+
+
+def reader(url, deadline, seed, latencies):
+    rng = random.Random(seed)
+    session = requests.Session()
+    while time.perf_counter() < deadline:
+        roll = rng.random()
+        start = time.perf_counter()
+        if roll < 0.4:
+            session.post(url + '/login', json={'username': f"player{rng.randrange(50)}"})
+        elif roll < 0.7:
+            session.get(url + f"/leaderboard?offset={rng.randrange(5) * 10}&limit=10")
+        else:
+            session.get(url + f"/rank/player{rng.randrange(50)}")
+        latencies.append(time.perf_counter() - start)
+
+
+def writer(url, deadline, seed, players):
+    rng = random.Random(seed)
+    session = requests.Session()
+    seq = seed * 10 ** 9
+    while time.perf_counter() < deadline:
+        session.post(url + '/update_scores', json={'scores': [
+            {'id': rng.randrange(1, players + 1), 'score': rng.randrange(1000), 'seq': seq + i} for i in range(50)]})
+        seq += 50
+
+
+def run(url, cache, ttl, readers, writers, seconds, players):
+    cache.ttl = ttl
+    latencies = []
+    deadline = time.perf_counter() + seconds
+    threads = [threading.Thread(target=reader, args=(url, deadline, i, latencies)) for i in range(readers)]
+    threads += [threading.Thread(target=writer, args=(url, deadline, ttl * 1000 + i, players))
+                for i in range(writers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    latencies.sort()
+    return len(latencies) / seconds, percentile(latencies, 0.5), percentile(latencies, 0.99)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--readers', type=int, default=16)
+    parser.add_argument('--writers', type=int, default=4)
+    parser.add_argument('--seconds', type=float, default=5)
+    args = parser.parse_args()
+    players = 2000
+
+    with tempfile.TemporaryDirectory() as directory:
+        httpd, url = serve_in_process(os.path.join(directory, "server.db"))
+        import server
+
+        session = requests.Session()
+        for i in range(players):
+            session.post(url + '/login', json={'username': f"player{i}"})
+
+        results = {ttl: run(url, server.response_cache, ttl, args.readers, args.writers, args.seconds, players)
+                   for ttl in (0, 30.0)}
+        stats = server.response_cache.stats()
+
+        response = session.get(url + '/leaderboard?limit=100')
+        revalidated = session.get(url + '/leaderboard?limit=100', headers={'If-None-Match': response.headers['ETag']})
+        httpd.shutdown()
+        server.router.close()
+
+    print(f"{args.readers} readers, {args.writers} writers (50 scores per batch)")
+    print(f"{'':10} {'reads/s':>10} {'p50 ms':>8} {'p99 ms':>8}")
+    for ttl, label in ((0, 'no cache'), (30.0, 'cache')):
+        throughput, p50, p99 = results[ttl]
+        print(f"{label:10} {throughput:10.0f} {p50 * 1e3:8.1f} {p99 * 1e3:8.1f}")
+    print(f"hit rate {stats['hit_rate']:.0%}, {stats['invalidations']} invalidations")
+    print(f"/leaderboard?limit=100: {len(response.content)} bytes, revalidated: {revalidated.status_code} "
+          f"with {len(revalidated.content)} bytes")
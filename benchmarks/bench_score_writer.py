@@ -0,0 +1,46 @@
+"""
+Game-thread cost of persisting a score: Database.save_score inline vs
+ScoreWriter.save_score (queued, committed in batches on a background thread).
+
+    python -m benchmarks.bench_score_writer [saves]
+"""
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+from database import Database
+from score_writer import ScoreWriter
+
+
+def latencies(save, saves):
+    samples = []
+    for i in range(saves):
+        start = time.perf_counter()
+        save(f"player{i % 10}", i)
+        samples.append((time.perf_counter() - start) * 1e6)
+    samples.sort()
+    return statistics.median(samples), samples[int(len(samples) * 0.99)], samples[-1]
+
+
+if __name__ == "__main__":
+    saves = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    with tempfile.TemporaryDirectory() as directory:
+        database = Database(os.path.join(directory, "scores.db"))
+        inline = latencies(database.save_score, saves)
+
+        writer = ScoreWriter(Database(os.path.join(directory, "queued.db"))).start()
+        queued = latencies(writer.save_score, saves)
+        start = time.perf_counter()
+        writer.flush()
+        flush_ms = (time.perf_counter() - start) * 1e3
+        writer.stop()
+        stats = writer.stats()
+        Database.close_all()
+
+    print(f"{saves} saves, game-thread latency in us")
+    print(f"{'':12} {'p50':>8} {'p99':>8} {'max':>8}")
+    print(f"{'inline':12} {inline[0]:8.1f} {inline[1]:8.1f} {inline[2]:8.1f}")
+    print(f"{'ScoreWriter':12} {queued[0]:8.1f} {queued[1]:8.1f} {queued[2]:8.1f}")
+    print(f"background: {stats['committed']} writes in {stats['batches']} transactions, final flush {flush_ms:.1f} ms")
@@ -0,0 +1,27 @@
+"""
+Ticks per second of the headless simulation, no display needed.
+
+    python -m benchmarks.bench_simulation [ticks]
+"""
+import random
+import sys
+import time
+
+from simulation import Simulation
+
+
+def run(ticks):
+    rng = random.Random(1)
+    inputs = [rng.random() < 0.45 for _ in range(ticks)]
+    sim = Simulation(seed=1, lives=10 ** 9)
+
+    start = time.perf_counter()
+    for fly in inputs:
+        sim.step(fly)
+    elapsed = time.perf_counter() - start
+    return ticks / elapsed
+
+
+if __name__ == "__main__":
+    ticks = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    print(f"simulation: {run(ticks):,.0f} ticks/sec ({ticks} ticks)")
@@ -0,0 +1,93 @@
+"""
+ScoreSync against a locally spawned server.py.
+
+1. Offline: scores are written locally while nothing listens on the
+   server port; ScoreSync backs off and keeps everything queued.
+2. The server comes up: the outbox drains in batches (requests per score).
+3. Steady play: a score every few milliseconds, synced every interval
+   (sync lag = local commit to server acknowledgement).
+4. Every player's highscore on the server equals their local best and the
+   sprite change arrived; any failed check fails the benchmark.
+
+    python -m benchmarks.bench_sync [scores] [players]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+import requests
+
+from benchmarks.load_server import free_port, start_server
+from database import Database
+from score_sync import ScoreSync
+
+
+def wait_until(condition, timeout):
+    deadline = time.perf_counter() + timeout
+    while not condition():
+        if time.perf_counter() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+if __name__ == "__main__":
+    scores_count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    players = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    rng = random.Random(0)
+
+    with tempfile.TemporaryDirectory() as directory:
+        database = Database(os.path.join(directory, "client.db"))
+        port = free_port()
+        url = f"http://127.0.0.1:{port}"
+        sync = ScoreSync(url, database, interval=0.2, backoff=0.1, max_backoff=0.5, timeout=1).start()
+
+        database.save_scores([(f"player{rng.randrange(players)}", rng.randrange(500)) for _ in range(scores_count)])
+        database.save_selected_sprite("player0", "25.png", "Pikachu")
+        time.sleep(2)
+        offline = sync.stats()
+
+        process, _ = start_server(os.path.join(directory, "server.db"), 1, 1, port)
+        try:
+            start = time.perf_counter()
+            drained = wait_until(lambda: database.pending_sync_count() == 0, 60)
+            drain_seconds = time.perf_counter() - start
+            drain = sync.stats()
+
+            steady_start = sync.uploaded, sync.requests, sync._lag_total
+            for _ in range(200):
+                database.save_score(f"player{rng.randrange(players)}", rng.randrange(500))
+                time.sleep(0.005)
+            wait_until(lambda: database.pending_sync_count() == 0, 10)
+            steady = sync.stats()
+            steady_uploaded = steady['uploaded'] - steady_start[0]
+            steady_requests = steady['requests'] - steady_start[1]
+            steady_lag = (sync._lag_total - steady_start[2]) / max(1, steady_uploaded)
+
+            mismatches = 0
+            for i in range(players):
+                local = database.get_high_score(f"player{i}")
+                response = requests.get(f"{url}/rank/player{i}", timeout=5)
+                remote = response.json()['highscore'] if response.status_code == 200 else None
+                mismatches += local != remote
+            sprite = requests.post(f"{url}/login", json={'username': 'player0'}, timeout=5).json()['sprite_file']
+        finally:
+            sync.stop()
+            process.terminate()
+            process.wait()
+
+    print(f"offline 2 s: {offline['failures']} failed rounds, {offline['pending']} of "
+          f"{scores_count + 1} writes still queued")
+    print(f"server up: drained={drained} in {drain_seconds:.2f} s, {drain['requests'] - offline['requests']} "
+          f"requests for {drain['uploaded']} writes")
+    print(f"steady: {steady_uploaded} scores in {steady_requests} requests, mean lag {steady_lag * 1e3:.0f} ms, "
+          f"max lag {steady['max_lag']:.2f} s (includes the offline backlog)")
+    print(f"server highscore != local best for {mismatches} of {players} players; player0 sprite {sprite}")
+
+    # Benchmark harus gagal kalau sync rusak, bukan hanya mencetak angka
+    assert offline['pending'] == scores_count + 1, f"{offline['pending']} writes queued offline"
+    assert drained, "outbox not drained within 60 s"
+    assert mismatches == 0, f"{mismatches} highscores differ"
+    assert sprite == "25.png", f"player0 sprite {sprite}"
@@ -0,0 +1,127 @@
+"""
+Throughput of server.py --workers N over N shards, for N = 1, 2, 4, ...
+
+Each configuration starts server.py as a subprocess on a fresh temporary
+database and drives it with load_server's client mix from several load
+processes (threads in one process would be limited by the GIL long before
+the server is). Scaling is only meaningful with spare cores for the load
+processes.
+
+The price of several workers is paid by the reads: with one worker the
+in-memory Leaderboard answers /rank in O(log S), with more the shards are
+merged in SQL (MergedLeaderboard). After the throughput table every
+configuration is filled with --players players and /rank and /leaderboard
+are timed at the top and at Conf.LEADERBOARD_MAX_OFFSET, the deepest page
+server.py serves (as served: one worker also answers repeats from its
+response cache).
+
+    python -m benchmarks.bench_workers [--workers 1 2 4] [--clients 32] [--seconds 10] [--load-processes 4]
+        [--players 100000]
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import tempfile
+import threading
+import time
+from collections import Counter, defaultdict
+
+import requests
+
+from benchmarks.load_server import client, percentile, start_server
+from conf import Conf
+from shard_router import ShardRouter
+
+
+def load_process(url, clients, seconds, seed):
+    latencies, errors, logins, scores = defaultdict(list), Counter(), defaultdict(set), []
+    deadline = time.perf_counter() + seconds
+    threads = [threading.Thread(target=client, args=(url, [f"player{i}" for i in range(200)], deadline,
+                                                     seed + i, 1, latencies, errors, logins, scores))
+               for i in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return [sample for samples in latencies.values() for sample in samples], sum(errors.values())
+
+
+def populate(db_path, shards, players, seed=0):
+    """players random highscores written straight into the shard files of a running server"""
+    rng = random.Random(seed)
+    router = ShardRouter(db_path, shards)
+    rows = defaultdict(list)
+    for i in range(players):
+        username = f"bench{i}"
+        rows[router.for_username(username)].append((username, rng.randrange(10000)))
+    for pool, shard_rows in rows.items():
+        with pool.transaction() as conn:
+            conn.executemany('INSERT INTO players (username, highscore) VALUES (?, ?)', shard_rows)
+    router.close()
+
+
+def read_latency(url, path, repeat=20):
+    """Median milliseconds of GET path"""
+    samples = []
+    with requests.Session() as session:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            response = session.get(url + path, timeout=30)
+            samples.append(time.perf_counter() - start)
+            assert response.status_code == 200, (path, response.status_code)
+    samples.sort()
+    return percentile(samples, 0.5) * 1e3
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--clients', type=int, default=32, help="client threads in total")
+    parser.add_argument('--seconds', type=float, default=10)
+    parser.add_argument('--load-processes', type=int, default=4)
+    parser.add_argument('--players', type=int, default=100000, help="players for the read cost table")
+    args = parser.parse_args()
+
+    print(f"{os.cpu_count()} cores, {args.clients} clients in {args.load_processes} load processes")
+    print(f"{'workers':>8} {'req/s':>10} {'p50 ms':>8} {'p99 ms':>8} {'errors':>8}")
+    baseline = None
+    for workers in args.workers:
+        with tempfile.TemporaryDirectory() as directory:
+            process, url = start_server(os.path.join(directory, "server.db"), workers, workers)
+            try:
+                with multiprocessing.Pool(args.load_processes) as load:
+                    results = load.starmap(load_process, [(url, args.clients // args.load_processes, args.seconds,
+                                                           i * 1000) for i in range(args.load_processes)])
+            finally:
+                process.terminate()
+                process.wait()
+        latencies = sorted(latency for samples, _ in results for latency in samples)
+        throughput = len(latencies) / args.seconds
+        baseline = baseline or throughput
+        print(f"{workers:8} {throughput:10.0f} {percentile(latencies, 0.5) * 1e3:8.1f} "
+              f"{percentile(latencies, 0.99) * 1e3:8.1f} {sum(errors for _, errors in results):8}"
+              f"   x{throughput / baseline:.2f}")
+
+    # Server baru per konfigurasi: Leaderboard di memori (1 worker) baru memuat pemain saat start
+    deep = Conf.LEADERBOARD_MAX_OFFSET
+    reads = {'rank top': "/rank/{top}", f"rank {deep}": "/rank/{deep}",
+             'page 0': "/leaderboard?offset=0&limit=10", f"page {deep}": f"/leaderboard?offset={deep}&limit=10"}
+    print(f"\nread ms (median) with {args.players} players")
+    print(f"{'workers':>8}" + "".join(f"{name:>14}" for name in reads))
+    for workers in args.workers:
+        with tempfile.TemporaryDirectory() as directory:
+            db_path = os.path.join(directory, "server.db")
+            process, url = start_server(db_path, workers, workers)
+            process.terminate()
+            process.wait()
+            populate(db_path, workers, args.players)
+            process, url = start_server(db_path, workers, workers)
+            try:
+                top, deep_player = (requests.get(f"{url}/leaderboard?offset={offset}&limit=1", timeout=30)
+                                    .json()['entries'][0]['username'] for offset in (0, min(deep, args.players - 1)))
+                timings = [read_latency(url, path.format(top=top, deep=deep_player)) for path in reads.values()]
+            finally:
+                process.terminate()
+                process.wait()
+        print(f"{workers:8}" + "".join(f"{ms:14.2f}" for ms in timings))
@@ -0,0 +1,287 @@
+"""
+Load generator and latency benchmark for server.py.
+
+Every client thread is a simulated player: it logs in as one of a set of
+usernames (so logins collide), then keeps playing - posting scores,
+sometimes changing its sprite, looking at the leaderboard or logging in
+again - picked by the weights of --mix, with an optional think time
+between requests. With --batch N the scores go to /update_scores, N per
+request.
+
+Reports throughput, latency percentiles overall and per endpoint, error
+counts, and SQLite lock contention as seen by the server: pool checkout
+waits, time spent waiting for the write lock in BEGIN IMMEDIATE, and 503
+"database busy" responses (from /db_stats, which is per worker process,
+so it is left out when another worker answers after the run). --json
+writes the same report as JSON, and --compare prints the change against
+an earlier --json report.
+
+    python -m benchmarks.load_server [--clients 32] [--seconds 10] [--batch 1] [--think 0]
+        [--mix login=0.2,score=0.6,sprite=0.2,leaderboard=0] [--workers 1 --shards 1]
+        [--url http://127.0.0.1:5000] [--json result.json] [--compare baseline.json]
+
+Without --url, server.py is started on a temporary database: in-process
+(threaded werkzeug server) for one worker, as a `server.py --workers N`
+subprocess otherwise.
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter, defaultdict
+
+import requests
+
+from conf import Conf
+
+DEFAULT_MIX = 'login=0.2,score=0.6,sprite=0.2,leaderboard=0'
+
+
+def percentile(samples, fraction):
+    return samples[min(len(samples) - 1, int(len(samples) * fraction))] if samples else 0.0
+
+
+def parse_mix(text):
+    mix = {}
+    for part in text.split(','):
+        name, _, weight = part.partition('=')
+        if name not in ('login', 'score', 'sprite', 'leaderboard'):
+            raise ValueError(f"unknown request kind in --mix: {name}")
+        mix[name] = float(weight)
+    return mix
+
+
+def client(url, users, deadline, seed, batch, latencies, errors, logins, scores, mix=None, think=0.0):
+    """One simulated player; latencies is {path: [seconds]}, shared by all clients"""
+    rng = random.Random(seed)
+    kinds, weights = zip(*(mix or parse_mix(DEFAULT_MIX)).items())
+    session = requests.Session()
+    player_id = None
+    # Setiap client = satu device (seq = device << 40 | nomor urut, seperti ScoreSync); device dari seed,
+    # jadi run berikutnya pada server yang sama tidak mengirim seq yang sudah lewat
+    seq = rng.getrandbits(22) << 40
+    while time.perf_counter() < deadline:
+        kind = 'login' if player_id is None else rng.choices(kinds, weights)[0]
+        method = 'post'
+        if kind == 'login':
+            username = rng.choice(users)
+            path, payload = '/login', {'username': username}
+        elif kind == 'score' and batch > 1:
+            path, payload = '/update_scores', {'scores': [{'id': player_id, 'score': rng.randrange(200), 'seq': seq + i}
+                                                          for i in range(1, batch + 1)]}
+            seq += batch
+        elif kind == 'score':
+            path, payload = '/update_score', {'id': player_id, 'highscore': rng.randrange(200)}
+        elif kind == 'sprite':
+            path, payload = '/update_sprite', {'id': player_id, 'sprite_file': f"{rng.randrange(1, 152)}.png",
+                                               'sprite_name': 'Pokemon'}
+        else:
+            method, path, payload = 'get', f"/leaderboard?offset={rng.randrange(10) * 10}&limit=10", None
+        start = time.perf_counter()
+        try:
+            response = session.request(method, url + path, json=payload, timeout=30)
+        except requests.RequestException as e:
+            errors[type(e).__name__] += 1
+            continue
+        endpoint = path.partition('?')[0]
+        latencies[endpoint].append(time.perf_counter() - start)
+        if response.status_code != 200:
+            errors[f"{endpoint} {response.status_code}"] += 1
+        elif path == '/login':
+            player_id = response.json()['id']
+            logins[payload['username']].add(player_id)
+        elif path == '/update_scores':
+            # Hanya skor yang diterima server; duplikat tidak dihitung
+            scores.append(response.json()['accepted'])
+        elif path == '/update_score':
+            scores.append(1)
+        if think:
+            time.sleep(rng.expovariate(1 / think))
+
+
+def latency_summary(samples):
+    samples.sort()
+    return {
+        'count': len(samples),
+        'p50_ms': percentile(samples, 0.50) * 1e3,
+        'p95_ms': percentile(samples, 0.95) * 1e3,
+        'p99_ms': percentile(samples, 0.99) * 1e3,
+        'max_ms': percentile(samples, 1.0) * 1e3,
+    }
+
+
+def server_stats(url):
+    try:
+        stats = requests.get(url + '/db_stats', timeout=5).json()
+    except (requests.RequestException, ValueError):
+        return None
+    shards = stats['shards']
+    return {
+        'pid': stats['pid'],
+        'busy_responses': stats['busy_responses'],
+        'pool_waits': sum(shard['waits'] for shard in shards),
+        'pool_wait_seconds': sum(shard['wait_seconds'] for shard in shards),
+        'transactions': sum(shard['transactions'] for shard in shards),
+        'lock_wait_seconds': sum(shard['lock_wait_seconds'] for shard in shards),
+        'lock_wait_max_ms': max(shard['lock_wait_max'] for shard in shards) * 1e3,
+        'shards': shards,
+    }
+
+
+def run(url, clients, seconds, batch=1, users=200, mix=None, think=0.0):
+    """Drive url for seconds and return the report as a dict"""
+    mix = mix or parse_mix(DEFAULT_MIX)
+    usernames = [f"player{i}" for i in range(users)]
+    latencies, errors, logins, scores = defaultdict(list), Counter(), defaultdict(set), []
+    before = server_stats(url)
+    deadline = time.perf_counter() + seconds
+    # Seed berbeda per run: device (dan seq) setiap client berbeda dari run sebelumnya
+    base_seed = int(time.time() * 1000)
+    threads = [threading.Thread(target=client, args=(url, usernames, deadline, base_seed + i, batch,
+                                                     latencies, errors, logins, scores, mix, think))
+               for i in range(clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    after = server_stats(url)
+
+    every = [sample for samples in latencies.values() for sample in samples]
+    contention = None
+    # Statistik server per proses: dengan --workers N hanya bisa dihitung kalau proses yang sama menjawab
+    if after is not None and (before is None or before['pid'] == after['pid']):
+        # Selisih terhadap sebelum run: server yang sama bisa dipakai beberapa run
+        contention = {key: after[key] - (before[key] if before else 0) for key in
+                      ('busy_responses', 'pool_waits', 'pool_wait_seconds', 'transactions', 'lock_wait_seconds')}
+        contention['lock_wait_max_ms'] = after['lock_wait_max_ms']
+    return {
+        'config': {'clients': clients, 'seconds': seconds, 'batch': batch, 'users': users, 'mix': mix,
+                   'think': think, 'url': url},
+        'machine': {'python': platform.python_version(), 'cpus': os.cpu_count()},
+        'elapsed': elapsed,
+        'requests': len(every),
+        'throughput_rps': len(every) / elapsed,
+        'scores_per_s': sum(scores) / elapsed,
+        'latency': latency_summary(every),
+        'endpoints': {path: latency_summary(samples) for path, samples in sorted(latencies.items())},
+        'errors': dict(errors),
+        'error_count': sum(errors.values()),
+        'duplicate_ids': sum(1 for ids in logins.values() if len(ids) > 1),
+        'contention': contention,
+    }
+
+
+def print_report(report):
+    config = report['config']
+    print(f"{config['clients']} clients, {report['elapsed']:.1f} s: {report['requests']} responses, "
+          f"{report['throughput_rps']:.0f} req/s, {report['scores_per_s']:.0f} scores/s")
+    print(f"{'latency ms':16} {'count':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}")
+    for name, summary in [('all', report['latency'])] + list(report['endpoints'].items()):
+        print(f"{name:16} {summary['count']:8} {summary['p50_ms']:8.1f} {summary['p95_ms']:8.1f} "
+              f"{summary['p99_ms']:8.1f} {summary['max_ms']:8.1f}")
+    print(f"errors: {report['errors'] or 'none'}; usernames with more than one id: {report['duplicate_ids']}")
+    contention = report['contention']
+    if contention:
+        print(f"contention: {contention['busy_responses']} busy (503), "
+              f"{contention['pool_waits']} pool waits ({contention['pool_wait_seconds']:.2f} s), "
+              f"write lock {contention['lock_wait_seconds']:.2f} s over {contention['transactions']} transactions "
+              f"(max {contention['lock_wait_max_ms']:.1f} ms)")
+
+
+def compare(report, baseline):
+    def change(new, old):
+        return f"{(new - old) / old * 100:+.1f}%" if old else "n/a"
+
+    print(f"vs baseline: throughput {change(report['throughput_rps'], baseline['throughput_rps'])}, "
+          f"p50 {change(report['latency']['p50_ms'], baseline['latency']['p50_ms'])}, "
+          f"p99 {change(report['latency']['p99_ms'], baseline['latency']['p99_ms'])}, "
+          f"errors {baseline['error_count']} -> {report['error_count']}")
+
+
+def serve_in_process(db_path):
+    os.environ['FLAPPY_BIRD_DB'] = db_path
+    from werkzeug.serving import make_server
+
+    import server
+
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)  # tanpa log per request
+    httpd = make_server('127.0.0.1', 0, server.app, threaded=True)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    return httpd, f"http://127.0.0.1:{httpd.server_port}"
+
+
+def free_port():
+    with socket.socket() as probe:
+        probe.bind(('127.0.0.1', 0))
+        return probe.getsockname()[1]
+
+
+def start_server(db_path, workers, shards, port=None):
+    """server.py --workers N as a subprocess; returns (process, url) once it answers"""
+    port = port or free_port()
+    env = dict(os.environ, FLAPPY_BIRD_DB=db_path, FLAPPY_BIRD_SHARDS=str(shards))
+    process = subprocess.Popen([sys.executable, os.path.join(Conf.BASE_DIR, "server.py"), "--port", str(port),
+                                "--workers", str(workers)], env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    url = f"http://127.0.0.1:{port}"
+    for _ in range(100):
+        try:
+            requests.get(url + '/leaderboard', timeout=1)
+            return process, url
+        except requests.ConnectionError:
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError("server.py did not start")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--clients', type=int, default=32)
+    parser.add_argument('--seconds', type=float, default=10)
+    parser.add_argument('--batch', type=int, default=1, help="scores per /update_scores request (1: /update_score)")
+    parser.add_argument('--users', type=int, default=200, help="distinct usernames the clients log in as")
+    parser.add_argument('--think', type=float, default=0.0, help="mean seconds between a client's requests")
+    parser.add_argument('--mix', default=DEFAULT_MIX, help="relative weights of the request kinds")
+    parser.add_argument('--workers', type=int, default=1, help="server.py processes (without --url)")
+    parser.add_argument('--shards', type=int, default=1, help="player databases (without --url)")
+    parser.add_argument('--url', help="server to test (default: start server.py)")
+    parser.add_argument('--json', help="write the report to this file")
+    parser.add_argument('--compare', help="earlier --json report to compare with")
+    args = parser.parse_args()
+    options = dict(batch=args.batch, users=args.users, mix=parse_mix(args.mix), think=args.think)
+
+    if args.url:
+        report = run(args.url.rstrip('/'), args.clients, args.seconds, **options)
+    else:
+        with tempfile.TemporaryDirectory() as directory:
+            db_path = os.path.join(directory, "server.db")
+            if args.workers == 1 and args.shards == 1:
+                httpd, url = serve_in_process(db_path)
+                report = run(url, args.clients, args.seconds, **options)
+                httpd.shutdown()
+            else:
+                process, url = start_server(db_path, args.workers, args.shards)
+                try:
+                    report = run(url, args.clients, args.seconds, **options)
+                finally:
+                    process.terminate()
+                    process.wait()
+        report['config'].update(workers=args.workers, shards=args.shards)
+
+    print_report(report)
+    if args.compare:
+        with open(args.compare) as file:
+            compare(report, json.load(file))
+    if args.json:
+        with open(args.json, 'w') as file:
+            json.dump(report, file, indent=2)
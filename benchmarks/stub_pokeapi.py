@@ -0,0 +1,115 @@
+"""
+Local stand-in for the PokeAPI endpoints PokemonAPI uses.
+
+    /api/v2/pokemon?limit=N[&offset=M]  ->  {"count": ..., "results": [{"name", "url"}]}
+    /api/v2/pokemon/<id>/               ->  {"id", "name", "types", "height", "weight"}
+
+Every response is delayed by `latency` seconds to stand in for the network.
+Responses carry an ETag and Last-Modified; a matching If-None-Match gets a 304.
+Run standalone with  python -m benchmarks.stub_pokeapi [port] [latency]
+"""
+import hashlib
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+TYPES = ['grass', 'poison', 'fire', 'flying', 'water', 'bug', 'normal', 'electric',
+         'ground', 'fairy', 'fighting', 'psychic', 'rock', 'steel', 'ice', 'ghost', 'dragon', 'dark']
+
+
+def pokemon(pokemon_id):
+    types = [TYPES[pokemon_id % len(TYPES)]]
+    if pokemon_id % 3 == 0:
+        types.append(TYPES[(pokemon_id // 3) % len(TYPES)])
+    return {
+        'id': pokemon_id,
+        'name': f"pokemon{pokemon_id}",
+        'types': [{'slot': i + 1, 'type': {'name': name}} for i, name in enumerate(types)],
+        'height': 3 + pokemon_id % 20,
+        'weight': 10 + pokemon_id % 900,
+    }
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real API
+
+    def do_GET(self):
+        server = self.server
+        server.requests += 1
+        if server.latency:
+            time.sleep(server.latency)
+
+        url = urlparse(self.path)
+        parts = [part for part in url.path.split('/') if part]
+        if parts[:3] != ['api', 'v2', 'pokemon']:
+            return self.send_json(404, {'detail': 'Not found.'})
+
+        if len(parts) == 3:
+            query = parse_qs(url.query)
+            limit = int(query.get('limit', ['20'])[0])
+            offset = int(query.get('offset', ['0'])[0])
+            ids = range(offset + 1, min(offset + limit, server.count) + 1)
+            base = f"http://{self.headers['Host']}/api/v2/pokemon/"
+            return self.send_json(200, {
+                'count': server.count,
+                'results': [{'name': f"pokemon{i}", 'url': f"{base}{i}/"} for i in ids],
+            })
+
+        pokemon_id = int(parts[3])
+        if not 1 <= pokemon_id <= server.count:
+            return self.send_json(404, {'detail': 'Not found.'})
+        self.send_json(200, pokemon(pokemon_id))
+
+    def send_json(self, status, payload):
+        body = json.dumps(payload).encode()
+        etag = '"%s"' % hashlib.sha1(body).hexdigest()[:16]
+        if status == 200 and self.headers.get('If-None-Match') == etag:
+            self.server.not_modified += 1
+            status, body = 304, b''
+
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', etag)
+        self.send_header('Last-Modified', 'Mon, 01 Jan 2024 00:00:00 GMT')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubPokeAPI(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, port=0, latency=0.0, count=1025):
+        super().__init__(('127.0.0.1', port), StubHandler)
+        self.latency = latency
+        self.count = count
+        self.requests = 0
+        self.not_modified = 0
+        self._thread = None
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}/api/v2/"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+if __name__ == "__main__":
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8765
+    latency = float(sys.argv[2]) if len(sys.argv) > 2 else 0.0
+    stub = StubPokeAPI(port, latency)
+    print(f"Stub PokeAPI on {stub.base_url}")
+    stub.serve_forever()
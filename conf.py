@@ -12,6 +12,17 @@ class Conf:
 
     PIPE_COLOR = (0, 200, 0)
     PIPE_SPEED = 5
+    # Pergeseran vertikal celah pipa, dipilih acak (berdasarkan seed) setiap pipa muncul lagi
+    PIPE_OFFSETS = (-60, -30, 0, 30, 60)
+
+    # Ukuran bird.png; skin Pokemon di-scale ke ukuran yang sama
+    BIRD_SIZE = (50, 39)
+    LIVES = 3
+    LEVEL_UP_SCORE = 5
+
+    # Simulasi berjalan di FPS (fixed timestep), render boleh lebih cepat
+    RENDER_FPS = 60
+    MAX_TICKS_PER_FRAME = 5
 
     FONT_SIZE = 50
     FONT_COLOR = (242, 255, 0)
@@ -26,6 +37,66 @@ class Conf:
     ENTRY_FONT_SIZE = 30
     ENTRY_FONT_COLOR = (255, 255, 255)
 
+    # Batas memori untuk surface teks yang sudah di-render (TextCache)
+    TEXT_CACHE_BYTES = 4 * 1024 * 1024
+
+    POKEAPI_URL = "https://pokeapi.co/api/v2/"
+    POKEAPI_WORKERS = 16      # request paralel maksimum
+    POKEAPI_RETRIES = 3
+    POKEAPI_BACKOFF = 0.5     # detik, dikali 2 setiap percobaan ulang
+    POKEAPI_TIMEOUT = 10
+    # Metadata Pokemon di-revalidate (conditional GET) setelah TTL ini lewat
+    POKEMON_CACHE_TTL = 7 * 24 * 3600
+
+    # Berapa sprite hasil loader thread yang di-convert per frame
+    SPRITES_PER_FRAME = 8
+    # Roster penuh; hanya sprite di sekitar pilihan yang dimuat
+    POKEMON_LIMIT = 1025
+    SPRITE_WINDOW_RADIUS = 3
+    SPRITE_PREFETCH = 6       # sprite tambahan searah browsing
+    GRID_CELL_SIZE = 90
+    # Sprite besar di selector (x ukuran bird), dibuat oleh preprocess_sprites.py
+    SPRITE_PREVIEW_SCALE = 3
+    # Budget PokemonAPI.sprites_cache (LRU); skin yang dipakai Bird di-pin
+    SPRITE_CACHE_BYTES = 2 * 1024 * 1024
+    # Sheet atlas (python atlas.py); AssetManager mengambil subsurface dari sini
+    ATLAS_INDEX = os.path.join(BASE_DIR, "assets", "atlas", "atlas.json")
+    ATLAS_MAX_SIZE = 2048
+
+    # flappy_bird.db: pemain tanpa login disimpan sebagai guest
+    DEFAULT_USERNAME = 'guest'
+    DB_BUSY_TIMEOUT = 5.0     # detik menunggu lock writer lain
+    DB_CACHED_STATEMENTS = 64
+    # ScoreWriter: skor di-commit paling lambat sekian detik setelah diantrikan
+    # (jendela data yang bisa hilang kalau game crash)
+    SCORE_FLUSH_INTERVAL = 1.0
+    SCORE_BATCH_SIZE = 256
+    # Batch yang gagal sekian kali berturut-turut disimpan per penulisan; yang tetap gagal dibuang
+    SCORE_MAX_RETRIES = 5
+    # server.py: koneksi SQLite per proses worker
+    SERVER_DB_POOL_SIZE = 8   # per shard
+    SERVER_SHARDS = 1         # file SQLite pemain; hanya untuk database baru (tidak ada resharding)
+    SERVER_WORKERS = 1        # proses server.py (python server.py --workers N)
+    SERVER_MAX_BATCH = 1000   # entri maksimum per request /update_scores
+    LEADERBOARD_MAX_LIMIT = 100
+    # Halaman lebih dalam dari ini ditolak: dengan --workers N setiap halaman menggabungkan
+    # offset + limit baris dari setiap shard
+    LEADERBOARD_MAX_OFFSET = 10000
+    RESPONSE_CACHE_TTL = 30.0    # detik; 0 mematikan cache respons server
+    RESPONSE_CACHE_SIZE = 10000  # entri maksimum (LRU)
+    # ScoreSync: skor & pilihan sprite lokal diunggah ke server.py ('' = tidak sinkron)
+    SERVER_URL = os.environ.get('FLAPPY_BIRD_SERVER', 'http://127.0.0.1:5000')
+    SYNC_INTERVAL = 5.0       # detik antar putaran sinkron
+    SYNC_BATCH_SIZE = 500     # baris outbox per putaran (<= SERVER_MAX_BATCH)
+    SYNC_BACKOFF = 1.0        # detik, dikali 2 setiap kegagalan berturut-turut
+    SYNC_MAX_BACKOFF = 60.0
+    SYNC_TIMEOUT = 5
+
+    # Replay: keyframe setiap 10 detik (seek mensimulasikan paling banyak sekian tick)
+    REPLAY_KEYFRAME_INTERVAL = 250
+    REPLAY_SPEEDS = (1, 4, 16, 64)  # tombol F: kelipatan kecepatan fast-forward
+    REPLAY_SEEK_SECONDS = 5         # tombol kiri/kanan
+
     @staticmethod
     def resource_path(relative_path):
         """Mendapatkan path absolut ke resource, bekerja untuk pengembangan dan executable PyInstaller"""
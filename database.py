@@ -1,104 +1,393 @@
+import atexit
+import random
 import sqlite3
 import os
+import threading
+from contextlib import contextmanager
 from conf import Conf
+from replay import Replay
 
 class Database:
-    def __init__(self):
-        self.db_path = os.path.join(Conf.BASE_DIR, 'flappy_bird.db')
-        self.conn = None
-        self.cursor = None
-        self.initialize_db()
-    
+    """
+    Access to flappy_bird.db.
+
+    Every Database() shares the same connections: one per thread, opened once
+    in WAL mode and closed at exit. The tables are created (or upgraded from
+    the old schema without usernames) only the first time a file is opened.
+    SQL strings are constants, so sqlite3's statement cache prepares each of
+    them once per connection. Group writes with `with db.transaction():`.
+
+    Leaderboard: triggers keep best_scores (each user's best, indexed by
+    score) and score_counts (how many users have each best score) in step
+    with every insert into scores, inside the same transaction. Top-K and
+    neighbors are index range scans; a rank is one sum over score_counts,
+    which is bounded by the number of distinct scores, not by rows or users.
+
+    Sync: triggers also queue every new score and sprite choice in
+    sync_outbox, in the same transaction, for ScoreSync to upload to
+    server.py. Rows stay there until the server has acknowledged them.
+    """
+
+    INSERT_SCORE = 'INSERT INTO scores (username, score) VALUES (?, ?)'
+    SELECT_HIGH_SCORE = 'SELECT score FROM best_scores WHERE username = ?'
+    SELECT_TOP = 'SELECT username, score FROM best_scores ORDER BY score DESC, username LIMIT ?'
+    SELECT_HIGHER_COUNT = 'SELECT COALESCE(SUM(players), 0) FROM score_counts WHERE score > ?'
+    # Urutan ranking: score DESC, lalu username ASC untuk skor yang sama
+    SELECT_ABOVE_TIED = '''SELECT username, score FROM best_scores
+                           WHERE score = ? AND username < ? ORDER BY username DESC LIMIT ?'''
+    SELECT_ABOVE = 'SELECT username, score FROM best_scores WHERE score > ? ORDER BY score, username DESC LIMIT ?'
+    SELECT_BELOW_TIED = '''SELECT username, score FROM best_scores
+                           WHERE score = ? AND username > ? ORDER BY username LIMIT ?'''
+    SELECT_BELOW = 'SELECT username, score FROM best_scores WHERE score < ? ORDER BY score DESC, username LIMIT ?'
+    REPLACE_SPRITE = 'REPLACE INTO player_settings (username, selected_sprite, sprite_name) VALUES (?, ?, ?)'
+    SELECT_SPRITE = 'SELECT selected_sprite, sprite_name FROM player_settings WHERE username = ?'
+    SELECT_OUTBOX = 'SELECT id, username, score, sprite_file, sprite_name, queued FROM sync_outbox ORDER BY id LIMIT ?'
+    DELETE_OUTBOX = 'DELETE FROM sync_outbox WHERE id = ?'
+    COUNT_OUTBOX = 'SELECT COUNT(*) FROM sync_outbox'
+    INSERT_REPLAY = 'INSERT INTO replays (username, score, ticks, data) VALUES (?, ?, ?, ?)'
+    SELECT_BEST_REPLAY = 'SELECT data FROM replays WHERE username = ? ORDER BY score DESC, id DESC LIMIT 1'
+    SELECT_REPLAY = 'SELECT data FROM replays WHERE id = ?'
+
+    LEADERBOARD_SCHEMA = (
+        '''CREATE TABLE IF NOT EXISTS best_scores (
+            username TEXT PRIMARY KEY,
+            score INTEGER NOT NULL,
+            date TIMESTAMP
+        )''',
+        'CREATE INDEX IF NOT EXISTS best_scores_rank ON best_scores (score DESC, username)',
+        '''CREATE TABLE IF NOT EXISTS score_counts (
+            score INTEGER PRIMARY KEY,
+            players INTEGER NOT NULL
+        )''',
+        '''CREATE TRIGGER IF NOT EXISTS best_scores_insert AFTER INSERT ON best_scores BEGIN
+            INSERT INTO score_counts (score, players) VALUES (NEW.score, 1)
+            ON CONFLICT (score) DO UPDATE SET players = players + 1;
+        END''',
+        '''CREATE TRIGGER IF NOT EXISTS best_scores_update AFTER UPDATE OF score ON best_scores BEGIN
+            UPDATE score_counts SET players = players - 1 WHERE score = OLD.score;
+            DELETE FROM score_counts WHERE score = OLD.score AND players = 0;
+            INSERT INTO score_counts (score, players) VALUES (NEW.score, 1)
+            ON CONFLICT (score) DO UPDATE SET players = players + 1;
+        END''',
+        '''CREATE TRIGGER IF NOT EXISTS best_scores_delete AFTER DELETE ON best_scores BEGIN
+            UPDATE score_counts SET players = players - 1 WHERE score = OLD.score;
+            DELETE FROM score_counts WHERE score = OLD.score AND players = 0;
+        END''',
+    )
+
+    # Waktu antre dalam detik Unix (julianday, karena unixepoch('subsec') butuh SQLite 3.42)
+    SYNC_SCHEMA = (
+        '''CREATE TABLE IF NOT EXISTS sync_outbox (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username TEXT NOT NULL,
+            score INTEGER,
+            sprite_file TEXT,
+            sprite_name TEXT,
+            queued REAL NOT NULL DEFAULT ((julianday('now') - 2440587.5) * 86400.0)
+        )''',
+        '''CREATE TABLE IF NOT EXISTS sync_state (
+            key TEXT PRIMARY KEY,
+            value
+        )''',
+        '''CREATE TRIGGER IF NOT EXISTS scores_outbox AFTER INSERT ON scores BEGIN
+            INSERT INTO sync_outbox (username, score) VALUES (NEW.username, NEW.score);
+        END''',
+        # REPLACE INTO = DELETE + INSERT, jadi AFTER INSERT juga menangkap penggantian
+        '''CREATE TRIGGER IF NOT EXISTS player_settings_outbox AFTER INSERT ON player_settings BEGIN
+            INSERT INTO sync_outbox (username, sprite_file, sprite_name)
+            VALUES (NEW.username, NEW.selected_sprite, NEW.sprite_name);
+        END''',
+    )
+
+    _lock = threading.Lock()
+    _local = threading.local()
+    _connections = []
+    _initialized = set()
+
+    def __init__(self, db_path=None):
+        self.db_path = db_path or os.path.join(Conf.BASE_DIR, 'flappy_bird.db')
+        with Database._lock:
+            if self.db_path not in Database._initialized:
+                self.initialize_db()
+                Database._initialized.add(self.db_path)
+
+    @property
+    def conn(self):
+        """This thread's connection, opened on first use"""
+        connections = getattr(Database._local, 'connections', None)
+        if connections is None:
+            connections = Database._local.connections = {}
+        conn = connections.get(self.db_path)
+        if conn is None:
+            conn = connections[self.db_path] = self.connect()
+        return conn
+
     def connect(self):
-        """Connect to the SQLite database"""
-        self.conn = sqlite3.connect(self.db_path)
-        self.cursor = self.conn.cursor()
-    
+        """Open a connection to the SQLite database in WAL mode"""
+        # isolation_level=None: transaksi dikontrol sendiri lewat transaction()
+        conn = sqlite3.connect(self.db_path, timeout=Conf.DB_BUSY_TIMEOUT, isolation_level=None,
+                               check_same_thread=False, cached_statements=Conf.DB_CACHED_STATEMENTS)
+        conn.execute('PRAGMA journal_mode=WAL')
+        # Dengan WAL, NORMAL tetap aman dari korupsi dan jauh lebih sedikit fsync
+        conn.execute('PRAGMA synchronous=NORMAL')
+        Database._connections.append(conn)
+        return conn
+
     def disconnect(self):
-        """Close the database connection"""
-        if self.conn:
-            self.conn.close()
-            self.conn = None
-            self.cursor = None
-    
+        """Close this thread's connection (the next call opens a new one)"""
+        connections = getattr(Database._local, 'connections', {})
+        conn = connections.pop(self.db_path, None)
+        if conn is not None:
+            conn.close()
+            Database._connections.remove(conn)
+
+    @classmethod
+    def close_all(cls):
+        """Close every connection of every thread; registered with atexit"""
+        for conn in cls._connections:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+        cls._connections.clear()
+        cls._local = threading.local()
+
+    @contextmanager
+    def transaction(self):
+        """
+        One write transaction for everything in the with block, rolled back
+        on error. Nested calls join the outer transaction.
+        """
+        conn = self.conn
+        if conn.in_transaction:
+            yield conn
+            return
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            yield conn
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        conn.execute('COMMIT')
+
+    @staticmethod
+    def user(username):
+        """Username to store under; without login everything belongs to the guest player"""
+        return username or Conf.DEFAULT_USERNAME
+
     def initialize_db(self):
         """Create the scores and player_settings tables if they don't exist"""
-        self.connect()
-        
-        # Create scores table
-        self.cursor.execute('''
-        CREATE TABLE IF NOT EXISTS scores (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            username TEXT NOT NULL,
-            score INTEGER NOT NULL,
-            date TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-        ''')
-        
-        # Create player_settings table for character selection
-        self.cursor.execute('''
-        CREATE TABLE IF NOT EXISTS player_settings (
-            username TEXT PRIMARY KEY,
-            selected_sprite TEXT NOT NULL,
-            sprite_name TEXT NOT NULL
-        )
+        with self.transaction() as conn:
+            # Create scores table
+            conn.execute('''
+            CREATE TABLE IF NOT EXISTS scores (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                username TEXT NOT NULL,
+                score INTEGER NOT NULL,
+                date TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+            ''')
+            # Database lama (sebelum ada login): skor lama jadi milik guest
+            if 'username' not in self.columns('scores'):
+                conn.execute("ALTER TABLE scores ADD COLUMN username TEXT NOT NULL DEFAULT '%s'"
+                             % Conf.DEFAULT_USERNAME.replace("'", "''"))
+
+            # player_settings lama hanya punya satu pilihan global (id, tanpa username)
+            settings_columns = self.columns('player_settings')
+            legacy_settings = bool(settings_columns) and 'username' not in settings_columns
+            if legacy_settings:
+                conn.execute('ALTER TABLE player_settings RENAME TO player_settings_old')
+
+            # Create player_settings table for character selection
+            conn.execute('''
+            CREATE TABLE IF NOT EXISTS player_settings (
+                username TEXT PRIMARY KEY,
+                selected_sprite TEXT NOT NULL,
+                sprite_name TEXT NOT NULL
+            )
+            ''')
+            if legacy_settings:
+                conn.execute('''
+                INSERT INTO player_settings (username, selected_sprite, sprite_name)
+                SELECT ?, selected_sprite, sprite_name FROM player_settings_old ORDER BY id DESC LIMIT 1
+                ''', (Conf.DEFAULT_USERNAME,))
+                conn.execute('DROP TABLE player_settings_old')
+
+            conn.execute('CREATE INDEX IF NOT EXISTS scores_username_score ON scores (username, score)')
+
+            # Rekaman input (replay.Replay.encode()) dari run yang disimpan skornya
+            conn.execute('''
+            CREATE TABLE IF NOT EXISTS replays (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                username TEXT NOT NULL,
+                score INTEGER NOT NULL,
+                ticks INTEGER NOT NULL,
+                data BLOB NOT NULL,
+                date TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+            ''')
+            conn.execute('CREATE INDEX IF NOT EXISTS replays_username_score ON replays (username, score)')
+            self.create_leaderboard(conn)
+            self.create_sync_outbox(conn)
+
+    def create_leaderboard(self, conn):
+        """best_scores and score_counts plus the triggers that maintain them; backfilled from scores once"""
+        backfill = not self.columns('best_scores')
+        # executescript() would commit the surrounding transaction, so one statement at a time
+        for statement in self.LEADERBOARD_SCHEMA:
+            conn.execute(statement)
+        if backfill:
+            # date ikut dari baris dengan MAX(score) (bare column SQLite)
+            conn.execute('''
+            INSERT INTO best_scores (username, score, date)
+            SELECT username, MAX(score), date FROM scores GROUP BY username
+            ''')
+        conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS scores_best AFTER INSERT ON scores BEGIN
+            INSERT INTO best_scores (username, score, date) VALUES (NEW.username, NEW.score, NEW.date)
+            ON CONFLICT (username) DO UPDATE SET score = excluded.score, date = excluded.date
+            WHERE excluded.score > best_scores.score;
+        END
         ''')
-        
-        # Ensure there is at least a default setting for any new user upon login
-        # (we'll insert lazily in Game.login)
-        
-        self.conn.commit()
-        self.disconnect()
-    
+
+    def create_sync_outbox(self, conn):
+        """sync_outbox and its triggers; the first time, queue each player's best score and sprite"""
+        backfill = not self.columns('sync_outbox')
+        for statement in self.SYNC_SCHEMA:
+            conn.execute(statement)
+        if backfill:
+            # Riwayat lengkap tidak perlu: server hanya menyimpan highscore
+            conn.execute('INSERT INTO sync_outbox (username, score) SELECT username, score FROM best_scores')
+            conn.execute('''
+            INSERT INTO sync_outbox (username, sprite_file, sprite_name)
+            SELECT username, selected_sprite, sprite_name FROM player_settings
+            ''')
+
+    def columns(self, table):
+        return {row[1] for row in self.conn.execute(f'PRAGMA table_info({table})')}
+
     def save_score(self, username, score):
         """Save a score to the database under given username"""
-        self.connect()
-        self.cursor.execute(
-            'INSERT INTO scores (username, score) VALUES (?, ?)',
-            (username, score)
-        )
-        self.conn.commit()
-        self.disconnect()
-    
-    def get_high_score(self, username):
+        with self.transaction() as conn:
+            conn.execute(self.INSERT_SCORE, (self.user(username), score))
+
+    def save_scores(self, scores):
+        """Save many (username, score) pairs in a single transaction"""
+        with self.transaction() as conn:
+            conn.executemany(self.INSERT_SCORE, [(self.user(username), score) for username, score in scores])
+
+    def save_replays(self, replays):
+        """Save many (username, score, replay.Replay) in a single transaction"""
+        with self.transaction() as conn:
+            conn.executemany(self.INSERT_REPLAY, [(self.user(username), score, replay.ticks, replay.encode())
+                                                  for username, score, replay in replays])
+
+    def get_best_replay(self, username=None):
+        """Replay of username's best recorded run, or None"""
+        row = self.conn.execute(self.SELECT_BEST_REPLAY, (self.user(username),)).fetchone()
+        return Replay.decode(row[0]) if row else None
+
+    def get_replay(self, replay_id):
+        row = self.conn.execute(self.SELECT_REPLAY, (replay_id,)).fetchone()
+        return Replay.decode(row[0]) if row else None
+
+    def get_high_score(self, username=None):
         """Retrieve the highest score for this username"""
-        self.connect()
-        self.cursor.execute(
-            'SELECT MAX(score) FROM scores WHERE username = ?',
-            (username,)
-        )
-        high_score = self.cursor.fetchone()[0]
-        self.disconnect()
-        return high_score if high_score is not None else 0
-    
+        row = self.conn.execute(self.SELECT_HIGH_SCORE, (self.user(username),)).fetchone()
+        # Belum ada skor (database baru / username baru): tidak ada baris di best_scores
+        return row[0] if row else 0
+
+    def top_scores(self, k=10):
+        """Best k players as (rank, username, score); tied scores share a rank"""
+        return self.ranked(self.conn.execute(self.SELECT_TOP, (k,)).fetchall())
+
+    def get_rank(self, username=None):
+        """1-based rank of username's best score, or None if they have no score yet"""
+        score = self.conn.execute(self.SELECT_HIGH_SCORE, (self.user(username),)).fetchone()
+        if score is None:
+            return None
+        return self.rank_of(score[0])
+
+    def rank_of(self, score):
+        """
+        Rank a best score of this value has: 1 + players with a higher best.
+        One index range sum over score_counts, so O(distinct scores above
+        it), not O(log n); fine for game scores, which have few distinct values.
+        """
+        return 1 + self.conn.execute(self.SELECT_HIGHER_COUNT, (score,)).fetchone()[0]
+
+    def get_neighbors(self, username=None, count=2):
+        """
+        Up to count players either side of username in the ranking, plus
+        username itself, as (rank, username, score). Empty without a score.
+        """
+        username = self.user(username)
+        row = self.conn.execute(self.SELECT_HIGH_SCORE, (username,)).fetchone()
+        if row is None:
+            return []
+        score = row[0]
+        conn = self.conn
+
+        above = conn.execute(self.SELECT_ABOVE_TIED, (score, username, count)).fetchall()
+        if len(above) < count:
+            above += conn.execute(self.SELECT_ABOVE, (score, count - len(above))).fetchall()
+        below = conn.execute(self.SELECT_BELOW_TIED, (score, username, count)).fetchall()
+        if len(below) < count:
+            below += conn.execute(self.SELECT_BELOW, (score, count - len(below))).fetchall()
+        return self.ranked(above[::-1] + [(username, score)] + below)
+
+    def ranked(self, rows):
+        """(username, score) rows in ranking order -> (rank, username, score)"""
+        ranks = {}
+        result = []
+        for username, score in rows:
+            if score not in ranks:
+                ranks[score] = self.rank_of(score)
+            result.append((ranks[score], username, score))
+        return result
+
     def save_selected_sprite(self, username, sprite_path, sprite_name):
         """
         Save (or update) the selected sprite for given username.
         Uses REPLACE INTO so we don't have to delete first.
         """
-        self.connect()
-        self.cursor.execute('''
-            REPLACE INTO player_settings (username, selected_sprite, sprite_name)
-            VALUES (?, ?, ?)
-        ''', (username, sprite_path, sprite_name))
-        self.conn.commit()
-        self.disconnect()
-    
-    def get_selected_sprite(self, username):
+        with self.transaction() as conn:
+            conn.execute(self.REPLACE_SPRITE, (self.user(username), sprite_path, sprite_name))
+
+    def get_selected_sprite(self, username=None):
         """
         Get the currently selected sprite for given username.
         If none exists yet, returns default.
         """
-        self.connect()
-        self.cursor.execute(
-            'SELECT selected_sprite, sprite_name FROM player_settings WHERE username = ?',
-            (username,)
-        )
-        row = self.cursor.fetchone()
-        self.disconnect()
-        
+        row = self.conn.execute(self.SELECT_SPRITE, (self.user(username),)).fetchone()
+
         if row:
             return row[0], row[1]
         else:
             # default values
             return 'bird.png', 'Flappy Bird'
+
+
+    def pending_sync(self, limit):
+        """Oldest queued writes as (id, username, score, sprite_file, sprite_name, queued); score is None for sprites"""
+        return self.conn.execute(self.SELECT_OUTBOX, (limit,)).fetchall()
+
+    def pending_sync_count(self):
+        return self.conn.execute(self.COUNT_OUTBOX).fetchone()[0]
+
+    def delete_synced(self, ids):
+        with self.transaction() as conn:
+            conn.executemany(self.DELETE_OUTBOX, [(outbox_id,) for outbox_id in ids])
+
+    def device_id(self):
+        """Random id of this database, made on first use; keeps sync seq numbers unique per device"""
+        with self.transaction() as conn:
+            row = conn.execute("SELECT value FROM sync_state WHERE key = 'device'").fetchone()
+            if row is not None:
+                return row[0]
+            device = random.getrandbits(22)
+            conn.execute("INSERT INTO sync_state (key, value) VALUES ('device', ?)", (device,))
+            return device
+
+
+atexit.register(Database.close_all)
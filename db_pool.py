@@ -0,0 +1,124 @@
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+from conf import Conf
+
+
+class PoolTimeout(Exception):
+    """Every connection stayed checked out for longer than the busy timeout"""
+
+
+class ConnectionPool:
+    """
+    Pool of SQLite connections to one database file, shared by the request
+    threads of a server worker.
+
+    Connections are opened lazily up to size, in WAL mode (readers never
+    wait for the writer) with a busy timeout, so a writer that finds the
+    database locked waits for it instead of failing at once. Connections are
+    in autocommit mode: every statement is its own transaction unless the
+    caller uses transaction(). Writes should always use transaction(): its
+    BEGIN IMMEDIATE is where a writer waits for the write lock, and that
+    wait is what stats() reports as lock contention. Keep SQL strings
+    constant so each connection's statement cache can reuse the prepared
+    statements.
+    """
+
+    def __init__(self, path, size=None, busy_timeout=None):
+        self.path = path
+        self.size = size or Conf.SERVER_DB_POOL_SIZE
+        self.busy_timeout = Conf.DB_BUSY_TIMEOUT if busy_timeout is None else busy_timeout
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._all = []
+        self.waits = 0
+        self.wait_seconds = 0.0
+        # Kontensi write lock SQLite: lama BEGIN IMMEDIATE menunggu writer lain
+        self.transactions = 0
+        self.lock_wait_seconds = 0.0
+        self.lock_wait_max = 0.0
+        self.busy_errors = 0
+
+    def connect(self):
+        conn = sqlite3.connect(self.path, timeout=self.busy_timeout, isolation_level=None,
+                               check_same_thread=False, cached_statements=Conf.DB_CACHED_STATEMENTS)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        return conn
+
+    def acquire(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if len(self._all) < self.size:
+                conn = self.connect()
+                self._all.append(conn)
+                return conn
+        # Semua koneksi sedang dipakai: tunggu yang dikembalikan
+        start = time.perf_counter()
+        try:
+            conn = self._idle.get(timeout=self.busy_timeout)
+        except queue.Empty:
+            raise PoolTimeout(f"no free connection to {self.path} after {self.busy_timeout} s") from None
+        self.waits += 1
+        self.wait_seconds += time.perf_counter() - start
+        return conn
+
+    def release(self, conn):
+        if conn.in_transaction:
+            # Request gagal di tengah transaksi: jangan bocorkan lock ke pemakai berikutnya
+            conn.execute('ROLLBACK')
+        self._idle.put(conn)
+
+    @contextmanager
+    def connection(self):
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    @contextmanager
+    def transaction(self):
+        """A pooled connection inside BEGIN IMMEDIATE ... COMMIT (ROLLBACK on error)"""
+        with self.connection() as conn:
+            start = time.perf_counter()
+            try:
+                conn.execute('BEGIN IMMEDIATE')
+            except sqlite3.OperationalError:
+                self.busy_errors += 1
+                raise
+            waited = time.perf_counter() - start
+            self.transactions += 1
+            self.lock_wait_seconds += waited
+            self.lock_wait_max = max(self.lock_wait_max, waited)
+            try:
+                yield conn
+            except BaseException:
+                conn.execute('ROLLBACK')
+                raise
+            conn.execute('COMMIT')
+
+    def close(self):
+        with self._lock:
+            for conn in self._all:
+                conn.close()
+            self._all.clear()
+            self._idle = queue.LifoQueue()
+
+    def stats(self):
+        return {
+            'connections': len(self._all),
+            'idle': self._idle.qsize(),
+            'waits': self.waits,
+            'wait_seconds': self.wait_seconds,
+            'transactions': self.transactions,
+            'lock_wait_seconds': self.lock_wait_seconds,
+            'lock_wait_max': self.lock_wait_max,
+            'busy_errors': self.busy_errors,
+        }
@@ -0,0 +1,158 @@
+import threading
+from bisect import bisect_left, insort
+
+
+class Leaderboard:
+    """
+    In-memory order-statistic index over players' highscores for server.py.
+
+    A Fenwick tree counts players per score value, so "how many players
+    score higher" and "which score is at position k" are O(log S) for S
+    distinct score values, independent of the number of players. Players
+    with the same score are kept in a sorted list per score (the bucket),
+    ordered by username. Ranking order is score descending, then username;
+    tied players share a rank (1 + players with a higher score).
+
+    All methods are thread-safe; server.py updates it after each commit.
+    """
+
+    def __init__(self, capacity=1024):
+        self._lock = threading.Lock()
+        self._scores = {}       # username -> score
+        self._buckets = {}      # score -> sorted usernames
+        self._capacity = 1
+        while self._capacity < capacity:
+            self._capacity *= 2
+        self._tree = [0] * (self._capacity + 1)
+
+    @classmethod
+    def load(cls, rows):
+        """Build from (username, score) rows in O(n log n + S), e.g. SELECT username, highscore FROM players"""
+        board = cls()
+        counts = {}
+        for username, score in rows:
+            score = max(0, score or 0)
+            board._scores[username] = score
+            board._buckets.setdefault(score, []).append(username)
+            counts[score] = counts.get(score, 0) + 1
+        for bucket in board._buckets.values():
+            bucket.sort()
+        while counts and board._capacity <= max(counts):
+            board._capacity *= 2
+        # Fenwick dibangun linear dari jumlah per skor, bukan n kali update
+        tree = board._tree = [0] * (board._capacity + 1)
+        for score, count in counts.items():
+            tree[score + 1] += count
+        for i in range(1, len(tree)):
+            parent = i + (i & -i)
+            if parent < len(tree):
+                tree[parent] += tree[i]
+        return board
+
+    def __len__(self):
+        return len(self._scores)
+
+    # -- Fenwick tree (index = score + 1) ---------------------------------
+
+    def _grow(self, score):
+        if score < self._capacity:
+            return
+        capacity = self._capacity
+        while capacity <= score:
+            capacity *= 2
+        counts = [0] * capacity
+        for value, bucket in self._buckets.items():
+            counts[value] = len(bucket)
+        self._capacity = capacity
+        self._tree = [0] * (capacity + 1)
+        for value, count in enumerate(counts):
+            if count:
+                self._add(value, count)
+
+    def _add(self, score, delta):
+        i = score + 1
+        while i <= self._capacity:
+            self._tree[i] += delta
+            i += i & -i
+
+    def _count_at_most(self, score):
+        i = min(score + 1, self._capacity)
+        total = 0
+        while i > 0:
+            total += self._tree[i]
+            i -= i & -i
+        return total
+
+    def _score_at(self, k):
+        """Smallest score s with more than k players scoring <= s (k counted from the lowest)"""
+        position = 0
+        step = self._capacity
+        while step:
+            following = position + step
+            if following <= self._capacity and self._tree[following] <= k:
+                position = following
+                k -= self._tree[following]
+            step //= 2
+        return position  # index position + 1 is the score + 1
+
+    # -- Updates -----------------------------------------------------------
+
+    def set(self, username, score):
+        """Insert a player or change their score; returns the previous score (None for a new player)"""
+        score = max(0, score or 0)
+        with self._lock:
+            old = self._scores.get(username)
+            if old == score:
+                return old
+            if old is not None:
+                bucket = self._buckets[old]
+                del bucket[bisect_left(bucket, username)]
+                if not bucket:
+                    del self._buckets[old]
+                self._add(old, -1)
+            self._grow(score)
+            self._scores[username] = score
+            insort(self._buckets.setdefault(score, []), username)
+            self._add(score, 1)
+            return old
+
+    def remove(self, username):
+        with self._lock:
+            score = self._scores.pop(username, None)
+            if score is None:
+                return
+            bucket = self._buckets[score]
+            del bucket[bisect_left(bucket, username)]
+            if not bucket:
+                del self._buckets[score]
+            self._add(score, -1)
+
+    # -- Queries -----------------------------------------------------------
+
+    def score_of(self, username):
+        return self._scores.get(username)
+
+    def rank(self, username):
+        """1-based rank of username, or None for an unknown player"""
+        with self._lock:
+            score = self._scores.get(username)
+            if score is None:
+                return None
+            return 1 + len(self._scores) - self._count_at_most(score)
+
+    def page(self, offset=0, limit=10):
+        """Players at positions offset .. offset + limit - 1 as (rank, username, score)"""
+        entries = []
+        with self._lock:
+            total = len(self._scores)
+            position = max(0, offset)
+            while position < total and len(entries) < limit:
+                # Posisi dari atas -> posisi dari bawah untuk Fenwick
+                score = self._score_at(total - 1 - position)
+                higher = total - self._count_at_most(score)
+                bucket = self._buckets[score]
+                start = position - higher
+                for username in bucket[start:start + limit - len(entries)]:
+                    entries.append((higher + 1, username, score))
+                position = higher + len(bucket)
+        return entries
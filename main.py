@@ -2,11 +2,14 @@
 import pygame
 import sys
 import os
-from random import choice
+from random import choice, getrandbits
 
 from conf import Conf
 from statistic import Statistic
 from database import Database
+from replay import ReplayPlayer, ReplayWriter
+from simulation import Simulation
+from text_cache import TextCache
 from sprites.platform import Platform
 from sprites.bird import Bird
 from sprites.pipe import Pipe
@@ -26,7 +29,7 @@ class Game:
         self.database = Database()
         self.username = None  # set after login via Entry
 
-        self.font = pygame.font.Font(None, 26)
+        self.font = TextCache.font(None, 26)
         self.game_title_label = Label(self, "Flappy Bird")
         self.login_button = Button(self, "LOGIN")
         self.play_button = Button(self, "PLAY NOW")
@@ -56,8 +59,20 @@ class Game:
         self.pipes = [Pipe(self, pos) for pos in ["top", "bottom"]]
         self.sprite_selector = SpriteSelector(self)
 
+        # Game state lives in the headless simulation, sprites only render it
+        # Seed baru setiap run: urutan celah pipa tidak sama di setiap permainan (replay menyimpan seed-nya)
+        self.simulation = Simulation(seed=getrandbits(32))
+        # Input setiap tick direkam, supaya run dengan high score bisa diputar ulang
+        self.recorder = ReplayWriter(self.simulation.seed, self.simulation.lives)
+        # (username, replay) run high score terakhir: ScoreWriter baru menyimpannya sampai 1 detik kemudian
+        self.best_replay = None
+        # Replay yang sedang ditonton (tombol R setelah game over), None = main sendiri
+        self.player = None
+        self.playback_speed = 1
+
         # DB & sound
         Statistic.init_database()
+        Statistic.start_sync()
         self.is_muted = False
         self.play_backsound("theme.wav")
         Statistic.intro = False
@@ -76,143 +91,110 @@ class Game:
 
     def loop(self):
         clock = pygame.time.Clock()
+        tick_ms = 1000 / Conf.FPS
+        accumulator = 0
         running = True
         while running:
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     running = False
-            self.screen.fill((0, 0, 0))  # Clear screen with black, or use Conf.SCREEN_BG_COLOR
-            # Draw your game objects here, e.g.:
-            # self.platform.show()
-            # self.bird.show()
-            # self.pipes[0].show()
-            # self.pipes[1].show()
-            pygame.display.flip()
-            clock.tick(Conf.FPS)
+                elif event.type == pygame.KEYDOWN and self.player is not None:
+                    self.playback_key(event.key)
+                elif event.type == pygame.KEYDOWN and event.key == pygame.K_SPACE:
+                    if self.simulation.state.game_over:
+                        self.simulation.reset(getrandbits(32))
+                        self.recorder = ReplayWriter(self.simulation.seed, self.simulation.lives)
+                elif event.type == pygame.KEYDOWN and event.key == pygame.K_r:
+                    if self.simulation.state.game_over:
+                        self.start_playback()
+
+            # Fixed timestep: the simulation always advances in 1/FPS ticks,
+            # independent of how fast we render
+            accumulator += clock.tick(Conf.RENDER_FPS)
+            ticks = 0
+            while accumulator >= tick_ms and ticks < Conf.MAX_TICKS_PER_FRAME:
+                if self.player is not None:
+                    # Fast-forward: tick di antara dua frame tidak di-render
+                    self.player.advance(self.playback_speed)
+                else:
+                    self.step_simulation()
+                accumulator -= tick_ms
+                ticks += 1
+            if ticks == Conf.MAX_TICKS_PER_FRAME:
+                accumulator = 0
+
+            # Sprite Pokemon dimuat di background, ambil yang sudah siap
+            self.sprite_selector.poll()
+            self.render()
         pygame.quit()
         sys.exit()
 
+    def step_simulation(self):
+        """Read player input and advance the simulation one tick"""
+        fly = pygame.key.get_pressed()[pygame.K_SPACE] or pygame.mouse.get_pressed()[0]
+        state = self.simulation.state
+        if state.game_over:
+            return
+        self.recorder.record(bool(fly))
+        state = self.simulation.step(fly)
+
+        Statistic.score = state.score
+        Statistic.level = state.level
+        Statistic.life = state.life
+        if state.game_over:
+            replay = self.recorder.finish()
+            if Statistic.update_high_score(replay):
+                self.best_replay = (Statistic.username, replay)
+
+    def start_playback(self):
+        """Watch the player's best recorded run"""
+        if self.best_replay is not None and self.best_replay[0] == Statistic.username:
+            replay = self.best_replay[1]
+        else:
+            # Replay yang masih antre di ScoreWriter harus sudah tersimpan sebelum dibaca
+            Statistic.writer().flush()
+            replay = Statistic._db.get_best_replay(Statistic.username)
+        if replay is None or not replay.compatible():
+            return
+        self.player = ReplayPlayer(replay)
+        self.playback_speed = 1
+
+    def playback_key(self, key):
+        """F: next fast-forward speed, left/right: seek, R or Escape: back to the game"""
+        if key == pygame.K_f:
+            speeds = Conf.REPLAY_SPEEDS
+            self.playback_speed = speeds[(speeds.index(self.playback_speed) + 1) % len(speeds)]
+        elif key in (pygame.K_LEFT, pygame.K_RIGHT):
+            step = Conf.REPLAY_SEEK_SECONDS * Conf.FPS
+            self.player.seek(self.player.tick + (step if key == pygame.K_RIGHT else -step))
+        elif key in (pygame.K_r, pygame.K_ESCAPE):
+            self.player = None
+
+    def render(self):
+        """Draw the current simulation state (or the replay being watched)"""
+        state = self.simulation.state if self.player is None else self.player.state
+        self.bird.sync(state)
+        for pipe in self.pipes:
+            pipe.sync(state)
+        self.platform.sync(state)
+
+        self.screen.fill(Conf.SCREEN_BG_COLOR)
+        for pipe in self.pipes:
+            pipe.show()
+        self.platform.show()
+        self.bird.show()
+
+        score_image = self.font.render(f"Score: {state.score}  Level: {state.level}  Life: {state.life}",
+                                       True, Conf.FONT_COLOR)
+        self.screen.blit(score_image, (10, 10))
+        if self.player is not None:
+            seconds = self.player.tick // Conf.FPS
+            replay_image = self.font.render(f"REPLAY x{self.playback_speed}  {seconds // 60}:{seconds % 60:02d}",
+                                            True, Conf.FONT_COLOR)
+            self.screen.blit(replay_image, (10, 10 + score_image.get_height()))
+        pygame.display.flip()
+
 if __name__ == "__main__":
     game = Game()
     game.loop()
 
-
-## database.py
-import sqlite3
-import os
-from conf import Conf
-
-class Database:
-    def __init__(self):
-        self.db_path = os.path.join(Conf.BASE_DIR, 'flappy_bird.db')
-        self.conn = None
-        self.cursor = None
-        self.initialize_db()
-
-    def connect(self):
-        """Connect to the SQLite database"""
-        self.conn = sqlite3.connect(self.db_path)
-        self.cursor = self.conn.cursor()
-
-    def disconnect(self):
-        """Close the database connection"""
-        if self.conn:
-            self.conn.close()
-            self.conn = None
-            self.cursor = None
-
-    def initialize_db(self):
-        """Create the scores and player_settings tables if they don't exist"""
-        self.connect()
-        # Create scores table
-        self.cursor.execute('''
-        CREATE TABLE IF NOT EXISTS scores (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            username TEXT NOT NULL,
-            score INTEGER NOT NULL,
-            date TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-        ''')
-        # Create player_settings table for character selection
-        self.cursor.execute('''
-        CREATE TABLE IF NOT EXISTS player_settings (
-            username TEXT PRIMARY KEY,
-            selected_sprite TEXT NOT NULL,
-            sprite_name TEXT NOT NULL
-        )
-        ''')
-        self.conn.commit()
-        self.disconnect()
-
-    def save_score(self, username, score):
-        self.connect()
-        self.cursor.execute(
-            'INSERT INTO scores (username, score) VALUES (?, ?)',
-            (username, score)
-        )
-        self.conn.commit()
-        self.disconnect()
-
-    def get_high_score(self, username):
-        self.connect()
-        self.cursor.execute(
-            'SELECT MAX(score) FROM scores WHERE username = ?',
-            (username,)
-        )
-        high_score = self.cursor.fetchone()[0]
-        self.disconnect()
-        return high_score if high_score is not None else 0
-
-    def save_selected_sprite(self, username, sprite_path, sprite_name):
-        self.connect()
-        self.cursor.execute('''
-            REPLACE INTO player_settings (username, selected_sprite, sprite_name)
-            VALUES (?, ?, ?)
-        ''', (username, sprite_path, sprite_name))
-        self.conn.commit()
-        self.disconnect()
-
-    def get_selected_sprite(self, username=None):
-        """
-        Get the currently selected sprite for given username.
-        If none exists yet or no username provided, returns default.
-        """
-        if username is None:
-            username = 'guest'
-        self.connect()
-        self.cursor.execute(
-            'SELECT selected_sprite, sprite_name FROM player_settings WHERE username = ?',
-            (username,)
-        )
-        row = self.cursor.fetchone()
-        self.disconnect()
-        if row:
-            return row[0], row[1]
-        else:
-            # default values
-            return 'bird.png', 'Flappy Bird'
-
-
-## sprites/bird.py
-import pygame
-import os
-from conf import Conf
-from database import Database
-
-class Bird(pygame.sprite.Sprite):
-    def __init__(self, game):
-        super().__init__()
-        self.game = game
-        self.database = Database()
-
-        # fetch sprite based on (optional) username
-        sprite_path, sprite_name = self.database.get_selected_sprite(game.username)
-        full_path = os.path.join(Conf.BASE_DIR, "assets/img", sprite_path)
-        self.image = pygame.image.load(full_path).convert_alpha()
-        self.name = sprite_name
-        
-        # initialize position, physics, etc.
-        self.rect = self.image.get_rect(center=game.screen_rect.center)
-        self.fly = False
-        self.pass_pipe = False
-        self.velocity = 0
@@ -0,0 +1,195 @@
+import os
+import sqlite3
+import time
+
+from conf import Conf
+from pokemon_cache import MetadataCache
+
+
+class PokedexStore:
+    """
+    Indexed local Pokedex (assets/pokemon/pokedex.db) replacing the flat JSON list.
+
+    Same interface as MetadataCache, so PokemonAPI.get_pokemon_list can
+    revalidate it the same way, plus indexed lookups (by id, name prefix,
+    type) that don't load the whole roster. The primary type is stored at
+    write time so drawing code never has to split type strings.
+    """
+
+    SCHEMA_VERSION = 1
+
+    def __init__(self, path, ttl=None, seed_json=None):
+        self.path = path
+        self.ttl = Conf.POKEMON_CACHE_TTL if ttl is None else ttl
+        self.conn = sqlite3.connect(path)
+        self.conn.row_factory = sqlite3.Row
+        self.create_tables()
+
+        # Pertama kali: isi dari pokemon_list.json (format lama atau v2) kalau ada
+        if seed_json and os.path.exists(seed_json) and self.count() == 0:
+            self.import_cache(MetadataCache(seed_json))
+            self.save()
+
+    def create_tables(self):
+        self.conn.executescript('''
+        CREATE TABLE IF NOT EXISTS meta (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        );
+        CREATE TABLE IF NOT EXISTS pokemon (
+            id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            name_key TEXT NOT NULL,
+            sprite_url TEXT,
+            type TEXT NOT NULL,
+            primary_type TEXT NOT NULL,
+            height REAL,
+            weight REAL,
+            fetched_at REAL NOT NULL DEFAULT 0,
+            etag TEXT,
+            last_modified TEXT
+        );
+        CREATE INDEX IF NOT EXISTS pokemon_name_key ON pokemon (name_key);
+        CREATE TABLE IF NOT EXISTS pokemon_types (
+            type TEXT NOT NULL,
+            pokemon_id INTEGER NOT NULL,
+            PRIMARY KEY (type, pokemon_id)
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS roster (
+            position INTEGER PRIMARY KEY,
+            pokemon_id INTEGER NOT NULL
+        );
+        ''')
+        self.conn.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('schema_version', ?)",
+                          (str(self.SCHEMA_VERSION),))
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+    # -- meta -------------------------------------------------------------
+
+    def _meta(self, key, default=None):
+        row = self.conn.execute('SELECT value FROM meta WHERE key = ?', (key,)).fetchone()
+        return row[0] if row is not None else default
+
+    def _set_meta(self, **values):
+        self.conn.executemany('REPLACE INTO meta (key, value) VALUES (?, ?)',
+                              [(key, None if value is None else str(value)) for key, value in values.items()])
+
+    # -- MetadataCache interface -------------------------------------------
+
+    def save(self):
+        self.conn.commit()
+
+    def ids(self, limit):
+        rows = self.conn.execute('SELECT pokemon_id FROM roster WHERE position < ? ORDER BY position', (limit,))
+        return [str(row[0]) for row in rows]
+
+    def is_fresh(self, limit, now=None):
+        now = time.time() if now is None else now
+        if int(self._meta('list_limit', 0)) < limit:
+            return False
+        if now - float(self._meta('list_fetched_at', 0)) >= self.ttl:
+            return False
+        return not self.stale_ids(limit, now)
+
+    def stale_ids(self, limit, now=None):
+        now = time.time() if now is None else now
+        rows = self.conn.execute('''
+            SELECT r.pokemon_id FROM roster r LEFT JOIN pokemon p ON p.id = r.pokemon_id
+            WHERE r.position < ? AND (p.id IS NULL OR p.fetched_at <= ?)
+            ORDER BY r.position
+        ''', (limit, now - self.ttl))
+        return [str(row[0]) for row in rows]
+
+    def list_validators(self, url):
+        if self._meta('list_url') != url:
+            return None
+        return {'etag': self._meta('list_etag'), 'last_modified': self._meta('list_last_modified')}
+
+    def set_list(self, url, limit, ids, validators, now):
+        self.conn.execute('DELETE FROM roster')
+        self.conn.executemany('INSERT INTO roster (position, pokemon_id) VALUES (?, ?)',
+                              [(position, int(pokemon_id)) for position, pokemon_id in enumerate(ids)])
+        self._set_meta(list_url=url, list_limit=limit, list_fetched_at=now,
+                       list_etag=validators.get('etag'), list_last_modified=validators.get('last_modified'))
+
+    def touch_list(self, now):
+        self._set_meta(list_fetched_at=now)
+
+    def validators(self, pokemon_id):
+        row = self.conn.execute('SELECT etag, last_modified FROM pokemon WHERE id = ?', (int(pokemon_id),)).fetchone()
+        if row is None:
+            return None
+        return {'etag': row['etag'], 'last_modified': row['last_modified']}
+
+    def put(self, pokemon_id, data, validators, now):
+        pokemon_id = int(pokemon_id)
+        types = [t.strip().lower() for t in data.get('type', 'Unknown').split('/')]
+        self.conn.execute('''
+            REPLACE INTO pokemon (id, name, name_key, sprite_url, type, primary_type, height, weight,
+                                  fetched_at, etag, last_modified)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (pokemon_id, data['name'], data['name'].lower(), data.get('sprite_url'), data.get('type', 'Unknown'),
+              types[0], data.get('height', 0), data.get('weight', 0), now,
+              validators.get('etag'), validators.get('last_modified')))
+        self.conn.execute('DELETE FROM pokemon_types WHERE pokemon_id = ?', (pokemon_id,))
+        self.conn.executemany('INSERT OR IGNORE INTO pokemon_types (type, pokemon_id) VALUES (?, ?)',
+                              [(pokemon_type, pokemon_id) for pokemon_type in types])
+
+    def touch(self, pokemon_id, now):
+        self.conn.execute('UPDATE pokemon SET fetched_at = ? WHERE id = ?', (now, int(pokemon_id)))
+
+    def pokemon_list(self, limit):
+        rows = self.conn.execute('''
+            SELECT p.* FROM roster r JOIN pokemon p ON p.id = r.pokemon_id
+            WHERE r.position < ? ORDER BY r.position
+        ''', (limit,))
+        return [self.row_to_entry(row) for row in rows]
+
+    # -- Indexed lookups ---------------------------------------------------
+
+    def count(self):
+        return self.conn.execute('SELECT COUNT(*) FROM pokemon').fetchone()[0]
+
+    def get(self, pokemon_id):
+        """One Pokemon by id, or None"""
+        row = self.conn.execute('SELECT * FROM pokemon WHERE id = ?', (int(pokemon_id),)).fetchone()
+        return self.row_to_entry(row) if row is not None else None
+
+    def search(self, prefix, limit=20):
+        """Pokemon whose name starts with prefix (case-insensitive), via the name index"""
+        low = prefix.lower()
+        # Range scan: semua string >= prefix dan < prefix + karakter terbesar
+        rows = self.conn.execute('''
+            SELECT * FROM pokemon WHERE name_key >= ? AND name_key < ? ORDER BY name_key LIMIT ?
+        ''', (low, low + '\U0010ffff', limit))
+        return [self.row_to_entry(row) for row in rows]
+
+    def by_type(self, pokemon_type, limit=None):
+        """Pokemon having pokemon_type as any of their types, ordered by id"""
+        rows = self.conn.execute('''
+            SELECT p.* FROM pokemon_types t JOIN pokemon p ON p.id = t.pokemon_id
+            WHERE t.type = ? ORDER BY t.pokemon_id LIMIT ?
+        ''', (pokemon_type.lower(), -1 if limit is None else limit))
+        return [self.row_to_entry(row) for row in rows]
+
+    @staticmethod
+    def row_to_entry(row):
+        return {
+            'id': str(row['id']),
+            'name': row['name'],
+            'sprite_url': row['sprite_url'],
+            'type': row['type'],
+            'primary_type': row['primary_type'],
+            'height': row['height'],
+            'weight': row['weight'],
+        }
+
+    def import_cache(self, cache):
+        """Copy a MetadataCache (pokemon_list.json) into the store"""
+        for pokemon_id, entry in cache.entries.items():
+            self.put(pokemon_id, entry['data'], entry, entry['fetched_at'])
+        listing = cache.list
+        self.set_list(listing['url'], listing['limit'], listing['ids'], listing, listing['fetched_at'])
@@ -1,176 +1,172 @@
-import requests
 import os
-import json
 import pygame
 import time
 from io import BytesIO
 from conf import Conf
+from asset_manager import AssetManager
+from sprite_variants import SpriteVariants
+from surface_cache import SurfaceLRU
+from pokemon_fetcher import PokemonFetcher
+from pokedex_store import PokedexStore
 class PokemonAPI:
-    def __init__(self):
-        self.base_url = "https://pokeapi.co/api/v2/"
+    def __init__(self, base_url=None):
+        self.base_url = base_url or Conf.POKEAPI_URL
+        self.fetcher = PokemonFetcher(self.base_url)
         self.pokemon_cache = {}
-        self.sprites_cache = {}
+        self.store = None
+        self.sprites_cache = SurfaceLRU(Conf.SPRITE_CACHE_BYTES, on_evict=self.on_sprite_evicted)
         self.pokemon_dir = os.path.join(Conf.BASE_DIR, "assets", "pokemon")
         
         # Create pokemon directory if it doesn't exist
         if not os.path.exists(self.pokemon_dir):
             os.makedirs(self.pokemon_dir)
     
-    def get_pokemon_list(self, limit=20):
-        """Get a list of Pokemon from the PokeAPI with increased limit to 20"""
-        # Check if we have cached data first
-        cache_file = os.path.join(self.pokemon_dir, "pokemon_list.json")
-        
-        # Check if we need to update the cache
-        needs_new_data = False
-        
-        if os.path.exists(cache_file):
+    def get_pokemon_list(self, limit=20, on_progress=None):
+        """
+        Get the first `limit` Pokemon, straight from the local cache while it is fresh.
+
+        Once Conf.POKEMON_CACHE_TTL has passed, the list and the stale entries
+        are revalidated with conditional GETs, so only entries that changed
+        (or are new) are downloaded again. on_progress(done, total) is called
+        while entries are being revalidated.
+        """
+        cache = self.pokedex()
+        if not cache.is_fresh(limit):
             try:
-                with open(cache_file, 'r') as f:
-                    cached_data = json.load(f)
-                    if len(cached_data) < limit:
-                        needs_new_data = True
-                        # Jangan menghapus file, kita akan menimpa nantinya
+                self._refresh_cache(cache, limit, on_progress)
             except Exception as e:
-                print(f"Error saat membuka cache: {e}")
-                needs_new_data = True
+                # Offline / API error: pakai apa yang ada di cache
+                print(f"Error mengambil data Pokémon: {e}")
+            cache.save()
+        return cache.pokemon_list(limit)
+    
+    def pokedex(self):
+        """
+        The indexed local Pokedex, opened on first use. The connection belongs
+        to the thread that opened it, so each thread uses its own PokemonAPI.
+        """
+        if self.store is None:
+            self.store = PokedexStore(os.path.join(self.pokemon_dir, "pokedex.db"),
+                                      seed_json=os.path.join(self.pokemon_dir, "pokemon_list.json"))
+        return self.store
+    
+    def _refresh_cache(self, cache, limit, on_progress=None):
+        """Revalidate the cached list and its stale entries against the API"""
+        now = time.time()
+        list_url = f"{self.base_url}pokemon?limit={limit}"
+        status, data, validators = self.fetcher.revalidate(list_url, cache.list_validators(list_url))
+        if status is None:
+            # Tidak ada koneksi, tidak perlu mencoba entry satu per satu
+            return
+        if status == 304:
+            cache.touch_list(now)
+        elif status == 200:
+            ids = [pokemon['url'].rstrip('/').split('/')[-1] for pokemon in data['results']]
+            cache.set_list(list_url, limit, ids, validators, now)
         else:
-            needs_new_data = True
+            print(f"Error API: status code {status}")
         
-        # Jika cache valid dan tidak perlu diupdate, gunakan cache
-        if os.path.exists(cache_file) and not needs_new_data:
-            try:
-                with open(cache_file, 'r') as f:
-                    return json.load(f)
-            except Exception as e:
-                print(f"Error membaca cache: {e}")
-                needs_new_data = True
-        
-        # Jika perlu data baru, ambil dari API
-        if needs_new_data:
-            pokemon_list = self._fetch_pokemon_data_from_api(limit)
-            
-            # Simpan cache dengan aman
-            try:
-                # Buat file temporary dulu
-                temp_cache_file = os.path.join(self.pokemon_dir, f"pokemon_list_temp_{int(time.time())}.json")
-                with open(temp_cache_file, 'w') as f:
-                    json.dump(pokemon_list, f)
-                
-                # Jika berhasil, coba rename ke file asli
-                try:
-                    # Di Windows kita perlu menghapus file lama dulu jika ada
-                    if os.path.exists(cache_file):
-                        try:
-                            os.remove(cache_file)
-                        except Exception as e:
-                            print(f"Tidak bisa menghapus cache lama: {e}")
-                    
-                    os.rename(temp_cache_file, cache_file)
-                except Exception as e:
-                    print(f"Tidak bisa rename file cache: {e}")
-                    # Tetap gunakan data yang sudah diambil meskipun caching gagal
-            except Exception as e:
-                print(f"Error menyimpan cache: {e}")
-            
-            return pokemon_list
+        # Hanya entry yang baru atau kedaluwarsa yang di-revalidate, secara paralel
+        stale = cache.stale_ids(limit, now)
+        items = [(f"{self.base_url}pokemon/{pokemon_id}/", cache.validators(pokemon_id)) for pokemon_id in stale]
+        results = self.fetcher.map(lambda item: self.fetcher.revalidate(*item), items, on_progress)
+        for pokemon_id, (status, data, validators) in zip(stale, results):
+            if status == 304:
+                cache.touch(pokemon_id, now)
+            elif status == 200:
+                cache.put(pokemon_id, self.make_entry(data), validators, now)
     
-    def _fetch_pokemon_data_from_api(self, limit):
-        """Fetch fresh Pokemon data from the API"""
-        url = f"{self.base_url}pokemon?limit={limit}"
-        try:
-            response = requests.get(url)
-            
-            if response.status_code == 200:
-                data = response.json()
-                
-                # Process data to include only what we need
-                pokemon_list = []
-                for pokemon in data['results']:
-                    # Fetch more details about each Pokemon
-                    pokemon_url = pokemon['url']
-                    pokemon_details = self.fetch_pokemon_details(pokemon_url)
-                    
-                    pokemon_id = pokemon['url'].split('/')[-2]
-                    pokemon_data = {
-                        'id': pokemon_id,
-                        'name': pokemon['name'].capitalize(),
-                        'sprite_url': f"https://raw.githubusercontent.com/PokeAPI/sprites/master/sprites/pokemon/{pokemon_id}.png",
-                        'type': pokemon_details.get('type', 'Unknown'),
-                        'height': pokemon_details.get('height', 0),
-                        'weight': pokemon_details.get('weight', 0)
-                    }
-                    pokemon_list.append(pokemon_data)
-                
-                return pokemon_list
-            else:
-                print(f"Error API: status code {response.status_code}")
-                return []
-        except Exception as e:
-            print(f"Error mengambil data Pokémon: {e}")
-            return []
+    @staticmethod
+    def make_entry(data):
+        """Reduce a PokeAPI /pokemon/<id> response to what the game uses"""
+        pokemon_id = str(data['id'])
+        details = PokemonFetcher.parse_details(data)
+        return {
+            'id': pokemon_id,
+            'name': data['name'].capitalize(),
+            'sprite_url': f"https://raw.githubusercontent.com/PokeAPI/sprites/master/sprites/pokemon/{pokemon_id}.png",
+            'type': details.get('type', 'Unknown'),
+            'height': details.get('height', 0),
+            'weight': details.get('weight', 0)
+        }
     
     def fetch_pokemon_details(self, url):
         """Fetch additional details about a Pokemon"""
-        try:
-            response = requests.get(url)
-            if response.status_code == 200:
-                data = response.json()
-                types = [t['type']['name'] for t in data['types']]
-                
-                return {
-                    'type': '/'.join(types),
-                    'height': data['height'] / 10,  # Convert to meters
-                    'weight': data['weight'] / 10   # Convert to kg
-                }
-        except Exception as e:
-            print(f"Error fetching Pokemon details: {e}")
-        
-        return {'type': 'Unknown', 'height': 0, 'weight': 0}
+        return self.fetcher.fetch_details(url)
     
     def get_pokemon_sprite(self, pokemon_id):
         """Get a sprite for a specific Pokemon"""
         # Check if the sprite is already cached in memory
-        if pokemon_id in self.sprites_cache:
-            return self.sprites_cache[pokemon_id]
+        sprite = self.sprites_cache.get(pokemon_id)
+        if sprite is not None:
+            return sprite
         
-        # Check if we have the sprite file locally
+        # Check if we have the sprite locally: atlas region, pre-scaled
+        # variant from preprocess_sprites.py, or the PNG itself (scaled)
         sprite_path = os.path.join(self.pokemon_dir, f"{pokemon_id}.png")
-        if os.path.exists(sprite_path):
+        if AssetManager.in_atlas(sprite_path, self.bird_size()) or os.path.exists(sprite_path):
             try:
-                sprite = pygame.image.load(sprite_path)
-                # Scale the sprite to match the bird size (adjust as needed)
-                bird_img = pygame.image.load(os.path.join(Conf.BASE_DIR, "assets", "bird.png"))
-                sprite = pygame.transform.scale(sprite, bird_img.get_size())
-                self.sprites_cache[pokemon_id] = sprite
+                sprite = AssetManager.load(sprite_path, size=self.bird_size(),
+                                           source=SpriteVariants.path(pokemon_id, 'game'))
+                self.sprites_cache.put(pokemon_id, sprite)
                 return sprite
             except Exception as e:
                 print(f"Error loading cached sprite: {e}")
         
         # If not cached, fetch from the API
-        sprite_url = f"https://raw.githubusercontent.com/PokeAPI/sprites/master/sprites/pokemon/{pokemon_id}.png"
-        
         try:
-            response = requests.get(sprite_url)
-            if response.status_code == 200:
-                # Coba simpan sprite secara lokal
-                try:
-                    with open(sprite_path, 'wb') as f:
-                        f.write(response.content)
-                except Exception as e:
-                    print(f"Tidak bisa menyimpan sprite: {e}")
-                
-                # Load the sprite into pygame
-                sprite = pygame.image.load(BytesIO(response.content))
-                # Scale the sprite to match the bird size
-                bird_img = pygame.image.load(os.path.join(Conf.BASE_DIR, "assets", "bird.png"))
-                sprite = pygame.transform.scale(sprite, bird_img.get_size())
+            data = self.download_sprite(pokemon_id)
+            if data is not None:
+                # Load the sprite into pygame, scaled to match the bird size
+                sprite = AssetManager.load(sprite_path, size=self.bird_size(), source=BytesIO(data))
                 
                 # Cache it
-                self.sprites_cache[pokemon_id] = sprite
+                self.sprites_cache.put(pokemon_id, sprite)
                 return sprite
         except Exception as e:
             print(f"Error fetching Pokemon sprite: {e}")
             
         # If all else fails, return the default bird sprite
-        return pygame.image.load(os.path.join(Conf.BASE_DIR, "assets", "bird.png")) 
\ No newline at end of file
+        return AssetManager.load(os.path.join("assets", "bird.png"))
+
+    def on_sprite_evicted(self, pokemon_id, sprite):
+        # AssetManager juga memegang surface ini; lepaskan supaya memorinya benar-benar bebas
+        AssetManager.forget(os.path.join(self.pokemon_dir, f"{pokemon_id}.png"))
+
+    def download_sprite(self, pokemon_id):
+        """Download a sprite and keep a copy in assets/pokemon, returns the PNG bytes or None"""
+        sprite_url = f"https://raw.githubusercontent.com/PokeAPI/sprites/master/sprites/pokemon/{pokemon_id}.png"
+        response = self.fetcher.get(sprite_url)
+        if response.status_code != 200:
+            return None
+        
+        # Coba simpan sprite secara lokal
+        try:
+            with open(os.path.join(self.pokemon_dir, f"{pokemon_id}.png"), 'wb') as f:
+                f.write(response.content)
+        except Exception as e:
+            print(f"Tidak bisa menyimpan sprite: {e}")
+        return response.content
+
+    def read_sprite(self, pokemon_id):
+        """
+        Decode a sprite scaled to the bird size, without converting it.
+        Doesn't touch the display, so it is safe to call from a loader thread.
+        """
+        variant_path = SpriteVariants.path(pokemon_id, 'game')
+        if variant_path is not None:
+            return pygame.image.load(variant_path)
+        
+        sprite_path = os.path.join(self.pokemon_dir, f"{pokemon_id}.png")
+        if os.path.exists(sprite_path):
+            image = pygame.image.load(sprite_path)
+        else:
+            data = self.download_sprite(pokemon_id)
+            if data is None:
+                return None
+            image = pygame.image.load(BytesIO(data), sprite_path)
+        return pygame.transform.scale(image, self.bird_size())
+
+    def bird_size(self):
+        """Size every Pokemon sprite is scaled to (the size of bird.png)"""
+        return Conf.BIRD_SIZE
@@ -0,0 +1,146 @@
+import glob
+import json
+import os
+import tempfile
+import time
+
+from conf import Conf
+
+
+class MetadataCache:
+    """
+    On-disk cache of Pokemon metadata (assets/pokemon/pokemon_list.json).
+
+    Format (schema_version 2):
+
+        {"schema_version": 2,
+         "list": {"url": ..., "limit": N, "ids": [...], "fetched_at": ..., "etag": ..., "last_modified": ...},
+         "entries": {"<id>": {"data": {...}, "fetched_at": ..., "etag": ..., "last_modified": ...}}}
+
+    The list and each entry carry their own fetch time and HTTP validators, so
+    after Conf.POKEMON_CACHE_TTL they can be revalidated one by one with
+    conditional GETs. The old format (a plain list of entries) is migrated
+    as stale entries without validators.
+    """
+
+    SCHEMA_VERSION = 2
+    TEMP_PREFIX = ".pokemon_list."
+
+    def __init__(self, path, ttl=None):
+        self.path = path
+        self.ttl = Conf.POKEMON_CACHE_TTL if ttl is None else ttl
+        self.list = {'url': None, 'limit': 0, 'ids': [], 'fetched_at': 0, 'etag': None, 'last_modified': None}
+        self.entries = {}
+        self.dirty = False
+        self.load()
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+        except Exception as e:
+            print(f"Error saat membuka cache: {e}")
+            return
+
+        if isinstance(data, list):
+            # Format lama: list biasa, anggap semua entry sudah kedaluwarsa
+            self.list['ids'] = [str(pokemon['id']) for pokemon in data]
+            self.list['limit'] = len(data)
+            self.entries = {
+                str(pokemon['id']): {'data': pokemon, 'fetched_at': 0, 'etag': None, 'last_modified': None}
+                for pokemon in data
+            }
+            self.dirty = True
+        elif isinstance(data, dict) and data.get('schema_version') == self.SCHEMA_VERSION:
+            self.list.update(data['list'])
+            self.entries = data['entries']
+        else:
+            print("Versi cache tidak dikenal, cache diabaikan")
+
+    def save(self):
+        """Write the cache atomically (temp file + os.replace), only if something changed"""
+        if not self.dirty:
+            return
+        directory = os.path.dirname(self.path)
+        payload = {'schema_version': self.SCHEMA_VERSION, 'list': self.list, 'entries': self.entries}
+        temp = tempfile.NamedTemporaryFile('w', dir=directory, prefix=self.TEMP_PREFIX, suffix='.tmp', delete=False)
+        try:
+            with temp:
+                json.dump(payload, temp)
+                temp.flush()
+                os.fsync(temp.fileno())
+            os.replace(temp.name, self.path)
+            self.dirty = False
+        except Exception as e:
+            print(f"Error menyimpan cache: {e}")
+            try:
+                os.remove(temp.name)
+            except OSError:
+                pass
+        self.remove_orphans()
+
+    def remove_orphans(self):
+        """Remove temp files left behind by interrupted writes (including the old pokemon_list_temp_*.json)"""
+        directory = os.path.dirname(self.path)
+        patterns = [self.TEMP_PREFIX + '*.tmp', 'pokemon_list_temp_*.json']
+        for pattern in patterns:
+            for orphan in glob.glob(os.path.join(directory, pattern)):
+                try:
+                    os.remove(orphan)
+                except OSError as e:
+                    print(f"Tidak bisa menghapus file sementara {orphan}: {e}")
+
+    def _expired(self, fetched_at, now):
+        return now - fetched_at >= self.ttl
+
+    def ids(self, limit):
+        return self.list['ids'][:limit]
+
+    def is_fresh(self, limit, now=None):
+        """True if the first `limit` entries can be served without any network call"""
+        now = time.time() if now is None else now
+        if self.list['limit'] < limit or self._expired(self.list['fetched_at'], now):
+            return False
+        return not self.stale_ids(limit, now)
+
+    def stale_ids(self, limit, now=None):
+        """Ids of the first `limit` entries that are missing or past the TTL"""
+        now = time.time() if now is None else now
+        return [pokemon_id for pokemon_id in self.ids(limit)
+                if pokemon_id not in self.entries or self._expired(self.entries[pokemon_id]['fetched_at'], now)]
+
+    def list_validators(self, url):
+        """Validators for a conditional GET of the list, only if the cached list came from the same url"""
+        if self.list['url'] != url:
+            return None
+        return {'etag': self.list['etag'], 'last_modified': self.list['last_modified']}
+
+    def set_list(self, url, limit, ids, validators, now):
+        self.list = {'url': url, 'limit': limit, 'ids': ids, 'fetched_at': now,
+                     'etag': validators.get('etag'), 'last_modified': validators.get('last_modified')}
+        self.dirty = True
+
+    def touch_list(self, now):
+        self.list['fetched_at'] = now
+        self.dirty = True
+
+    def validators(self, pokemon_id):
+        entry = self.entries.get(pokemon_id)
+        if entry is None:
+            return None
+        return {'etag': entry['etag'], 'last_modified': entry['last_modified']}
+
+    def put(self, pokemon_id, data, validators, now):
+        self.entries[pokemon_id] = {'data': data, 'fetched_at': now,
+                                    'etag': validators.get('etag'), 'last_modified': validators.get('last_modified')}
+        self.dirty = True
+
+    def touch(self, pokemon_id, now):
+        self.entries[pokemon_id]['fetched_at'] = now
+        self.dirty = True
+
+    def pokemon_list(self, limit):
+        """Cached entries for the first `limit` ids, in list order"""
+        return [self.entries[pokemon_id]['data'] for pokemon_id in self.ids(limit) if pokemon_id in self.entries]
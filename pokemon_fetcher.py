@@ -0,0 +1,119 @@
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from conf import Conf
+
+
+class PokemonFetcher:
+    """
+    Concurrent PokeAPI client.
+
+    All requests go through one requests.Session, so connections are kept
+    alive and reused; at most max_workers requests are in flight, and failed
+    requests (connection errors, 429, 5xx) are retried with exponential backoff.
+    """
+
+    RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+    def __init__(self, base_url=None, max_workers=None, retries=None, backoff=None, timeout=None):
+        self.base_url = base_url or Conf.POKEAPI_URL
+        self.max_workers = max_workers or Conf.POKEAPI_WORKERS
+        self.retries = Conf.POKEAPI_RETRIES if retries is None else retries
+        self.backoff = Conf.POKEAPI_BACKOFF if backoff is None else backoff
+        self.timeout = timeout or Conf.POKEAPI_TIMEOUT
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self.requests_made = 0
+
+    def get(self, url, headers=None):
+        """GET with retry/backoff; returns the last response, raises if every attempt failed to connect"""
+        for attempt in range(self.retries + 1):
+            try:
+                self.requests_made += 1
+                response = self.session.get(url, headers=headers, timeout=self.timeout)
+                if response.status_code not in self.RETRY_STATUSES or attempt == self.retries:
+                    return response
+            except requests.RequestException:
+                if attempt == self.retries:
+                    raise
+            # Exponential backoff with jitter so parallel workers don't retry in lockstep
+            time.sleep(self.backoff * (2 ** attempt) * (0.5 + random.random()))
+
+    def fetch_list(self, limit):
+        """Return the PokeAPI result list: [{'name': ..., 'url': ...}, ...]"""
+        response = self.get(f"{self.base_url}pokemon?limit={limit}")
+        if response.status_code != 200:
+            print(f"Error API: status code {response.status_code}")
+            return []
+        return response.json()['results']
+
+    def fetch_details(self, url):
+        """Fetch type, height and weight of one Pokemon"""
+        try:
+            response = self.get(url)
+            if response.status_code == 200:
+                return self.parse_details(response.json())
+        except Exception as e:
+            print(f"Error fetching Pokemon details: {e}")
+
+        return {'type': 'Unknown', 'height': 0, 'weight': 0}
+
+    @staticmethod
+    def parse_details(data):
+        types = [t['type']['name'] for t in data['types']]
+        return {
+            'type': '/'.join(types),
+            'height': data['height'] / 10,  # Convert to meters
+            'weight': data['weight'] / 10   # Convert to kg
+        }
+
+    def revalidate(self, url, validators=None):
+        """
+        Conditional GET using a cached ETag / Last-Modified.
+
+        Returns (status, json, validators): status 304 means the cached copy is
+        still good (json is None), None means the request failed altogether.
+        """
+        headers = {}
+        if validators:
+            if validators.get('etag'):
+                headers['If-None-Match'] = validators['etag']
+            if validators.get('last_modified'):
+                headers['If-Modified-Since'] = validators['last_modified']
+        try:
+            response = self.get(url, headers=headers)
+        except requests.RequestException as e:
+            print(f"Error revalidating {url}: {e}")
+            return None, None, validators
+
+        if response.status_code == 200:
+            return 200, response.json(), {'etag': response.headers.get('ETag'),
+                                          'last_modified': response.headers.get('Last-Modified')}
+        return response.status_code, None, validators
+
+    def fetch_many(self, urls, on_progress=None):
+        """Fetch details for every url concurrently, results in the same order as urls"""
+        return self.map(self.fetch_details, urls, on_progress)
+
+    def map(self, func, items, on_progress=None):
+        """
+        Run func over items on the worker pool, results in the same order as items.
+        on_progress(done, total) is called as each one finishes.
+        """
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = [pool.submit(func, item) for item in items]
+            if on_progress is not None:
+                for done, _ in enumerate(as_completed(futures), 1):
+                    on_progress(done, len(futures))
+            return [future.result() for future in futures]
+
+    def close(self):
+        self.session.close()
@@ -0,0 +1,115 @@
+"""
+Offline sprite preprocessing.
+
+Scales every sprite (assets/bird.png and assets/pokemon/<id>.png) to each
+size in SpriteVariants.sizes() on a process pool and writes the results to
+assets/pokemon/processed/<source hash>_<w>x<h>.png plus manifest.json.
+Outputs are keyed by the hash of the source file and the target size, so a
+re-run only processes sprites that changed and removes outputs nobody uses.
+The texture atlas (atlas.py) is rebuilt from the results afterwards.
+
+    python preprocess_sprites.py [--workers N] [--force] [--no-atlas]
+"""
+import argparse
+import glob
+import hashlib
+import json
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pygame
+
+import atlas
+from sprite_variants import SpriteVariants
+
+
+def sprite_sources():
+    """(sprite id, source path) of every sprite to preprocess"""
+    yield 'bird', SpriteVariants.source_path('bird')
+    pokemon_dir = os.path.dirname(SpriteVariants.source_path('1'))
+    for path in sorted(glob.glob(os.path.join(pokemon_dir, "*.png"))):
+        sprite_id = os.path.splitext(os.path.basename(path))[0]
+        if sprite_id.isdigit():
+            yield sprite_id, path
+
+
+def file_hash(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()[:16]
+
+
+def render_variants(job):
+    """Worker process: decode one source once and save every requested size"""
+    source, outputs = job
+    image = pygame.image.load(source)
+    for size, out_path in outputs:
+        # Colorkey PNG palet tidak ikut tersimpan, jadi simpan sebagai RGBA
+        pygame.image.save(atlas.to_rgba(pygame.transform.scale(image, size)), out_path)
+    return len(outputs)
+
+
+def write_manifest(manifest):
+    temp = tempfile.NamedTemporaryFile('w', dir=SpriteVariants.DIR, prefix='.manifest.', suffix='.tmp', delete=False)
+    with temp:
+        json.dump(manifest, temp, indent=1, sort_keys=True)
+    os.replace(temp.name, SpriteVariants.MANIFEST)
+
+
+def preprocess(workers=None, force=False, build_atlas=True):
+    start = time.perf_counter()
+    os.makedirs(SpriteVariants.DIR, exist_ok=True)
+    sizes = list(SpriteVariants.sizes().values())
+
+    manifest = {}
+    jobs = []
+    for sprite_id, source in sprite_sources():
+        source_hash = file_hash(source)
+        variants = {SpriteVariants.size_key(size): f"{source_hash}_{SpriteVariants.size_key(size)}.png"
+                    for size in sizes}
+        manifest[sprite_id] = {
+            'source_hash': source_hash,
+            'source_mtime': os.path.getmtime(source),
+            'variants': variants,
+        }
+        todo = [(size, os.path.join(SpriteVariants.DIR, variants[SpriteVariants.size_key(size)]))
+                for size in sizes]
+        if not force:
+            todo = [(size, out_path) for size, out_path in todo if not os.path.exists(out_path)]
+        if todo:
+            jobs.append((source, todo))
+
+    written = 0
+    if jobs:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            written = sum(pool.map(render_variants, jobs, chunksize=8))
+
+    write_manifest(manifest)
+    SpriteVariants.reload()
+
+    # Output yang tidak dipakai lagi (source berubah / ukuran berubah)
+    used = {filename for entry in manifest.values() for filename in entry['variants'].values()}
+    removed = 0
+    for path in glob.glob(os.path.join(SpriteVariants.DIR, "*.png")):
+        if os.path.basename(path) not in used:
+            os.remove(path)
+            removed += 1
+
+    elapsed = time.perf_counter() - start
+    print(f"{len(manifest)} sprites: {len(jobs)} (re)processed, {written} files written, "
+          f"{removed} stale files removed in {elapsed:.2f} s")
+
+    if build_atlas:
+        index_path, sheet_sizes = atlas.build(atlas.default_entries())
+        print(f"Atlas: {len(sheet_sizes)} sheet(s) -> {index_path}")
+    return manifest
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--workers', type=int, default=None, help="process pool size (default: CPU count)")
+    parser.add_argument('--force', action='store_true', help="reprocess every sprite")
+    parser.add_argument('--no-atlas', action='store_true', help="don't rebuild the texture atlas")
+    args = parser.parse_args()
+    preprocess(args.workers, args.force, not args.no_atlas)
@@ -0,0 +1,203 @@
+import hashlib
+
+from conf import Conf
+from simulation import Simulation
+
+MAGIC = b'FBR1'
+# Conf yang menentukan hasil Simulation; replay dari Conf lain tidak bisa diputar ulang dengan benar
+SIMULATION_CONF = ('FPS', 'SCREEN_SIZE', 'PLATFORM_SPEED', 'BIRD_FLY_SPEED', 'GRAVITY', 'PIPE_SPEED',
+                   'PIPE_OFFSETS', 'BIRD_SIZE', 'LIVES', 'LEVEL_UP_SCORE')
+
+
+def conf_fingerprint():
+    """8 bytes identifying the Conf values Simulation depends on"""
+    values = repr([(name, getattr(Conf, name)) for name in SIMULATION_CONF])
+    return hashlib.sha1(values.encode()).digest()[:8]
+
+
+def write_varint(out, value):
+    """Append a non-negative int as LEB128 (7 bits per byte, high bit = more)"""
+    while value > 0x7f:
+        out.append(value & 0x7f | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def read_varint(data, position):
+    """(value, next position) of the LEB128 int at position"""
+    value = 0
+    shift = 0
+    while True:
+        byte = data[position]
+        position += 1
+        value |= (byte & 0x7f) << shift
+        if byte < 0x80:
+            return value, position
+        shift += 7
+
+
+class Replay:
+    """
+    A recorded run: the Simulation seed and lives, the Conf fingerprint and
+    the flap input of every tick, stored as run lengths.
+
+    runs alternates between ticks without and with a flap, starting without
+    (so it may start with 0). Encoded: MAGIC, the fingerprint, then seed
+    (zigzag), lives and every run as varints - a few bytes per flap, a few
+    hundred bytes for a minute of play.
+    """
+
+    def __init__(self, seed, lives, runs, fingerprint=None):
+        self.seed = seed
+        self.lives = lives
+        self.runs = runs
+        self.fingerprint = conf_fingerprint() if fingerprint is None else fingerprint
+
+    @property
+    def ticks(self):
+        return sum(self.runs)
+
+    def compatible(self):
+        """True if this Conf simulates the replay exactly as it was recorded"""
+        return self.fingerprint == conf_fingerprint()
+
+    def inputs(self):
+        """The flap input of every tick, in order"""
+        fly = False
+        for run in self.runs:
+            for _ in range(run):
+                yield fly
+            fly = not fly
+
+    def simulate(self):
+        """Re-run the recording headless and return the final SimState"""
+        return Simulation(seed=self.seed, lives=self.lives).run(self.inputs())
+
+    def encode(self):
+        out = bytearray(MAGIC)
+        out += self.fingerprint
+        write_varint(out, self.seed << 1 if self.seed >= 0 else (-self.seed << 1) - 1)
+        write_varint(out, self.lives)
+        for run in self.runs:
+            write_varint(out, run)
+        return bytes(out)
+
+    @classmethod
+    def decode(cls, data):
+        if data[:4] != MAGIC:
+            raise ValueError("not a replay")
+        fingerprint = bytes(data[4:12])
+        zigzag, position = read_varint(data, 12)
+        lives, position = read_varint(data, position)
+        runs = []
+        while position < len(data):
+            run, position = read_varint(data, position)
+            runs.append(run)
+        return cls(zigzag >> 1 if not zigzag & 1 else -((zigzag + 1) >> 1), lives, runs, fingerprint)
+
+
+class ReplayWriter:
+    """
+    Records one run tick by tick. record() only compares and counts, and
+    appends a run length when the input changes; bytes are only produced by
+    finish().encode() at the end, so recording costs next to nothing per
+    frame.
+    """
+
+    def __init__(self, seed, lives):
+        self.seed = seed
+        self.lives = lives
+        self.runs = []
+        self._fly = False
+        self._run = 0
+
+    def record(self, fly):
+        if fly == self._fly:
+            self._run += 1
+        else:
+            self.runs.append(self._run)
+            self._fly = fly
+            self._run = 1
+
+    def finish(self):
+        """The Replay of everything recorded so far"""
+        return Replay(self.seed, self.lives, self.runs + [self._run])
+
+
+class ReplayPlayer:
+    """
+    Plays a Replay back through its own Simulation, for rendering with the
+    usual Bird/Pipe/Platform.sync(state).
+
+    One headless pass at creation stores a SimState keyframe every
+    keyframe_interval ticks, so seek() to any tick restores the keyframe at
+    or before it and simulates fewer than keyframe_interval ticks. advance()
+    fast-forwards any number of ticks without anything being drawn.
+    """
+
+    def __init__(self, replay, keyframe_interval=None):
+        self.replay = replay
+        self.keyframe_interval = keyframe_interval or Conf.REPLAY_KEYFRAME_INTERVAL
+        self.inputs = bytes(replay.inputs())
+        self.simulation = Simulation(seed=replay.seed, lives=replay.lives)
+        self.keyframes = []
+        state = self.simulation.state
+        while True:
+            if state.tick % self.keyframe_interval == 0:
+                self.keyframes.append(state.copy())
+            if state.game_over or state.tick >= len(self.inputs):
+                break
+            state = self.simulation.step(self.inputs[state.tick])
+        # Replay rusak/Conf lain bisa game over lebih awal dari jumlah input
+        self.ticks = state.tick
+        self.final_state = state.copy()
+        self.simulation.state = self.keyframes[0].copy()
+
+    @property
+    def state(self):
+        return self.simulation.state
+
+    @property
+    def tick(self):
+        return self.simulation.state.tick
+
+    @property
+    def finished(self):
+        return self.tick >= self.ticks
+
+    def advance(self, ticks=1):
+        """Play up to ticks ticks (stops at the end) and return the state"""
+        simulation = self.simulation
+        inputs = self.inputs
+        for _ in range(min(ticks, self.ticks - simulation.state.tick)):
+            simulation.step(inputs[simulation.state.tick])
+        return simulation.state
+
+    def seek(self, tick):
+        """Jump to tick (clamped to the replay) and return the state there"""
+        tick = max(0, min(tick, self.ticks))
+        current = self.tick
+        if not current <= tick < current + self.keyframe_interval:
+            self.simulation.state = self.keyframes[tick // self.keyframe_interval].copy()
+        return self.advance(tick - self.tick)
+
+
+if __name__ == "__main__":
+    # Bot yang menahan/melepas flap seperti pemain (histeresis di sekitar tengah celah pipa):
+    # ukuran per menit dan cek bahwa replay menghasilkan skor yang sama
+    simulation = Simulation(seed=1)
+    writer = ReplayWriter(simulation.seed, simulation.lives)
+    fly = False
+    while not simulation.state.game_over and simulation.state.tick < 60 * Conf.FPS:
+        target = simulation.bird_start_y + simulation.state.pipe_offset
+        if simulation.state.bird_y > target + 12:
+            fly = True
+        elif simulation.state.bird_y < target - 12:
+            fly = False
+        writer.record(fly)
+        simulation.step(fly)
+    replay = writer.finish()
+    data = replay.encode()
+    minutes = replay.ticks / Conf.FPS / 60
+    print(f"{replay.ticks} ticks, {len(data)} bytes ({len(data) / minutes:.0f} bytes/minute), "
+          f"score {simulation.state.score}, replayed score {Replay.decode(data).simulate().score}")
@@ -0,0 +1,104 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+
+
+class CachedResponse:
+    __slots__ = ('body', 'etag', 'expires', 'span')
+
+    def __init__(self, body, etag, expires, span):
+        self.body = body
+        self.etag = etag
+        self.expires = expires
+        self.span = span
+
+
+class ResponseCache:
+    """
+    In-process cache of serialized JSON responses for server.py read paths.
+
+    Keys are tuples whose first item is the group, e.g. ('player', username)
+    or ('leaderboard', offset, limit). Every entry has a TTL and an ETag (a
+    hash of its body). Besides dropping single keys, invalidate_range drops
+    the entries of a group whose span - the range of scores the response
+    shows - overlaps a range of scores that changed, so a score update only
+    evicts the leaderboard pages and ranks it can actually affect.
+
+    put() takes the generation read before the response was built and
+    skips storing it if anything was invalidated in the meantime, so a
+    response built from data that changed concurrently is never cached.
+    """
+
+    def __init__(self, ttl, max_entries):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.invalidations = 0
+        self.not_modified = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry.expires <= time.monotonic():
+                del self._entries[key]
+                self.expired += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key, payload, span=None, generation=None):
+        """Serialize payload and cache it (unless invalidated since generation); returns the entry"""
+        body = json.dumps(payload, sort_keys=True).encode()
+        etag = hashlib.sha1(body).hexdigest()[:16]
+        entry = CachedResponse(body, etag, time.monotonic() + self.ttl, span)
+        with self._lock:
+            if self.ttl > 0 and (generation is None or generation == self.generation):
+                self._entries[key] = entry
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return entry
+
+    def invalidate(self, *keys):
+        with self._lock:
+            self.generation += 1
+            for key in keys:
+                if self._entries.pop(key, None) is not None:
+                    self.invalidations += 1
+
+    def invalidate_range(self, group, low, high):
+        """Drop entries of group whose span overlaps [low, high] (entries without a span always go)"""
+        with self._lock:
+            self.generation += 1
+            for key in [key for key, entry in self._entries.items()
+                        if key[0] == group and (entry.span is None or
+                                                (entry.span[0] <= high and low <= entry.span[1]))]:
+                del self._entries[key]
+                self.invalidations += 1
+
+    def invalidate_group(self, group):
+        self.invalidate_range(group, float('-inf'), float('inf'))
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'expired': self.expired,
+            'invalidations': self.invalidations,
+            'not_modified': self.not_modified,
+        }
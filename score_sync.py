@@ -0,0 +1,190 @@
+import atexit
+import random
+import sqlite3
+import threading
+import time
+
+import requests
+
+from conf import Conf
+from database import Database
+
+
+class ServerBusy(Exception):
+    """server.py answered, but not with success (503 busy, 5xx, unknown endpoint): try again later"""
+
+
+class ScoreSync:
+    """
+    Uploads the local sync_outbox (scores and sprite choices queued by
+    database triggers) to server.py in the background.
+
+    Each round takes up to batch_size queued rows, logs in every username
+    in them once (player ids are kept for the session), sends all scores in
+    one /update_scores request and the last sprite choice per player to
+    /update_sprite, all over one requests.Session. Rows are deleted only
+    after the server answered, so nothing is lost offline or on a crash; a
+    retried batch is harmless because each score carries a seq (device id
+    and outbox id) that the server applies at most once.
+
+    A username the server refuses to log in loses its queued rows, like a
+    rejected batch; an answer without a player id (SERVER_URL is not
+    server.py) counts as a failed round.
+
+    While the server is unreachable (or busy) rounds back off exponentially
+    with jitter, up to max_backoff; so does any unexpected error, which is
+    printed instead of ending the thread. The game thread never waits on any of
+    this: it only writes to the local database. Guest scores stay local.
+    """
+
+    # Status yang berarti batch itu sendiri ditolak: dibuang, bukan dicoba terus
+    REJECTED_STATUSES = (400, 413)
+
+    def __init__(self, server_url=None, database=None, interval=None, batch_size=None,
+                 backoff=None, max_backoff=None, timeout=None):
+        self.server_url = (server_url or Conf.SERVER_URL).rstrip('/')
+        self.database = database or Database()
+        self.interval = Conf.SYNC_INTERVAL if interval is None else interval
+        self.batch_size = min(batch_size or Conf.SYNC_BATCH_SIZE, Conf.SERVER_MAX_BATCH)
+        self.backoff = Conf.SYNC_BACKOFF if backoff is None else backoff
+        self.max_backoff = Conf.SYNC_MAX_BACKOFF if max_backoff is None else max_backoff
+        self.timeout = Conf.SYNC_TIMEOUT if timeout is None else timeout
+        self.session = requests.Session()
+        self.player_ids = {}
+        self._device = None
+        self._wake = threading.Event()
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="ScoreSync", daemon=True)
+        # Metrik
+        self.requests = 0
+        self.uploaded = 0
+        self.rejected = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.last_sync = None
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+        self._lag_total = 0.0
+
+    def start(self):
+        self._thread.start()
+        atexit.register(self.stop)
+        return self
+
+    def wake(self):
+        """Sync now instead of at the next interval (ignored while backing off)"""
+        if not self.consecutive_failures:
+            self._wake.set()
+
+    def stop(self, timeout=None):
+        """End the thread; whatever is still queued is sent by the next session"""
+        self._stopping = True
+        self._wake.set()
+        if self._thread.is_alive():
+            self._thread.join(self.timeout if timeout is None else timeout)
+        self.session.close()
+
+    def stats(self):
+        return {
+            'pending': self.database.pending_sync_count(),
+            'requests': self.requests,
+            'uploaded': self.uploaded,
+            'rejected': self.rejected,
+            'failures': self.failures,
+            'consecutive_failures': self.consecutive_failures,
+            'last_sync': self.last_sync,
+            'last_lag': self.last_lag,
+            'max_lag': self.max_lag,
+            'mean_lag': self._lag_total / self.uploaded if self.uploaded else 0.0,
+        }
+
+    def _run(self):
+        while not self._stopping:
+            try:
+                self.sync()
+                self.consecutive_failures = 0
+                delay = self.interval
+            except (requests.RequestException, ServerBusy, sqlite3.Error):
+                # Server tidak terjangkau (atau database lokal terkunci)
+                delay = self._failed()
+            except Exception as e:
+                # Error tak terduga tidak boleh mematikan thread (sinkron akan berhenti sampai game ditutup)
+                print(f"Sinkron gagal: {e!r}")
+                delay = self._failed()
+            self._wake.wait(delay)
+            self._wake.clear()
+
+    def _failed(self):
+        """Count a failed round and return the backoff delay: longer each time, with jitter"""
+        self.failures += 1
+        self.consecutive_failures += 1
+        delay = min(self.max_backoff, self.backoff * 2 ** (self.consecutive_failures - 1))
+        return delay * (0.5 + random.random())
+
+    def sync(self):
+        """Upload until the outbox is empty; raises requests.RequestException or ServerBusy on failure"""
+        while not self._stopping:
+            rows = self.database.pending_sync(self.batch_size)
+            if not rows:
+                return
+            self._upload(rows)
+            acknowledged = time.time()
+            self.database.delete_synced([row[0] for row in rows])
+            self.last_sync = acknowledged
+            for row in rows:
+                lag = acknowledged - row[5]
+                self.last_lag = lag
+                self.max_lag = max(self.max_lag, lag)
+                self._lag_total += lag
+            self.uploaded += len(rows)
+            if len(rows) < self.batch_size:
+                return
+
+    def _upload(self, rows):
+        if self._device is None:
+            self._device = self.database.device_id()
+        scores = []
+        sprites = {}
+        for outbox_id, username, score, sprite_file, sprite_name, _ in rows:
+            if username == Conf.DEFAULT_USERNAME:
+                continue
+            player_id = self._player_id(username)
+            if player_id is None:
+                # Login ditolak (400): baris pemain ini dibuang bersama batch, seperti batch yang ditolak
+                continue
+            if score is not None:
+                scores.append({'id': player_id, 'score': score, 'seq': self._device << 40 | outbox_id})
+            else:
+                sprites[player_id] = (sprite_file, sprite_name)
+        if scores:
+            self._post('/update_scores', {'scores': scores})
+        for player_id, (sprite_file, sprite_name) in sprites.items():
+            self._post('/update_sprite', {'id': player_id, 'sprite_file': sprite_file, 'sprite_name': sprite_name})
+
+    def _player_id(self, username):
+        """Server id of username, None if the server rejects the login; ServerBusy if the answer has no id"""
+        player_id = self.player_ids.get(username)
+        if player_id is None:
+            response = self._post('/login', {'username': username})
+            if response.status_code in self.REJECTED_STATUSES:
+                return None
+            try:
+                player_id = response.json()['id']
+            except (ValueError, TypeError, KeyError):
+                player_id = None
+            if not isinstance(player_id, int) or isinstance(player_id, bool):
+                # SERVER_URL bukan server.py (atau versi lain): coba lagi nanti, baris tetap di outbox
+                raise ServerBusy(f"/login: no player id in {response.text[:200]!r}")
+            self.player_ids[username] = player_id
+        return player_id
+
+    def _post(self, path, payload):
+        self.requests += 1
+        response = self.session.post(self.server_url + path, json=payload, timeout=self.timeout)
+        if response.status_code in self.REJECTED_STATUSES:
+            self.rejected += 1
+            print(f"Server menolak {path}: {response.status_code} {response.text[:200]}")
+            return response
+        if response.status_code != 200:
+            raise ServerBusy(f"{path}: HTTP {response.status_code}")
+        return response
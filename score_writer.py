@@ -0,0 +1,152 @@
+import atexit
+import queue
+import threading
+import time
+
+from conf import Conf
+from database import Database
+
+
+class ScoreWriter:
+    """
+    Write-behind persistence for scores and sprite selections.
+
+    The game thread only puts writes on a queue; a background thread commits
+    them in batches, one transaction per batch, on its own connection. A
+    write is committed at most flush_interval seconds after it was queued
+    (sooner once max_batch writes are waiting), so a crash loses at most
+    that window. stop() - registered with atexit by start() - commits
+    everything still queued.
+
+    A batch that fails is retried every flush_interval, max_retries times
+    (once at stop()). Then its writes are committed one by one and those
+    that still fail are reported and dropped, so one bad write cannot hold
+    back everything queued after it.
+
+    Queue items:
+
+        ('score', username, score, replay)   replay: replay.Replay or None
+        ('sprite', username, sprite_path, sprite_name)
+        ('flush', threading.Event)   set once everything queued before it is committed
+        ('stop', None)
+    """
+
+    def __init__(self, database=None, flush_interval=None, max_batch=None, max_retries=None):
+        self.database = database or Database()
+        self.flush_interval = Conf.SCORE_FLUSH_INTERVAL if flush_interval is None else flush_interval
+        self.max_batch = max_batch or Conf.SCORE_BATCH_SIZE
+        self.max_retries = Conf.SCORE_MAX_RETRIES if max_retries is None else max_retries
+        self.writes = queue.Queue()
+        self.committed = 0
+        self.batches = 0
+        self.failures = 0
+        self.dropped = 0
+        self._thread = threading.Thread(target=self._run, name="ScoreWriter", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        atexit.register(self.stop)
+        return self
+
+    def save_score(self, username, score, replay=None):
+        self.writes.put(('score', username, score, replay))
+
+    def save_selected_sprite(self, username, sprite_path, sprite_name):
+        self.writes.put(('sprite', username, sprite_path, sprite_name))
+
+    def flush(self, timeout=None):
+        """Block until every write queued so far is committed; False on timeout"""
+        if not self._thread.is_alive():
+            return self.writes.empty()
+        done = threading.Event()
+        self.writes.put(('flush', done))
+        return done.wait(timeout)
+
+    def stop(self, timeout=5.0):
+        """Commit what is left and end the thread"""
+        if self._thread.is_alive():
+            self.writes.put(('stop', None))
+            self._thread.join(timeout)
+
+    def stats(self):
+        return {
+            'queued': self.writes.qsize(),
+            'committed': self.committed,
+            'batches': self.batches,
+            'failures': self.failures,
+            'dropped': self.dropped,
+        }
+
+    def _run(self):
+        pending = []
+        running = True
+        while running:
+            batch, events, running = self._next_batch()
+            pending += batch
+            retries = 0
+            while pending:
+                try:
+                    self._commit(pending)
+                except Exception as e:
+                    # Bukan hanya sqlite3.Error: exception apa pun tidak boleh mematikan thread ini
+                    self.failures += 1
+                    retries += 1
+                    print(f"Gagal menyimpan skor: {e}")
+                    if not running or retries > self.max_retries:
+                        self._commit_each(pending)
+                        pending = []
+                    else:
+                        # Database terkunci/gagal: coba lagi nanti, data tetap di memori
+                        time.sleep(self.flush_interval)
+                    continue
+                self.committed += len(pending)
+                self.batches += 1
+                pending = []
+            for event in events:
+                event.set()
+
+    def _commit_each(self, batch):
+        """Commit the writes of a failing batch one by one, dropping those that still fail"""
+        for item in batch:
+            try:
+                self._commit([item])
+            except Exception as e:
+                self.dropped += 1
+                print(f"Penulisan dibuang: {item[:3]} ({e})")
+            else:
+                self.committed += 1
+                self.batches += 1
+
+    def _next_batch(self):
+        """Wait for a write, then collect more until the window ends, the batch is full or a flush/stop"""
+        batch = []
+        events = []
+        item = self.writes.get()
+        deadline = time.monotonic() + self.flush_interval
+        while True:
+            if item[0] == 'stop':
+                return batch, events, False
+            if item[0] == 'flush':
+                events.append(item[1])
+                return batch, events, True
+            batch.append(item)
+            remaining = deadline - time.monotonic()
+            if len(batch) >= self.max_batch or remaining <= 0:
+                return batch, events, True
+            try:
+                item = self.writes.get(timeout=remaining)
+            except queue.Empty:
+                return batch, events, True
+
+    def _commit(self, batch):
+        scores = [(item[1], item[2]) for item in batch if item[0] == 'score']
+        replays = [item[1:] for item in batch if item[0] == 'score' and item[3] is not None]
+        # Pilihan sprite: yang terakhir per username yang menang
+        sprites = {item[1]: item[2:] for item in batch if item[0] == 'sprite'}
+        with self.database.transaction():
+            if scores:
+                self.database.save_scores(scores)
+            if replays:
+                self.database.save_replays(replays)
+            for username, (sprite_path, sprite_name) in sprites.items():
+                self.database.save_selected_sprite(username, sprite_path, sprite_name)
@@ -1,27 +1,147 @@
 ### server.py (Flask REST API)
 from flask import Flask, request, jsonify
+import argparse
+import multiprocessing
+import socket
 import sqlite3
 import os
+import signal
+import sys
+from itertools import chain
 from conf import Conf
+from db_pool import PoolTimeout
+from leaderboard import Leaderboard
+from response_cache import ResponseCache
+from shard_router import MergedLeaderboard, ShardRouter
 
 app = Flask(__name__)
-DB_PATH = os.path.join(Conf.BASE_DIR, 'flappy_bird.db')
+# FLAPPY_BIRD_DB: database lain (mis. untuk load test)
+DB_PATH = os.environ.get('FLAPPY_BIRD_DB', os.path.join(Conf.BASE_DIR, 'flappy_bird.db'))
+# FLAPPY_BIRD_SHARDS: jumlah file SQLite pemain (flappy_bird.shard<i>.db kalau lebih dari 1)
+SHARDS = int(os.environ.get('FLAPPY_BIRD_SHARDS', Conf.SERVER_SHARDS))
+
+# Satu pool per shard per proses worker; thread request meminjam koneksi dari sini
+router = ShardRouter(DB_PATH, SHARDS)
+# Respons JSON siap kirim untuk /login, /leaderboard dan /rank (per proses worker)
+response_cache = ResponseCache(Conf.RESPONSE_CACHE_TTL, Conf.RESPONSE_CACHE_SIZE)
+
+# Statement tetap (bukan string yang dirakit per request) supaya cache statement sqlite3 terpakai
+LOGIN_UPSERT = '''
+    INSERT INTO players (username) VALUES (?)
+    ON CONFLICT (username) DO UPDATE SET username = excluded.username
+    RETURNING id, highscore, sprite_file, sprite_name
+'''
+UPDATE_SCORE = 'UPDATE players SET highscore = ? WHERE id = ? RETURNING username, highscore'
+UPDATE_SPRITE = 'UPDATE players SET sprite_file = ?, sprite_name = ? WHERE id = ? RETURNING username'
+# Batch skor: seq yang tidak melewati seq tertinggi (player, device) diabaikan, highscore hanya bisa naik
+INGEST_SCORE = '''INSERT INTO score_seq (player_id, device, seq) VALUES (?, ?, ?)
+                  ON CONFLICT (player_id, device) DO UPDATE SET seq = excluded.seq WHERE excluded.seq > seq'''
+PLAYER_EXISTS = 'SELECT 1 FROM players WHERE id = ?'
+RAISE_HIGHSCORE = '''UPDATE players SET highscore = MAX(highscore, ?) WHERE id = ? AND highscore < ?
+                     RETURNING username, highscore'''
+
+def is_sqlite_int(value):
+    """True for a JSON integer SQLite can store (bool is an int in Python, but not here)"""
+    return isinstance(value, int) and not isinstance(value, bool) and 0 <= value < 2 ** 63
+
+# Jumlah respons 503 (lock SQLite masih dipegang writer lain setelah busy timeout)
+busy_responses = 0
 
 # Initialize database tables if not exist
-def init_db():
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
-    c.execute('''CREATE TABLE IF NOT EXISTS players (
-                 id INTEGER PRIMARY KEY AUTOINCREMENT,
-                 username TEXT UNIQUE NOT NULL,
-                 highscore INTEGER DEFAULT 0,
-                 sprite_file TEXT DEFAULT 'bird.png',
-                 sprite_name TEXT DEFAULT 'Flappy Bird'
-               )''')
-    conn.commit()
-    conn.close()
-
-init_db()
+def init_db(pool):
+    with pool.connection() as conn:
+        conn.execute('''CREATE TABLE IF NOT EXISTS players (
+                     id INTEGER PRIMARY KEY AUTOINCREMENT,
+                     username TEXT UNIQUE NOT NULL,
+                     highscore INTEGER DEFAULT 0,
+                     sprite_file TEXT DEFAULT 'bird.png',
+                     sprite_name TEXT DEFAULT 'Flappy Bird'
+                   )''')
+        # Seq tertinggi yang sudah diproses /update_scores per pemain dan device (seq >> 40):
+        # satu baris per device, bukan per skor
+        conn.execute('''CREATE TABLE IF NOT EXISTS score_seq (
+                     player_id INTEGER NOT NULL,
+                     device INTEGER NOT NULL,
+                     seq INTEGER NOT NULL,
+                     PRIMARY KEY (player_id, device)
+                   ) WITHOUT ROWID''')
+        # Database lama: score_ingest menyimpan setiap seq, cukup seq tertingginya
+        # (INSERT OR IGNORE: aman diulang kalau DROP belum sempat jalan)
+        if conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'score_ingest'").fetchone():
+            conn.execute('''INSERT OR IGNORE INTO score_seq (player_id, device, seq)
+                            SELECT player_id, seq >> 40, MAX(seq) FROM score_ingest GROUP BY player_id, seq >> 40''')
+            conn.execute('DROP TABLE score_ingest')
+        # Urutan leaderboard per shard untuk MergedLeaderboard
+        conn.execute('CREATE INDEX IF NOT EXISTS players_ranking ON players (highscore DESC, username)')
+
+for shard_pool in router.pools:
+    init_db(shard_pool)
+
+def load_leaderboard():
+    rows = []
+    for shard_pool in router.pools:
+        with shard_pool.connection() as conn:
+            # CAST: nilai non-integer (data lama/rusak) tidak boleh membuat server gagal start
+            rows.append(conn.execute('SELECT username, CAST(highscore AS INTEGER) FROM players').fetchall())
+    return Leaderboard.load(chain.from_iterable(rows))
+
+# Ranking di memori, dibangun ulang dari semua shard saat start dan diperbarui setelah setiap commit.
+# Dengan beberapa proses worker diganti MergedLeaderboard (lihat serve())
+leaderboard = load_leaderboard()
+
+def set_highscore(username, highscore):
+    """
+    Update the leaderboard and drop the cached responses it changes. Call it
+    inside the write transaction (before COMMIT): the write lock then orders
+    the updates of one player exactly like their commits.
+    """
+    old = leaderboard.set(username, highscore)
+    if old == highscore:
+        return
+    response_cache.invalidate(('player', username), ('rank', username))
+    if old is None:
+        # Pemain baru: total dan posisi semua pemain di bawahnya berubah
+        response_cache.invalidate_group('leaderboard')
+        response_cache.invalidate_group('rank')
+    else:
+        # Hanya halaman dan rank dengan skor di antara skor lama dan baru yang bergeser
+        low, high = min(old, highscore), max(old, highscore)
+        response_cache.invalidate_range('leaderboard', low, high)
+        response_cache.invalidate_range('rank', low, high)
+
+def cached_json(key, build):
+    """
+    JSON response for key from response_cache, or from build() -> (payload,
+    span) on a miss. Answers 304 when If-None-Match has the current ETag.
+    """
+    entry = response_cache.get(key)
+    if entry is None:
+        generation = response_cache.generation
+        payload, span = build()
+        entry = response_cache.put(key, payload, span, generation)
+    if entry.etag in request.if_none_match:
+        response_cache.not_modified += 1
+        response = app.response_class(status=304)
+    else:
+        response = app.response_class(entry.body, mimetype='application/json')
+    response.set_etag(entry.etag)
+    return response
+
+@app.errorhandler(sqlite3.OperationalError)
+def database_error(error):
+    # Hanya lock yang masih dipegang setelah busy timeout layak dicoba lagi;
+    # error lain (tabel tidak ada, SQL salah, ...) tetap 500
+    if getattr(error, 'sqlite_errorname', None) not in ('SQLITE_BUSY', 'SQLITE_LOCKED') \
+            and 'locked' not in str(error):
+        raise error
+    return database_busy(error)
+
+@app.errorhandler(PoolTimeout)
+def database_busy(error):
+    # Klien boleh mencoba lagi
+    global busy_responses
+    busy_responses += 1
+    return jsonify({'error': f'Database busy: {error}'}), 503, {'Retry-After': '1'}
 
 @app.route('/login', methods=['POST'])
 def login():
@@ -30,28 +150,23 @@ def login():
     if not username:
         return jsonify({'error': 'Username required'}), 400
 
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
-    # Try to find existing user
-    c.execute('SELECT id, highscore, sprite_file, sprite_name FROM players WHERE username = ?', (username,))
-    row = c.fetchone()
-    if row:
-        player_id, highscore, sprite_file, sprite_name = row
-    else:
-        # Create new user
-        c.execute('INSERT INTO players (username) VALUES (?)', (username,))
-        conn.commit()
-        player_id = c.lastrowid
-        highscore, sprite_file, sprite_name = 0, 'bird.png', 'Flappy Bird'
+    def build():
+        # Find or create the user in one atomic statement (no SELECT-then-INSERT race).
+        pool = router.for_username(username)
+        with pool.transaction() as conn:
+            local_id, highscore, sprite_file, sprite_name = conn.execute(LOGIN_UPSERT, (username,)).fetchall()[0]
+            set_highscore(username, highscore)
+        return {
+            'id': router.global_id(pool, local_id),
+            'username': username,
+            'highscore': highscore,
+            'sprite_file': sprite_file,
+            'sprite_name': sprite_name
+        }, None
 
-    conn.close()
-    return jsonify({
-        'id': player_id,
-        'username': username,
-        'highscore': highscore,
-        'sprite_file': sprite_file,
-        'sprite_name': sprite_name
-    })
+    # Login pemain yang sudah ada tidak mengubah apa pun, jadi boleh dilayani dari cache.
+    # Pemain baru tidak ikut di-cache pada login pertama (insert-nya menginvalidasi cache)
+    return cached_json(('player', username), build)
 
 @app.route('/update_score', methods=['POST'])
 def update_score():
@@ -60,14 +175,126 @@ def update_score():
     score = data.get('highscore')
     if user_id is None or score is None:
         return jsonify({'error': 'id and highscore required'}), 400
+    if not is_sqlite_int(user_id) or not is_sqlite_int(score):
+        return jsonify({'error': 'id and highscore must be integers from 0 to 2**63 - 1'}), 400
 
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
-    c.execute('UPDATE players SET highscore = ? WHERE id = ?', (score, user_id))
-    conn.commit()
-    conn.close()
+    pool, local_id = router.for_id(user_id)
+    with pool.transaction() as conn:
+        for username, highscore in conn.execute(UPDATE_SCORE, (score, local_id)).fetchall():
+            set_highscore(username, highscore)
     return jsonify({'status': 'ok'})
 
+@app.route('/update_scores', methods=['POST'])
+def update_scores():
+    """
+    Batch of {"id", "score", "seq"} entries, seq = device << 40 | a number
+    that only grows on that device (ScoreSync's outbox id). The server keeps
+    the highest seq per player and device and skips any entry at or below
+    it, so a retried batch is applied once and the table stays one row per
+    device. Entries for ids without a player are skipped and counted as
+    unknown. A player's highscore only ever goes up. One transaction per
+    shard the batch touches; each player row is written at most once, and
+    only if its highscore actually rises.
+    """
+    data = request.get_json()
+    entries = data.get('scores') if isinstance(data, dict) else None
+    if not isinstance(entries, list):
+        return jsonify({'error': 'scores list required'}), 400
+    if len(entries) > Conf.SERVER_MAX_BATCH:
+        return jsonify({'error': f'at most {Conf.SERVER_MAX_BATCH} scores per request'}), 413
+    try:
+        rows = [(entry['id'], entry['seq'], entry['score']) for entry in entries]
+    except (KeyError, TypeError):
+        rows = None
+    # Sama dengan /update_score: "7" dan 9.9 ditolak, bukan dibulatkan; di luar INTEGER SQLite juga ditolak
+    if rows is None or not all(is_sqlite_int(value) for row in rows for value in row):
+        return jsonify({'error': 'every score needs id, score and seq as integers from 0 to 2**63 - 1'}), 400
+
+    shards = {}
+    for player_id, seq, score in rows:
+        pool, local_id = router.for_id(player_id)
+        shards.setdefault(pool, []).append((local_id, seq, score))
+
+    duplicates = 0
+    unknown = 0
+    raised = []
+    for pool, shard_rows in shards.items():
+        best = {}
+        with pool.transaction() as conn:
+            # Id tanpa pemain tidak boleh menambah baris score_seq
+            exists = {local_id: conn.execute(PLAYER_EXISTS, (local_id,)).fetchone() is not None
+                      for local_id in {row[0] for row in shard_rows}}
+            # Urut seq: entri batch yang sama tidak menutupi yang lebih kecil
+            for local_id, seq, score in sorted(shard_rows, key=lambda row: row[1]):
+                if not exists[local_id]:
+                    unknown += 1
+                elif conn.execute(INGEST_SCORE, (local_id, seq >> 40, seq)).rowcount == 0:
+                    duplicates += 1
+                elif score > best.get(local_id, score - 1):
+                    best[local_id] = score
+            for local_id, score in best.items():
+                for username, highscore in conn.execute(RAISE_HIGHSCORE, (score, local_id, score)).fetchall():
+                    set_highscore(username, highscore)
+                    raised.append(username)
+
+    return jsonify({
+        'status': 'ok',
+        'accepted': len(rows) - duplicates - unknown,
+        'duplicates': duplicates,
+        'unknown_players': unknown,
+        'highscores_raised': len(raised)
+    })
+
+@app.route('/leaderboard', methods=['GET'])
+def get_leaderboard():
+    offset = request.args.get('offset', 0, type=int)
+    limit = min(request.args.get('limit', 10, type=int), Conf.LEADERBOARD_MAX_LIMIT)
+    if not 0 <= offset <= Conf.LEADERBOARD_MAX_OFFSET or limit < 1:
+        return jsonify({'error': f'offset must be 0 .. {Conf.LEADERBOARD_MAX_OFFSET} and limit >= 1'}), 400
+
+    def build():
+        entries = leaderboard.page(offset, limit)
+        # Span = skor yang tampil; halaman yang tidak penuh juga bergeser oleh skor di bawahnya
+        if len(entries) == limit:
+            span = (entries[-1][2], entries[0][2])
+        elif entries:
+            span = (float('-inf'), entries[0][2])
+        else:
+            span = None
+        return {
+            'total': len(leaderboard),
+            'offset': offset,
+            'entries': [{'rank': rank, 'username': username, 'highscore': highscore}
+                        for rank, username, highscore in entries]
+        }, span
+
+    return cached_json(('leaderboard', offset, limit), build)
+
+@app.route('/rank/<username>', methods=['GET'])
+def get_rank(username):
+    if leaderboard.score_of(username) is None:
+        return jsonify({'error': 'Unknown player'}), 404
+
+    def build():
+        highscore = leaderboard.score_of(username)
+        return {
+            'username': username,
+            'rank': leaderboard.rank(username),
+            'highscore': highscore,
+            'total': len(leaderboard)
+        }, (highscore, highscore)
+
+    return cached_json(('rank', username), build)
+
+@app.route('/cache_stats', methods=['GET'])
+def cache_stats():
+    return jsonify(response_cache.stats())
+
+@app.route('/db_stats', methods=['GET'])
+def db_stats():
+    # Per proses worker (dengan --workers N hanya proses yang menjawab request ini)
+    return jsonify({'pid': os.getpid(), 'busy_responses': busy_responses, 'shards': router.stats()})
+
 @app.route('/update_sprite', methods=['POST'])
 def update_sprite():
     data = request.get_json()
@@ -76,17 +303,62 @@ def update_sprite():
     sprite_name = data.get('sprite_name')
     if user_id is None or not sprite_file or not sprite_name:
         return jsonify({'error': 'id, sprite_file, and sprite_name required'}), 400
+    if not isinstance(user_id, int):
+        return jsonify({'error': 'id must be an integer'}), 400
 
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
-    c.execute('UPDATE players SET sprite_file = ?, sprite_name = ? WHERE id = ?'
-              , (sprite_file, sprite_name, user_id))
-    conn.commit()
-    conn.close()
+    pool, local_id = router.for_id(user_id)
+    with pool.transaction() as conn:
+        rows = conn.execute(UPDATE_SPRITE, (sprite_file, sprite_name, local_id)).fetchall()
+    response_cache.invalidate(*[('player', username) for username, in rows])
     return jsonify({'status': 'ok'})
 
+def serve_worker(listener, host, port):
+    from werkzeug.serving import make_server
+    make_server(host, port, app, threaded=True, fd=listener.fileno()).serve_forever()
+
+def serve(host, port, workers):
+    """
+    Run workers processes that accept on one pre-bound socket. Each worker
+    has its own connection pools and answers leaderboard reads by merging
+    the shards, since its in-memory Leaderboard and response cache could
+    not see the other workers' writes. That trades the O(log S) ranks of
+    Leaderboard for SQL: a rank counts the players above it and a page
+    reads offset + limit rows per shard (see benchmarks/bench_workers.py).
+    """
+    global leaderboard
+    if workers == 1:
+        app.run(host=host, port=port)
+        return
+    leaderboard = MergedLeaderboard(router)
+    response_cache.ttl = 0
+    # Koneksi SQLite tidak boleh dibawa melewati fork: worker membuka koneksinya sendiri
+    router.close()
+
+    listener = socket.create_server((host, port))
+    context = multiprocessing.get_context('fork')
+    processes = [context.Process(target=serve_worker, args=(listener, host, port), daemon=True)
+                 for _ in range(workers)]
+    for process in processes:
+        process.start()
+    # SIGTERM ke proses induk juga menghentikan semua worker
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for process in processes:
+            process.terminate()
+
 if __name__ == '__main__':
-    app.run(port=5000)
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=5000)
+    parser.add_argument('--workers', type=int, default=Conf.SERVER_WORKERS,
+                        help="processes sharing the port (shards: FLAPPY_BIRD_SHARDS)")
+    args = parser.parse_args()
+    serve(args.host, args.port, args.workers)
 
 
 ### main.py (Client Integration)
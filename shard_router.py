@@ -0,0 +1,118 @@
+import heapq
+import os
+import zlib
+from itertools import islice
+
+from db_pool import ConnectionPool
+
+# Urutan leaderboard di setiap shard (pakai index players_ranking), digabung dengan heapq.merge
+SHARD_PAGE = 'SELECT highscore, username FROM players ORDER BY highscore DESC, username LIMIT ?'
+SHARD_HIGHER = 'SELECT COUNT(*) FROM players WHERE highscore > ?'
+SHARD_SCORE = 'SELECT highscore FROM players WHERE username = ?'
+SHARD_TOTAL = 'SELECT COUNT(*) FROM players'
+
+
+class ShardRouter:
+    """
+    Spreads server.py's players over N SQLite files by a hash of the username.
+
+    Player ids handed out to clients encode their shard: id = local_id * N
+    + shard, where local_id is the row id inside the shard file. /login is
+    routed by username, /update_score, /update_scores and /update_sprite by
+    id, so every request touches exactly one shard (one batch touches each
+    shard once). With one shard the file is the plain database path and ids
+    are the row ids, so an existing flappy_bird.db keeps working.
+    """
+
+    def __init__(self, path, count=1, pool_size=None):
+        self.count = count
+        self.paths = [path] if count == 1 else [self.shard_path(path, shard) for shard in range(count)]
+        self.pools = [ConnectionPool(shard_path, pool_size) for shard_path in self.paths]
+
+    @staticmethod
+    def shard_path(path, shard):
+        root, ext = os.path.splitext(path)
+        return f"{root}.shard{shard}{ext}"
+
+    def shard_of_username(self, username):
+        # crc32, bukan hash(): harus sama di semua proses dan setiap start
+        return zlib.crc32(username.encode()) % self.count
+
+    def for_username(self, username):
+        return self.pools[self.shard_of_username(username)]
+
+    def for_id(self, player_id):
+        """(pool, row id inside the shard) for a client-facing player id"""
+        return self.pools[player_id % self.count], player_id // self.count
+
+    def global_id(self, pool, local_id):
+        return local_id * self.count + self.pools.index(pool)
+
+    def by_shard(self, player_ids):
+        """{pool: [player_id, ...]} so a batch opens one transaction per shard"""
+        groups = {}
+        for player_id in player_ids:
+            groups.setdefault(self.pools[player_id % self.count], []).append(player_id)
+        return groups
+
+    def close(self):
+        for pool in self.pools:
+            pool.close()
+
+    def stats(self):
+        return [pool.stats() for pool in self.pools]
+
+
+class MergedLeaderboard:
+    """
+    Leaderboard read straight from the shard files, for multi-process
+    serving where an in-memory Leaderboard per worker would miss the other
+    workers' writes. Same read interface as Leaderboard.
+
+    A page is the k-way merge of each shard's top offset + limit players,
+    so deep pages cost O(shards * offset) (server.py caps offset at
+    Conf.LEADERBOARD_MAX_OFFSET). A rank adds up per-shard COUNT(*) of
+    higher scores, an index range scan linear in the players ranked above,
+    unlike Leaderboard's O(log S). Writes already went to the shards, so
+    set() only reports that the previous score is unknown.
+    """
+
+    def __init__(self, router):
+        self.router = router
+
+    def __len__(self):
+        return sum(self._scalar(pool, SHARD_TOTAL) for pool in self.router.pools)
+
+    def _scalar(self, pool, sql, *params):
+        with pool.connection() as conn:
+            return conn.execute(sql, params).fetchone()[0]
+
+    def _higher(self, score):
+        return sum(self._scalar(pool, SHARD_HIGHER, score) for pool in self.router.pools)
+
+    def set(self, username, score):
+        return None
+
+    def score_of(self, username):
+        with self.router.for_username(username).connection() as conn:
+            row = conn.execute(SHARD_SCORE, (username,)).fetchone()
+        return None if row is None else row[0]
+
+    def rank(self, username):
+        score = self.score_of(username)
+        return None if score is None else 1 + self._higher(score)
+
+    def page(self, offset=0, limit=10):
+        """Players at positions offset .. offset + limit - 1 as (rank, username, score)"""
+        shard_rows = []
+        for pool in self.router.pools:
+            with pool.connection() as conn:
+                shard_rows.append(conn.execute(SHARD_PAGE, (offset + limit,)).fetchall())
+        merged = heapq.merge(*shard_rows, key=lambda row: (-row[0], row[1]))
+        entries = []
+        ranks = {}
+        for score, username in islice(merged, offset, offset + limit):
+            if score not in ranks:
+                ranks[score] = 1 + self._higher(score)
+            entries.append((ranks[score], username, score))
+        return entries
@@ -0,0 +1,181 @@
+import random
+
+from conf import Conf
+
+
+def bird_step(y, angle, fly):
+    """Advance the bird by one tick, returns the new (y, angle)"""
+    if fly:
+        return y - Conf.BIRD_FLY_SPEED, max(angle - 5, -30)
+    return y + Conf.GRAVITY, min(angle + 5, 90)
+
+
+def pipe_step(x):
+    """Advance a pipe by one tick, returns the new x"""
+    return x - Conf.PIPE_SPEED
+
+
+def platform_step(x, width):
+    """Advance the platform by one tick, wrapping once it scrolled half its width"""
+    x -= Conf.PLATFORM_SPEED
+    if x + width // 2 <= 0:
+        x = 0
+    return x
+
+
+def pipe_offset(seed, index):
+    """Vertical gap offset of the index-th pipe of a course, same for every run with this seed"""
+    if index == 0:
+        return 0
+    return random.Random(seed * 7919 + index).choice(Conf.PIPE_OFFSETS)
+
+
+def pipe_rects(x, offset=0):
+    """
+    Geometry of a pipe pair as (x, y, w, h) tuples, matching the pygame.Rect
+    layout of sprites.pipe.Pipe: top body, top head, bottom body, bottom head.
+    """
+    screen_w, screen_h = Conf.SCREEN_SIZE
+    width = int(0.15 * screen_w)
+    height = int(0.4 * screen_h)
+    head_w = int(1.2 * width)
+    head_h = int(0.15 * height)
+    head_x = x + width // 2 - head_w // 2
+
+    top_h = height + offset
+    bottom_h = height - offset
+    bottom_y = screen_h - bottom_h
+    return (
+        (x, 0, width, top_h),
+        (head_x, top_h - head_h, head_w, head_h),
+        (x, bottom_y, width, bottom_h),
+        (head_x, bottom_y, head_w, head_h),
+    )
+
+
+def _overlap(a, b):
+    """Same test as pygame.Rect.colliderect for (x, y, w, h) tuples"""
+    return a[0] < b[0] + b[2] and b[0] < a[0] + a[2] and a[1] < b[1] + b[3] and b[1] < a[1] + a[3]
+
+
+class SimState:
+    """Complete state of a run; everything step() needs and everything the renderer draws"""
+
+    __slots__ = ('tick', 'bird_y', 'bird_angle', 'pipe_x', 'pipe_index', 'pipe_offset',
+                 'platform_x', 'pass_pipe', 'score', 'level', 'life', 'game_over')
+
+    def __init__(self, **values):
+        for name in self.__slots__:
+            setattr(self, name, values[name])
+
+    def copy(self):
+        return SimState(**{name: getattr(self, name) for name in self.__slots__})
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class Simulation:
+    """
+    Headless fixed-timestep Flappy Bird engine.
+
+    One call to step() is one tick at Conf.FPS. Nothing here touches pygame,
+    so it runs without a window (bots, replays, benchmarks) and Game.loop only
+    renders whatever state it produces.
+    """
+
+    def __init__(self, seed=0, lives=None):
+        self.seed = seed
+        self.lives = Conf.LIVES if lives is None else lives
+
+        screen_w, screen_h = Conf.SCREEN_SIZE
+        bird_w, bird_h = Conf.BIRD_SIZE
+        self.bird_x = screen_w // 2 - bird_w // 2
+        self.bird_start_y = screen_h // 2 - bird_h // 2
+        self.bird_size = (bird_w, bird_h)
+        self.pipe_width = int(0.15 * screen_w)
+        self.pipe_start_x = screen_w - self.pipe_width
+        self.platform_width = 2 * screen_w
+        self.platform_start_x = screen_w // 2 - self.platform_width // 2
+        self.ground_y = screen_h - screen_h // 5
+
+        self.state = self.initial_state()
+
+    def initial_state(self):
+        return SimState(
+            tick=0,
+            bird_y=self.bird_start_y,
+            bird_angle=0,
+            pipe_x=self.pipe_start_x,
+            pipe_index=0,
+            pipe_offset=0,
+            platform_x=self.platform_start_x,
+            pass_pipe=False,
+            score=0,
+            level=1,
+            life=self.lives,
+            game_over=False,
+        )
+
+    def reset(self, seed=None):
+        if seed is not None:
+            self.seed = seed
+        self.state = self.initial_state()
+        return self.state
+
+    def bird_rect(self, state=None):
+        state = state or self.state
+        return (self.bird_x, state.bird_y) + self.bird_size
+
+    def collides(self, state=None):
+        """True if the bird touches a pipe, the ground or leaves the top of the screen"""
+        state = state or self.state
+        bird = self.bird_rect(state)
+        if bird[1] < 0 or bird[1] + bird[3] >= self.ground_y:
+            return True
+        for rect in pipe_rects(state.pipe_x, state.pipe_offset):
+            if _overlap(bird, rect):
+                return True
+        return False
+
+    def step(self, fly):
+        """Advance one tick with the given flap input and return the state"""
+        state = self.state
+        if state.game_over:
+            return state
+
+        state.tick += 1
+        state.bird_y, state.bird_angle = bird_step(state.bird_y, state.bird_angle, fly)
+        state.platform_x = platform_step(state.platform_x, self.platform_width)
+        state.pipe_x = pipe_step(state.pipe_x)
+
+        if not state.pass_pipe and state.pipe_x + self.pipe_width < self.bird_x:
+            state.pass_pipe = True
+            state.score += 1
+            state.level = 1 + state.score // Conf.LEVEL_UP_SCORE
+        if state.pipe_x + self.pipe_width <= 0:
+            self._spawn_pipe(state)
+
+        if self.collides(state):
+            state.life -= 1
+            if state.life <= 0:
+                state.game_over = True
+            else:
+                state.bird_y = self.bird_start_y
+                state.bird_angle = 0
+                state.pipe_x = self.pipe_start_x
+                state.pass_pipe = False
+        return state
+
+    def _spawn_pipe(self, state):
+        state.pipe_index += 1
+        state.pipe_x = Conf.SCREEN_SIZE[0]
+        state.pipe_offset = pipe_offset(self.seed, state.pipe_index)
+        state.pass_pipe = False
+
+    def run(self, inputs):
+        """Feed an iterable of flap inputs, stops early on game over"""
+        for fly in inputs:
+            if self.step(fly).game_over:
+                break
+        return self.state
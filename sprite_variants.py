@@ -0,0 +1,74 @@
+import json
+import os
+
+from conf import Conf
+
+
+class SpriteVariants:
+    """
+    Lookup of the pre-scaled sprites made by preprocess_sprites.py.
+
+    assets/pokemon/processed/manifest.json maps a sprite id ('bird' or a
+    Pokemon id) to its source hash, source mtime and one file per target size.
+    Files are named <source hash>_<w>x<h>.png, so a changed source or a
+    changed size in Conf simply doesn't match anymore and the runtime falls
+    back to scaling until the pipeline is run again.
+    """
+
+    DIR = os.path.join(Conf.BASE_DIR, "assets", "pokemon", "processed")
+    MANIFEST = os.path.join(DIR, "manifest.json")
+
+    _manifest = None
+
+    @staticmethod
+    def sizes():
+        """Target size of every variant: game (bird size) and preview (selector)"""
+        width, height = Conf.BIRD_SIZE
+        scale = Conf.SPRITE_PREVIEW_SCALE
+        return {'game': (width, height), 'preview': (width * scale, height * scale)}
+
+    @staticmethod
+    def size_key(size):
+        return f"{size[0]}x{size[1]}"
+
+    @staticmethod
+    def source_path(sprite_id):
+        if sprite_id == 'bird':
+            return os.path.join(Conf.BASE_DIR, "assets", "bird.png")
+        return os.path.join(Conf.BASE_DIR, "assets", "pokemon", f"{sprite_id}.png")
+
+    @classmethod
+    def manifest(cls):
+        if cls._manifest is None:
+            try:
+                with open(cls.MANIFEST, 'r') as f:
+                    cls._manifest = json.load(f)
+            except FileNotFoundError:
+                cls._manifest = {}
+            except Exception as e:
+                print(f"Error membaca manifest sprite: {e}")
+                cls._manifest = {}
+        return cls._manifest
+
+    @classmethod
+    def reload(cls):
+        cls._manifest = None
+        return cls.manifest()
+
+    @classmethod
+    def path(cls, sprite_id, variant):
+        """Path of a pre-scaled variant ('game' or 'preview'), or None if missing or out of date"""
+        entry = cls.manifest().get(str(sprite_id))
+        if entry is None:
+            return None
+        filename = entry['variants'].get(cls.size_key(cls.sizes()[variant]))
+        if filename is None:
+            return None
+        try:
+            # Source berubah sejak diproses: pakai scaling biasa sampai pipeline dijalankan lagi
+            if os.path.getmtime(cls.source_path(sprite_id)) != entry['source_mtime']:
+                return None
+        except OSError:
+            pass
+        path = os.path.join(cls.DIR, filename)
+        return path if os.path.exists(path) else None
@@ -2,6 +2,8 @@ import pygame
 import os
 
 from conf import Conf
+from asset_manager import AssetManager
+from text_cache import TextCache
 
 class PlayButton:
 
@@ -9,11 +11,10 @@ class PlayButton:
         self.screen = Game.screen
         self.screen_rect = Game.screen_rect
 
-        image_path = os.path.join(Conf.BASE_DIR, "assets", "play.png")
-        self.image = pygame.image.load(image_path)
-        self.rect = self.image.get_rect()
+        image_path = os.path.join("assets", "play_button.png")
+        width, height = AssetManager.load(image_path).get_size()
 
-        self.image = pygame.transform.scale(self.image, (self.rect.width//10, self.rect.height//10))
+        self.image = AssetManager.load(image_path, size=(width//10, height//10))
         self.rect = self.image.get_rect()
 
         self.rect.center = self.screen_rect.center
@@ -36,7 +37,7 @@ class Button:
 
     def text_to_image(self, text):
 
-        self.font = pygame.font.Font(self.font_path, Conf.BUTTON_FONT_SIZE)
+        self.font = TextCache.font(self.font_path, Conf.BUTTON_FONT_SIZE)
         self.text_image = self.font.render(text, True, Conf.FONT_COLOR)
 
         self.text_image_rect = self.text_image.get_rect()
@@ -1,7 +1,7 @@
-import pygame
 import os
 
 from conf import Conf
+from text_cache import TextCache
 
 class Label:
 
@@ -11,7 +11,7 @@ class Label:
         self.text = text
 
         font_path = os.path.join(Conf.BASE_DIR, "assets/fonts", Conf.FONT_FAMILY)
-        self.font = pygame.font.Font(font_path, Conf.FONT_SIZE)
+        self.font = TextCache.font(font_path, Conf.FONT_SIZE)
         self.text_image = self.font.render(self.text, True, Conf.FONT_COLOR)
 
         self.text_image_rect = self.text_image.get_rect()
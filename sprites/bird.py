@@ -1,8 +1,9 @@
-import pygame
 import os
-from conf import Conf
+from asset_manager import AssetManager
 from database import Database
 from pokemon_api import PokemonAPI
+from simulation import bird_step
+from sprites.rotation_cache import RotationCache
 
 class Bird():
     def __init__(self, Game):
@@ -12,19 +13,11 @@ class Bird():
         # Initialize the database and Pokemon API
         self.database = Database()
         self.pokemon_api = PokemonAPI()
+        self.pinned_id = None
         
         # Get the selected sprite from the database
-        sprite_path, sprite_name = self.database.get_selected_sprite()
-        
-        # Load the appropriate sprite
-        if sprite_path == 'bird.png':
-            # Load the default bird sprite
-            image_path = os.path.join(Conf.BASE_DIR, "assets", sprite_path)
-            self.image = pygame.image.load(image_path)
-        else:
-            # Load a Pokemon sprite
-            pokemon_id = sprite_path.split('.')[0]  # Remove the .png extension
-            self.image = self.pokemon_api.get_pokemon_sprite(pokemon_id)
+        sprite_path, sprite_name = self.database.get_selected_sprite(Game.username)
+        self.set_skin(sprite_path, sprite_name)
         
         self.rect = self.image.get_rect()
         
@@ -34,15 +27,34 @@ class Bird():
         
         self.rect.center = self.screen_rect.center
 
-    def move(self):
-        if self.fly:
-            self.rect.y -= Conf.BIRD_FLY_SPEED
-            self.angle = max(self.angle - 5, -30)  
+    def set_skin(self, sprite_path, sprite_name=None):
+        """Load a skin (bird.png or '<pokemon id>.png') and its rotation frames"""
+        # Skin lama boleh di-evict lagi dari sprites_cache
+        if self.pinned_id is not None:
+            self.pokemon_api.sprites_cache.unpin(self.pinned_id)
+            self.pinned_id = None
+        
+        if sprite_path == 'bird.png':
+            # Load the default bird sprite
+            self.image = AssetManager.load(os.path.join("assets", sprite_path))
         else:
-            self.rect.y += Conf.GRAVITY
-            self.angle = min(self.angle + 5, 90) 
+            # Load a Pokemon sprite
+            pokemon_id = sprite_path.split('.')[0]  # Remove the .png extension
+            self.image = self.pokemon_api.get_pokemon_sprite(pokemon_id)
+            # Skin yang sedang dipakai tidak pernah di-evict
+            self.pokemon_api.sprites_cache.pin(pokemon_id)
+            self.pinned_id = pokemon_id
+        self.name = sprite_name
+        self.rotations = RotationCache.for_skin(sprite_path, self.image)
+
+    def move(self):
+        self.rect.y, self.angle = bird_step(self.rect.y, self.angle, self.fly)
+
+    def sync(self, state):
+        """Take position and angle from a simulation.SimState"""
+        self.rect.y = state.bird_y
+        self.angle = state.bird_angle
 
     def show(self):
-        rotated_image = pygame.transform.rotate(self.image, -self.angle)
-        rotated_rect = rotated_image.get_rect(center=self.rect.center)
-        self.screen.blit(rotated_image, rotated_rect)
+        rotated_image, (dx, dy) = self.rotations.get(self.angle)
+        self.screen.blit(rotated_image, (self.rect.centerx + dx, self.rect.centery + dy))
@@ -1,7 +1,6 @@
-import pygame
 import os
 
-from conf import Conf
+from asset_manager import AssetManager
 
 class Life():
 
@@ -9,8 +8,7 @@ class Life():
         self.screen = Game.screen
         self.screen_rect = Game.screen_rect
 
-        image_path = os.path.join(Conf.BASE_DIR, "assets", "life.png")
-        self.image = pygame.image.load(image_path)
+        self.image = AssetManager.load(os.path.join("assets", "life.png"))
         self.rect = self.image.get_rect()
 
         self.rect.topright = self.screen_rect.topright
@@ -1,6 +1,7 @@
 import pygame
 
 from conf import Conf
+from simulation import pipe_step, pipe_rects
 
 class Pipe():
 
@@ -21,13 +22,23 @@ class Pipe():
             self.head_rect.midtop = self.rect.midtop
 
     def move(self):
-        self.rect.x -= Conf.PIPE_SPEED
+        self.rect.x = pipe_step(self.rect.x)
 
         if self.position == "top":
             self.head_rect.midbottom = self.rect.midbottom
         elif self.position == "bottom":
             self.head_rect.midtop = self.rect.midtop
 
+    def sync(self, state):
+        """Take x and gap offset from a simulation.SimState"""
+        top, top_head, bottom, bottom_head = pipe_rects(state.pipe_x, state.pipe_offset)
+        if self.position == "top":
+            self.rect.update(top)
+            self.head_rect.update(top_head)
+        elif self.position == "bottom":
+            self.rect.update(bottom)
+            self.head_rect.update(bottom_head)
+
     def show(self):
         pygame.draw.rect(self.screen, self.color, self.rect)
         pygame.draw.rect(self.screen, self.color, self.head_rect)
@@ -1,7 +1,7 @@
-import pygame
 import os
 
-from conf import Conf
+from asset_manager import AssetManager
+from simulation import platform_step
 
 class Platform():
 
@@ -9,15 +9,17 @@ class Platform():
         self.screen = Game.screen
         self.screen_rect = Game.screen_rect
 
-        image_path = os.path.join(Conf.BASE_DIR, "assets", "land.png")
-        self.image = pygame.transform.scale(pygame.image.load(image_path), (2*self.screen_rect.width, self.screen_rect.height//5))
+        self.image = AssetManager.load(os.path.join("assets", "land.png"),
+                                       size=(2*self.screen_rect.width, self.screen_rect.height//5))
         self.rect = self.image.get_rect()
         self.rect.midbottom = self.screen_rect.midbottom
 
     def move(self):
-        self.rect.x -= Conf.PLATFORM_SPEED
-        if self.rect.centerx <= 0:
-            self.rect.left = self.screen_rect.left
+        self.rect.x = platform_step(self.rect.x, self.rect.width)
+
+    def sync(self, state):
+        """Take the scroll position from a simulation.SimState"""
+        self.rect.x = state.platform_x
 
     def show(self):
         self.screen.blit(self.image, self.rect)
\ No newline at end of file
@@ -0,0 +1,54 @@
+from collections import OrderedDict
+
+import pygame
+
+
+class RotationCache:
+    """
+    All rotated frames of one image, built once.
+
+    Bird.move only produces angles in 5 degree steps between -30 and 90, so
+    the 25 possible frames are rotated (and converted) up front and show()
+    just blits the right one.
+    """
+
+    MIN_ANGLE = -30
+    MAX_ANGLE = 90
+    STEP = 5
+    # Skins kept at once; each holds 25 frames, and SpriteSelector offers 151 of them
+    MAX_SKINS = 4
+
+    # Caches of the most recently used skins, so switching back in SpriteSelector is free
+    _by_skin = OrderedDict()
+
+    def __init__(self, image):
+        self.image = image
+        self.frames = {}
+        for angle in range(self.MIN_ANGLE, self.MAX_ANGLE + 1, self.STEP):
+            self.frames[angle] = self._rotate(angle)
+
+    @classmethod
+    def for_skin(cls, key, image):
+        """Return the cache for this skin, building it on first use (least recently used skins are dropped)"""
+        cache = cls._by_skin.get(key)
+        if cache is None:
+            cache = cls._by_skin[key] = cls(image)
+            if len(cls._by_skin) > cls.MAX_SKINS:
+                cls._by_skin.popitem(last=False)
+        else:
+            cls._by_skin.move_to_end(key)
+        return cache
+
+    def _rotate(self, angle):
+        frame = pygame.transform.rotate(self.image, -angle)
+        if pygame.display.get_surface() is not None:
+            frame = frame.convert_alpha()
+        # Offset of the frame's topleft from the bird center
+        return frame, (-(frame.get_width() // 2), -(frame.get_height() // 2))
+
+    def get(self, angle):
+        """Return (surface, offset) for an angle, rotating on the fly for angles off the grid"""
+        frame = self.frames.get(angle)
+        if frame is None:
+            frame = self._rotate(angle)
+        return frame
@@ -0,0 +1,88 @@
+import queue
+import threading
+
+from pokemon_api import PokemonAPI
+
+
+class SpriteLoader:
+    """
+    Background worker for SpriteSelector.
+
+    The thread fetches the Pokemon list (network / disk) and then decodes the
+    sprites it is asked for. Results go into a queue as plain messages:
+
+        ('progress', done, total)   details fetched so far
+        ('list', pokemon_list)      metadata is ready
+        ('sprite', pokemon_id, surface or None)
+        ('error', exception)
+
+    Surfaces are decoded but not converted; convert() needs the display and
+    therefore happens on the main thread when the message is polled.
+    """
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.results = queue.Queue()
+        self.requests = queue.Queue()
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="SpriteLoader", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.requests.put(None)
+
+    def request(self, pokemon_ids):
+        """Queue sprites for decoding, ids already queued are skipped"""
+        with self._lock:
+            for pokemon_id in pokemon_ids:
+                if pokemon_id not in self._pending:
+                    self._pending.add(pokemon_id)
+                    self.requests.put(pokemon_id)
+
+    def retain(self, pokemon_ids):
+        """Cancel every queued request that is not in pokemon_ids"""
+        with self._lock:
+            self._pending &= set(pokemon_ids)
+
+    def poll(self, max_messages):
+        """Return up to max_messages finished results without blocking"""
+        messages = []
+        while len(messages) < max_messages:
+            try:
+                messages.append(self.results.get_nowait())
+            except queue.Empty:
+                break
+        return messages
+
+    def _run(self):
+        # PokemonAPI sendiri untuk thread ini, tidak berbagi state dengan main thread
+        api = PokemonAPI()
+        try:
+            pokemon_list = api.get_pokemon_list(
+                limit=self.limit,
+                on_progress=lambda done, total: self.results.put(('progress', done, total)))
+            self.results.put(('list', pokemon_list))
+        except Exception as e:
+            self.results.put(('error', e))
+            return
+
+        while True:
+            pokemon_id = self.requests.get()
+            if pokemon_id is None:
+                break
+            with self._lock:
+                if pokemon_id not in self._pending:
+                    # Dibatalkan lewat retain(), sudah keluar dari window
+                    continue
+            try:
+                surface = api.read_sprite(pokemon_id)
+            except Exception as e:
+                print(f"Error loading sprite for {pokemon_id}: {e}")
+                surface = None
+            with self._lock:
+                self._pending.discard(pokemon_id)
+            self.results.put(('sprite', pokemon_id, surface))
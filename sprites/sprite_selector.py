@@ -1,17 +1,22 @@
 import pygame
 import os
+import math
 from conf import Conf
-from pokemon_api import PokemonAPI
+from asset_manager import AssetManager
+from sprite_variants import SpriteVariants
+from text_cache import TextCache
 from database import Database
+from statistic import Statistic
+from sprites.sprite_loader import SpriteLoader
 
 class SpriteSelector:
     def __init__(self, game):
         self.game = game
         self.screen = game.screen
         self.screen_rect = game.screen_rect
-        self.font = pygame.font.Font(None, 26)
-        self.title_font = pygame.font.Font(None, 36)
-        self.small_font = pygame.font.Font(None, 20)
+        self.font = TextCache.font(None, 26)
+        self.title_font = TextCache.font(None, 36)
+        self.small_font = TextCache.font(None, 20)
         
         # Tambahkan penanganan error untuk loading
         self.loading_text = "Loading Pokemon data..."
@@ -21,6 +26,16 @@ class SpriteSelector:
         # Inisialisasi daftar kosong untuk sprites dan pokemon
         self.sprites = []
         self.pokemon_list = []
+        self.loaded_count = 0
+        self.progress = (0, 0)
+        self.index_by_id = {}
+        self.selected_index = 0
+        
+        # Hanya sprite di sekitar selected_index (dan sel grid yang terlihat) yang dimuat
+        self.resident = set()
+        self.browse_direction = 1
+        self.grid_view = False
+        self.grid_scroll = 0
         
         # Variabel untuk animasi tombol
         self.blink_counter = 0
@@ -29,8 +44,11 @@ class SpriteSelector:
         # Setup tombol dengan ukuran yang lebih besar
         self.setup_buttons_initial()
         
-        # Mulai proses loading secara bertahap
-        self.load_pokemon_data()
+        self.database = Database()
+        
+        # Mulai proses loading secara bertahap, di thread terpisah supaya
+        # window tidak freeze; hasilnya diambil oleh poll() setiap frame
+        self.loader = SpriteLoader(limit=Conf.POKEMON_LIMIT).start()
     
     def setup_buttons_initial(self):
         """Setup initial buttons for loading/error screens"""
@@ -45,101 +63,194 @@ class SpriteSelector:
             button_height
         )
     
-    def load_pokemon_data(self):
-        """Load Pokemon data with error handling"""
+    def poll(self):
+        """Take finished work from the loader thread; surfaces are converted here, on the main thread"""
+        for message in self.loader.poll(Conf.SPRITES_PER_FRAME):
+            kind = message[0]
+            if kind == 'progress':
+                self.progress = message[1:]
+            elif kind == 'list':
+                self.on_pokemon_list(message[1])
+            elif kind == 'sprite':
+                self.on_sprite(message[1], message[2])
+            elif kind == 'error':
+                self.on_loading_error(message[1])
+    
+    def make_entry(self, pokemon, image):
+        pokemon_type = pokemon.get('type', 'Unknown')
+        return {
+            'id': pokemon['id'],
+            'name': pokemon['name'],
+            'image': image,
+            'preview': None,
+            'type': pokemon_type,
+            # Warna dihitung sekali di sini, bukan setiap frame
+            'type_color': self.get_type_color(pokemon.get('primary_type', pokemon_type)),
+            'height': pokemon.get('height', 0),
+            'weight': pokemon.get('weight', 0)
+        }
+    
+    def on_pokemon_list(self, pokemon_list):
+        """Metadata is ready: build the gallery now, sprites stream in afterwards"""
+        self.pokemon_list = list(pokemon_list)
+        
+        # Add default Flappy Bird to the list
+        self.pokemon_list.insert(0, {
+            'id': 'bird',
+            'name': 'Flappy Bird',
+            'sprite_url': 'bird.png',
+            'type': 'Bird',
+            'height': 0.3,
+            'weight': 0.2
+        })
+        
+        # Get current sprite selection
         try:
-            self.pokemon_api = PokemonAPI()
-            self.database = Database()
-            
-            # Get the Pokemon list from the API with larger limit (20)
-            self.pokemon_list = self.pokemon_api.get_pokemon_list(limit=20)
-            
-            # Add default Flappy Bird to the list
-            self.pokemon_list.insert(0, {
+            self.selected_sprite_path, self.selected_sprite_name = self.database.get_selected_sprite(self.game.username)
+        except Exception as e:
+            print(f"Error reading sprite selection: {e}")
+            self.selected_sprite_path, self.selected_sprite_name = 'bird.png', 'Flappy Bird'
+        
+        # Determine the selected index based on the sprite name
+        self.selected_index = 0
+        for i, pokemon in enumerate(self.pokemon_list):
+            if pokemon['name'] == self.selected_sprite_name:
+                self.selected_index = i
+                break
+        
+        # Sprite Pokemon masih None sampai loader selesai men-decode-nya
+        bird_sprite = AssetManager.load(os.path.join("assets", "bird.png"))
+        self.sprites = [self.make_entry(self.pokemon_list[0], bird_sprite)]
+        self.sprites += [self.make_entry(pokemon, None) for pokemon in self.pokemon_list[1:]]
+        self.index_by_id = {entry['id']: i for i, entry in enumerate(self.sprites)}
+        self.resident = {0}
+        self.loaded_count = 1
+        
+        # Set up navigation buttons
+        self.setup_buttons()
+        self.update_window()
+        
+        # Selesai loading metadata
+        self.is_loading = False
+    
+    def on_sprite(self, pokemon_id, surface):
+        index = self.index_by_id.get(pokemon_id)
+        if index is None or index not in self.wanted_indices():
+            # Sudah di luar window sebelum selesai dimuat
+            return
+        entry = self.sprites[index]
+        if surface is None:
+            print(f"Error loading sprite for {entry['name']}")
+            # Load the default bird sprite sebagai fallback
+            entry['image'] = AssetManager.load(os.path.join("assets", "bird.png"))
+            entry['preview'] = self.load_preview('bird')
+            if not entry['name'].endswith(" (error)"):
+                entry['name'] += " (error)"
+        else:
+            entry['image'] = AssetManager.adopt(self.sprite_path(pokemon_id), surface, Conf.BIRD_SIZE)
+        self.resident.add(index)
+        self.loaded_count = len(self.resident)
+    
+    def sprite_path(self, pokemon_id):
+        return os.path.join(Conf.BASE_DIR, "assets", "pokemon", f"{pokemon_id}.png")
+    
+    def load_preview(self, sprite_id):
+        """Preview-size sprite: the preprocessed variant if there is one, otherwise scaled once and cached"""
+        return AssetManager.load(SpriteVariants.source_path(sprite_id), size=SpriteVariants.sizes()['preview'],
+                                 source=SpriteVariants.path(sprite_id, 'preview'))
+    
+    def preview_image(self, index):
+        entry = self.sprites[index]
+        if entry['image'] is None:
+            return None
+        if entry['preview'] is None:
+            try:
+                entry['preview'] = self.load_preview(entry['id'])
+            except Exception as e:
+                print(f"Error loading preview for {entry['name']}: {e}")
+                entry['preview'] = pygame.transform.scale(entry['image'], SpriteVariants.sizes()['preview'])
+        return entry['preview']
+    
+    def distance_from_selected(self, index):
+        distance = abs(index - self.selected_index)
+        return min(distance, len(self.sprites) - distance)
+    
+    def wanted_indices(self):
+        """
+        Indices whose sprites should be in memory: a window around the
+        selection, a prefetch ring in the browsing direction and, in grid
+        view, the visible cells plus one row either side.
+        """
+        count = len(self.sprites)
+        if count == 0:
+            return set()
+        radius = Conf.SPRITE_WINDOW_RADIUS
+        wanted = {0}  # Flappy Bird default selalu ada
+        wanted.update((self.selected_index + offset) % count for offset in range(-radius, radius + 1))
+        for step in range(radius + 1, radius + Conf.SPRITE_PREFETCH + 1):
+            wanted.add((self.selected_index + self.browse_direction * step) % count)
+        if self.grid_view:
+            wanted.update(self.visible_grid_indices(extra_rows=1))
+        return wanted
+    
+    def update_window(self):
+        """Request sprites that entered the window and evict those that left it"""
+        wanted = self.wanted_indices()
+        
+        for index in self.resident - wanted:
+            entry = self.sprites[index]
+            entry['image'] = None
+            entry['preview'] = None
+            AssetManager.forget(self.sprite_path(entry['id']))
+        self.resident &= wanted
+        self.loaded_count = len(self.resident)
+        
+        # Sprite yang ada di atlas cukup diambil subsurface-nya, tanpa loader thread
+        for index in wanted - self.resident:
+            entry = self.sprites[index]
+            if AssetManager.in_atlas(self.sprite_path(entry['id']), Conf.BIRD_SIZE):
+                entry['image'] = AssetManager.load(self.sprite_path(entry['id']), size=Conf.BIRD_SIZE)
+                self.resident.add(index)
+        self.loaded_count = len(self.resident)
+        
+        # Terdekat dengan pilihan dimuat lebih dulu, request lama dibatalkan
+        missing = sorted(wanted - self.resident, key=self.distance_from_selected)
+        ids = [self.sprites[index]['id'] for index in missing]
+        self.loader.retain(ids)
+        self.loader.request(ids)
+    
+    def select_index(self, index, direction=None):
+        if direction is not None:
+            self.browse_direction = direction
+        self.selected_index = index % len(self.sprites)
+        if self.grid_view:
+            self.scroll_to_selected()
+        self.update_window()
+    
+    def on_loading_error(self, error):
+        print(f"Terjadi kesalahan saat memuat data Pokemon: {error}")
+        self.loading_error = True
+        self.is_loading = False
+        
+        # Tambahkan default bird jika terjadi error
+        try:
+            default_sprite = AssetManager.load(os.path.join("assets", "bird.png"))
+            self.pokemon_list = [{
                 'id': 'bird',
                 'name': 'Flappy Bird',
                 'sprite_url': 'bird.png',
                 'type': 'Bird',
                 'height': 0.3,
                 'weight': 0.2
-            })
-            
-            # Get current sprite selection
-            self.selected_sprite_path, self.selected_sprite_name = self.database.get_selected_sprite()
-            
-            # Determine the selected index based on the sprite name
+            }]
+            self.sprites = [self.make_entry(self.pokemon_list[0], default_sprite)]
+            self.index_by_id = {'bird': 0}
+            self.resident = {0}
+            self.loaded_count = 1
             self.selected_index = 0
-            for i, pokemon in enumerate(self.pokemon_list):
-                if pokemon['name'] == self.selected_sprite_name:
-                    self.selected_index = i
-                    break
-            
-            # Load sprites
-            self.sprites = []
-            for pokemon in self.pokemon_list:
-                try:
-                    if pokemon['id'] == 'bird':
-                        # Load the default bird sprite
-                        sprite = pygame.image.load(os.path.join(Conf.BASE_DIR, "assets", "bird.png"))
-                    else:
-                        # Load the Pokemon sprite
-                        sprite = self.pokemon_api.get_pokemon_sprite(pokemon['id'])
-                    
-                    self.sprites.append({
-                        'id': pokemon['id'],
-                        'name': pokemon['name'],
-                        'image': sprite,
-                        'type': pokemon.get('type', 'Unknown'),
-                        'height': pokemon.get('height', 0),
-                        'weight': pokemon.get('weight', 0)
-                    })
-                except Exception as e:
-                    print(f"Error loading sprite for {pokemon['name']}: {e}")
-                    # Load the default bird sprite sebagai fallback
-                    default_sprite = pygame.image.load(os.path.join(Conf.BASE_DIR, "assets", "bird.png"))
-                    self.sprites.append({
-                        'id': pokemon['id'],
-                        'name': pokemon['name'] + " (error)",
-                        'image': default_sprite,
-                        'type': pokemon.get('type', 'Unknown'),
-                        'height': pokemon.get('height', 0),
-                        'weight': pokemon.get('weight', 0)
-                    })
-            
-            # Set up navigation buttons
             self.setup_buttons()
-            
-            # Selesai loading
-            self.is_loading = False
-            
         except Exception as e:
-            print(f"Terjadi kesalahan saat memuat data Pokemon: {e}")
-            self.loading_error = True
-            self.is_loading = False
-            
-            # Tambahkan default bird jika terjadi error
-            try:
-                default_sprite = pygame.image.load(os.path.join(Conf.BASE_DIR, "assets", "bird.png"))
-                self.pokemon_list = [{
-                    'id': 'bird',
-                    'name': 'Flappy Bird',
-                    'sprite_url': 'bird.png',
-                    'type': 'Bird',
-                    'height': 0.3,
-                    'weight': 0.2
-                }]
-                self.sprites = [{
-                    'id': 'bird',
-                    'name': 'Flappy Bird',
-                    'image': default_sprite,
-                    'type': 'Bird',
-                    'height': 0.3,
-                    'weight': 0.2
-                }]
-                self.selected_index = 0
-                self.setup_buttons()
-            except Exception as e:
-                print(f"Gagal memuat sprite default: {e}")
+            print(f"Gagal memuat sprite default: {e}")
     
     def setup_buttons(self):
         """Setup the navigation buttons with larger, more visible sizes"""
@@ -174,6 +285,9 @@ class SpriteSelector:
             select_button_height
         )
         
+        # Tombol untuk pindah ke tampilan grid / satu Pokemon
+        self.toggle_button_rect = pygame.Rect(self.screen_rect.width - 85, 48, 75, 26)
+        
         # Tombol Back yang lebih kecil
         back_button_width = 150
         back_button_height = 50
@@ -191,6 +305,9 @@ class SpriteSelector:
         if self.blink_counter == 0:
             self.blink_state = not self.blink_state
         
+        # Ambil hasil loader thread yang sudah selesai
+        self.poll()
+        
         # Fill the background
         self.screen.fill(Conf.SCREEN_BG_COLOR)
         
@@ -221,51 +338,12 @@ class SpriteSelector:
         page_rect = page_surface.get_rect(center=(self.screen_rect.width // 2, 60))
         self.screen.blit(page_surface, page_rect)
         
-        # Draw the current sprite with enlarged size
-        current_sprite = self.sprites[self.selected_index]['image']
-        # Make sprite bigger (scale by 3x)
-        scaled_sprite = pygame.transform.scale(current_sprite, 
-                                            (current_sprite.get_width() * 3, 
-                                            current_sprite.get_height() * 3))
-        sprite_rect = scaled_sprite.get_rect(center=(self.screen_rect.width // 2, self.screen_rect.height // 2 - 60))
-        
-        # Draw decorative background for the sprite
-        pygame.draw.circle(self.screen, (70, 30, 180), sprite_rect.center, max(sprite_rect.width, sprite_rect.height) // 1.5)
-        
-        # Redraw the sprite on top of the background
-        self.screen.blit(scaled_sprite, sprite_rect)
-        
-        # Draw the sprite name with highlighting
-        name_text = self.sprites[self.selected_index]['name']
-        
-        # Draw name with shadow effect
-        shadow_surface = self.title_font.render(name_text, True, (30, 30, 30))
-        shadow_rect = shadow_surface.get_rect(center=(self.screen_rect.width // 2 + 3, sprite_rect.bottom + 23))
-        self.screen.blit(shadow_surface, shadow_rect)
-        
-        name_surface = self.title_font.render(name_text, True, (255, 255, 255))
-        name_rect = name_surface.get_rect(center=(self.screen_rect.width // 2, sprite_rect.bottom + 20))
-        self.screen.blit(name_surface, name_rect)
-        
-        # Draw additional information if it's a Pokemon
-        if self.selected_index > 0:  # Not the default bird
-            # Create info text
-            pokemon_info = self.sprites[self.selected_index]
-            type_text = f"Type: {pokemon_info['type']}"
-            size_text = f"Height: {pokemon_info['height']}m  Weight: {pokemon_info['weight']}kg"
-            
-            # Render type with colored background based on type
-            type_color = self.get_type_color(pokemon_info['type'])
-            type_surface = self.font.render(type_text, True, (255, 255, 255))
-            type_bg_rect = type_surface.get_rect(center=(self.screen_rect.width // 2, name_rect.bottom + 25))
-            type_bg_rect.inflate_ip(30, 15)  # Make background a bit bigger than text
-            
-            pygame.draw.rect(self.screen, type_color, type_bg_rect, border_radius=15)
-            self.screen.blit(type_surface, type_surface.get_rect(center=(self.screen_rect.width // 2, name_rect.bottom + 25)))
-            
-            # Render size info
-            size_surface = self.font.render(size_text, True, (200, 200, 200))
-            self.screen.blit(size_surface, size_surface.get_rect(center=(self.screen_rect.width // 2, name_rect.bottom + 60)))
+        # Grid view draws only the visible cells, single view the current Pokemon
+        self.draw_toggle_button()
+        if self.grid_view:
+            self.show_grid()
+        else:
+            self.show_current()
         
         # Draw navigation buttons - Previous
         prev_color = (255, 50, 50)  # Red
@@ -304,6 +382,135 @@ class SpriteSelector:
         back_text_rect = back_text.get_rect(center=self.back_button_rect.center)
         self.screen.blit(back_text, back_text_rect)
     
+    def show_current(self):
+        """Draw the selected Pokemon large, with its name and info"""
+        # Draw the current sprite with enlarged size
+        # Preview sudah berukuran 3x, tidak di-scale setiap frame
+        current_sprite = self.preview_image(self.selected_index)
+        sprite_rect = pygame.Rect((0, 0), SpriteVariants.sizes()['preview'])
+        sprite_rect.center = (self.screen_rect.width // 2, self.screen_rect.height // 2 - 60)
+        
+        # Draw decorative background for the sprite
+        pygame.draw.circle(self.screen, (70, 30, 180), sprite_rect.center, max(sprite_rect.width, sprite_rect.height) // 1.5)
+        
+        # Redraw the sprite on top of the background
+        if current_sprite is not None:
+            self.screen.blit(current_sprite, sprite_rect)
+        else:
+            wait_surface = self.font.render("Loading...", True, (255, 255, 255))
+            self.screen.blit(wait_surface, wait_surface.get_rect(center=sprite_rect.center))
+        
+        # Draw the sprite name with highlighting
+        name_text = self.sprites[self.selected_index]['name']
+        
+        # Draw name with shadow effect
+        shadow_surface = self.title_font.render(name_text, True, (30, 30, 30))
+        shadow_rect = shadow_surface.get_rect(center=(self.screen_rect.width // 2 + 3, sprite_rect.bottom + 23))
+        self.screen.blit(shadow_surface, shadow_rect)
+        
+        name_surface = self.title_font.render(name_text, True, (255, 255, 255))
+        name_rect = name_surface.get_rect(center=(self.screen_rect.width // 2, sprite_rect.bottom + 20))
+        self.screen.blit(name_surface, name_rect)
+        
+        # Draw additional information if it's a Pokemon
+        if self.selected_index > 0:  # Not the default bird
+            # Create info text
+            pokemon_info = self.sprites[self.selected_index]
+            type_text = f"Type: {pokemon_info['type']}"
+            size_text = f"Height: {pokemon_info['height']}m  Weight: {pokemon_info['weight']}kg"
+            
+            # Render type with colored background based on type
+            type_color = pokemon_info['type_color']
+            type_surface = self.font.render(type_text, True, (255, 255, 255))
+            type_bg_rect = type_surface.get_rect(center=(self.screen_rect.width // 2, name_rect.bottom + 25))
+            type_bg_rect.inflate_ip(30, 15)  # Make background a bit bigger than text
+            
+            pygame.draw.rect(self.screen, type_color, type_bg_rect, border_radius=15)
+            self.screen.blit(type_surface, type_surface.get_rect(center=(self.screen_rect.width // 2, name_rect.bottom + 25)))
+            
+            # Render size info
+            size_surface = self.font.render(size_text, True, (200, 200, 200))
+            self.screen.blit(size_surface, size_surface.get_rect(center=(self.screen_rect.width // 2, name_rect.bottom + 60)))
+    
+    def grid_area(self):
+        """Screen area of the scrollable grid, between the page info and the nav buttons"""
+        return pygame.Rect(25, 75, self.screen_rect.width - 50, self.prev_button_rect.top - 85)
+    
+    def grid_columns(self):
+        return max(1, self.grid_area().width // Conf.GRID_CELL_SIZE)
+    
+    def grid_cell_rect(self, index):
+        area = self.grid_area()
+        row, column = divmod(index, self.grid_columns())
+        return pygame.Rect(area.x + column * Conf.GRID_CELL_SIZE,
+                           area.y + row * Conf.GRID_CELL_SIZE - self.grid_scroll,
+                           Conf.GRID_CELL_SIZE, Conf.GRID_CELL_SIZE)
+    
+    def max_grid_scroll(self):
+        rows = -(-len(self.sprites) // self.grid_columns())
+        return max(0, rows * Conf.GRID_CELL_SIZE - self.grid_area().height)
+    
+    def visible_grid_indices(self, extra_rows=0):
+        """Only these cells are drawn, no matter how large the roster is"""
+        cell = Conf.GRID_CELL_SIZE
+        columns = self.grid_columns()
+        first_row = max(0, self.grid_scroll // cell - extra_rows)
+        last_row = (self.grid_scroll + self.grid_area().height) // cell + extra_rows
+        return range(first_row * columns, min(len(self.sprites), (last_row + 1) * columns))
+    
+    def scroll_grid(self, pixels):
+        self.grid_scroll = max(0, min(self.grid_scroll + pixels, self.max_grid_scroll()))
+        self.update_window()
+    
+    def scroll_to_selected(self):
+        area = self.grid_area()
+        cell_rect = self.grid_cell_rect(self.selected_index)
+        if cell_rect.top < area.top:
+            self.grid_scroll -= area.top - cell_rect.top
+        elif cell_rect.bottom > area.bottom:
+            self.grid_scroll += cell_rect.bottom - area.bottom
+        self.grid_scroll = max(0, min(self.grid_scroll, self.max_grid_scroll()))
+    
+    def show_grid(self):
+        """Draw the visible part of the roster as a grid of small cells"""
+        area = self.grid_area()
+        self.screen.set_clip(area)
+        for index in self.visible_grid_indices():
+            entry = self.sprites[index]
+            cell_rect = self.grid_cell_rect(index).inflate(-6, -6)
+            pygame.draw.rect(self.screen, (70, 30, 180), cell_rect, border_radius=10)
+            if index == self.selected_index:
+                pygame.draw.rect(self.screen, (255, 255, 0), cell_rect, 3, border_radius=10)
+            
+            if entry['image'] is not None:
+                self.screen.blit(entry['image'], entry['image'].get_rect(center=(cell_rect.centerx, cell_rect.centery - 8)))
+            else:
+                dots = self.small_font.render("...", True, (200, 200, 200))
+                self.screen.blit(dots, dots.get_rect(center=(cell_rect.centerx, cell_rect.centery - 8)))
+            
+            # Nama panjang dipotong di tepi sel
+            name_surface = self.small_font.render(entry['name'], True, (255, 255, 255))
+            self.screen.set_clip(cell_rect.inflate(-6, 0).clip(area))
+            self.screen.blit(name_surface, name_surface.get_rect(center=(cell_rect.centerx, cell_rect.bottom - 12)))
+            self.screen.set_clip(area)
+        self.screen.set_clip(None)
+        
+        # Scrollbar
+        max_scroll = self.max_grid_scroll()
+        if max_scroll:
+            track = pygame.Rect(area.right + 5, area.top, 6, area.height)
+            thumb_height = max(20, area.height * area.height // (area.height + max_scroll))
+            thumb = pygame.Rect(track.x, track.y + (area.height - thumb_height) * self.grid_scroll // max_scroll, 6, thumb_height)
+            pygame.draw.rect(self.screen, (50, 20, 130), track, border_radius=3)
+            pygame.draw.rect(self.screen, (200, 200, 200), thumb, border_radius=3)
+    
+    def draw_toggle_button(self):
+        """Small button switching between single and grid view"""
+        pygame.draw.rect(self.screen, (100, 100, 100), self.toggle_button_rect, border_radius=8)
+        pygame.draw.rect(self.screen, (200, 200, 200), self.toggle_button_rect, 2, border_radius=8)
+        toggle_text = self.small_font.render("SINGLE" if self.grid_view else "GRID", True, (255, 255, 255))
+        self.screen.blit(toggle_text, toggle_text.get_rect(center=self.toggle_button_rect.center))
+    
     def show_loading_screen(self):
         """Show a loading screen while fetching Pokemon data"""
         loading_text = self.title_font.render(self.loading_text, True, (255, 255, 255))
@@ -313,12 +520,24 @@ class SpriteSelector:
         # Animation for loading indicator
         t = pygame.time.get_ticks() / 1000
         for i in range(3):
-            alpha = (1 + pygame.math.sin(t * 5 + i * 1.5)) / 2
+            alpha = (1 + math.sin(t * 5 + i * 1.5)) / 2
             color = (255, 255, 255)
             dot_size = int(8 + 4 * alpha)
-            pos = (loading_rect.bottom + 30, loading_rect.centerx + i * 20 - 20)
+            pos = (loading_rect.centerx + i * 20 - 20, loading_rect.bottom + 30)
             pygame.draw.circle(self.screen, color, pos, dot_size)
         
+        # Progress bar of the details fetched by the loader thread
+        done, total = self.progress
+        if total:
+            bar_rect = pygame.Rect(0, 0, 300, 16)
+            bar_rect.center = (self.screen_rect.width // 2, loading_rect.bottom + 70)
+            fill_rect = bar_rect.copy()
+            fill_rect.width = bar_rect.width * done // total
+            pygame.draw.rect(self.screen, (255, 255, 0), fill_rect, border_radius=8)
+            pygame.draw.rect(self.screen, (255, 255, 255), bar_rect, 2, border_radius=8)
+            count_text = self.small_font.render(f"{done}/{total}", True, (255, 255, 255))
+            self.screen.blit(count_text, count_text.get_rect(center=(bar_rect.centerx, bar_rect.bottom + 15)))
+        
         # Draw back button during loading too
         pygame.draw.rect(self.screen, (100, 100, 100), self.back_button_rect, border_radius=10)
         pygame.draw.rect(self.screen, (200, 200, 200), self.back_button_rect, 2, border_radius=10)  # Gray border
@@ -380,7 +599,14 @@ class SpriteSelector:
                 return "back_to_menu"
             return None
         
-        if event.type == pygame.MOUSEBUTTONDOWN:
+        # Scroll grid dengan mouse wheel
+        if event.type == pygame.MOUSEWHEEL:
+            if self.grid_view and self.sprites:
+                self.scroll_grid(-event.y * Conf.GRID_CELL_SIZE // 2)
+            return None
+        
+        # Wheel juga mengirim MOUSEBUTTONDOWN (tombol 4/5), bukan klik
+        if event.type == pygame.MOUSEBUTTONDOWN and event.button not in (4, 5):
             mouse_pos = pygame.mouse.get_pos()
             
             # Check if back button was clicked (available on all screens)
@@ -391,14 +617,30 @@ class SpriteSelector:
             if self.loading_error or self.is_loading or len(self.sprites) == 0:
                 return None
             
+            # Switch between single and grid view
+            if self.toggle_button_rect.collidepoint(mouse_pos):
+                self.grid_view = not self.grid_view
+                if self.grid_view:
+                    self.scroll_to_selected()
+                self.update_window()
+                return None
+            
+            # Pick a Pokemon by clicking its grid cell
+            if self.grid_view and self.grid_area().collidepoint(mouse_pos):
+                for index in self.visible_grid_indices():
+                    if self.grid_cell_rect(index).collidepoint(mouse_pos):
+                        self.select_index(index)
+                        break
+                return None
+            
             # Check if previous button was clicked
             if self.prev_button_rect.collidepoint(mouse_pos):
-                self.selected_index = (self.selected_index - 1) % len(self.sprites)
+                self.select_index(self.selected_index - 1, direction=-1)
                 return None
             
             # Check if next button was clicked
             elif self.next_button_rect.collidepoint(mouse_pos):
-                self.selected_index = (self.selected_index + 1) % len(self.sprites)
+                self.select_index(self.selected_index + 1, direction=1)
                 return None
             
             # Check if select button was clicked
@@ -414,11 +656,15 @@ class SpriteSelector:
                     sprite_path = f"{sprite_id}.png"
                 
                 try:
-                    self.database.save_selected_sprite(sprite_path, sprite_name)
+                    Statistic.writer().save_selected_sprite(self.game.username, sprite_path, sprite_name)
                     print(f"Selected character: {sprite_name}")
                 except Exception as e:
                     print(f"Error saving sprite selection: {e}")
                     # Masih lanjutkan meskipun gagal menyimpan
+
+                # Ganti skin burung langsung, frame rotasinya di-cache per skin
+                if hasattr(self.game, 'bird'):
+                    self.game.bird.set_skin(sprite_path, sprite_name)
                     
                 return "selection_complete"
         
@@ -1,8 +1,17 @@
 from database import Database
+from conf import Conf
+from score_sync import ScoreSync
+from score_writer import ScoreWriter
 
 class Statistic:
     # Database instance (initialized when needed)
     _db = None
+    # Penulisan skor/pilihan sprite lewat thread background, game loop tidak menunggu disk
+    _writer = None
+    # Unggah skor ke server.py di background (offline tetap jalan)
+    _sync = None
+    # Pemain yang sedang main; None = guest
+    username = None
     
     # Game state flags
     intro = False
@@ -24,21 +33,37 @@ class Statistic:
         if cls._db is None:
             cls._db = Database()
             # Load high score from database
-            cls.high_score = cls._db.get_high_score()
+            cls.high_score = cls._db.get_high_score(cls.username)
     
     @classmethod
-    def update_high_score(cls):
-        """Update high score in memory and database if current score is higher"""
+    def writer(cls):
+        """The shared ScoreWriter, started on first use (flushed at exit)"""
+        if cls._writer is None:
+            cls.init_database()
+            cls._writer = ScoreWriter(cls._db).start()
+        return cls._writer
+    
+    @classmethod
+    def start_sync(cls):
+        """Start uploading local scores to Conf.SERVER_URL, if one is configured"""
+        if cls._sync is None and Conf.SERVER_URL:
+            cls.init_database()
+            cls._sync = ScoreSync(database=cls._db).start()
+        return cls._sync
+    
+    @classmethod
+    def update_high_score(cls, replay=None):
+        """Update high score in memory and database if current score is higher (with the run's replay); True if it was"""
         if cls.score > cls.high_score:
             cls.high_score = cls.score
-            cls.init_database()
-            cls._db.save_score(cls.score)
+            cls.writer().save_score(cls.username, cls.score, replay)
+            return True
+        return False
     
     @classmethod
     def save_score(cls):
         """Save the current score to the database"""
-        cls.init_database()
-        cls._db.save_score(cls.score)
+        cls.writer().save_score(cls.username, cls.score)
     
     @staticmethod
     def reset_game():
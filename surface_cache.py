@@ -0,0 +1,98 @@
+from collections import OrderedDict
+
+
+class SurfaceLRU:
+    """
+    Least-recently-used cache of pygame surfaces with a byte budget.
+
+    The size of an entry is width x height x bytes per pixel of its surface,
+    so the budget is pixel memory, not an entry count. Pinned keys are never
+    evicted; on_evict(key, surface) is called for every eviction, e.g. to
+    drop other references to the surface so the memory is actually freed.
+    """
+
+    def __init__(self, budget_bytes, on_evict=None):
+        self.budget_bytes = budget_bytes
+        self.on_evict = on_evict
+        self._entries = OrderedDict()
+        self._pinned = set()
+        self.bytes_used = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def surface_bytes(surface):
+        # Bukan pitch: subsurface atlas punya pitch selebar sheet-nya
+        return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, default=None):
+        surface = self._entries.get(key)
+        if surface is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return surface
+
+    def put(self, key, surface):
+        if key in self._entries:
+            self.bytes_used -= self.surface_bytes(self._entries.pop(key))
+        self._entries[key] = surface
+        self.bytes_used += self.surface_bytes(surface)
+        self._evict()
+
+    def pop(self, key, default=None):
+        surface = self._entries.pop(key, None)
+        if surface is None:
+            return default
+        self.bytes_used -= self.surface_bytes(surface)
+        return surface
+
+    def pin(self, key):
+        """Keep key in the cache (once it is put) until unpin; pinned bytes still count"""
+        self._pinned.add(key)
+
+    def unpin(self, key):
+        self._pinned.discard(key)
+        self._evict()
+
+    def clear(self):
+        self._entries.clear()
+        self.bytes_used = 0
+
+    def _evict(self):
+        if self.bytes_used <= self.budget_bytes:
+            return
+        # Never evict the entry just added (even if it alone is over budget) or a pinned one
+        newest = next(reversed(self._entries))
+        for key in list(self._entries):
+            if self.bytes_used <= self.budget_bytes:
+                break
+            if key == newest or key in self._pinned:
+                continue
+            surface = self._entries.pop(key)
+            self.bytes_used -= self.surface_bytes(surface)
+            self.evictions += 1
+            if self.on_evict is not None:
+                self.on_evict(key, surface)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'bytes': self.bytes_used,
+            'budget_bytes': self.budget_bytes,
+            'occupancy': self.bytes_used / self.budget_bytes if self.budget_bytes else 0.0,
+            'pinned': len(self._pinned & self._entries.keys()),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'evictions': self.evictions,
+        }
@@ -0,0 +1,53 @@
+import pygame
+
+from conf import Conf
+from asset_manager import AssetManager
+from surface_cache import SurfaceLRU
+
+
+class CachedFont:
+    """
+    Drop-in for pygame.font.Font whose render() is served from TextCache.
+
+    Labels, buttons and the sprite selector render the same few strings every
+    frame; only the first render of each (font, text, color, antialias) is real.
+    """
+
+    def __init__(self, path, size):
+        self.key = (path, size)
+        self.font = pygame.font.Font(path, size)
+
+    def render(self, text, antialias, color, background=None):
+        key = (self.key, text, tuple(color), bool(antialias),
+               tuple(background) if background is not None else None)
+        surface = TextCache.rendered.get(key)
+        if surface is None:
+            surface = AssetManager.convert(self.font.render(text, antialias, color, background))
+            TextCache.rendered.put(key, surface)
+        return surface
+
+    def __getattr__(self, name):
+        # size(), get_linesize(), ... go straight to the real font
+        return getattr(self.font, name)
+
+
+class TextCache:
+    """Shared fonts keyed by (path, size) and an LRU of rendered text surfaces"""
+
+    _fonts = {}
+    rendered = SurfaceLRU(Conf.TEXT_CACHE_BYTES)
+
+    @classmethod
+    def font(cls, path, size):
+        """Return the shared font for (path, size); path None is pygame's default font"""
+        key = (path, size)
+        font = cls._fonts.get(key)
+        if font is None:
+            font = cls._fonts[key] = CachedFont(path, size)
+        return font
+
+    @classmethod
+    def stats(cls):
+        stats = cls.rendered.stats()
+        stats['fonts'] = len(cls._fonts)
+        return stats